@@ -2,30 +2,66 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import pathlib
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType
 
 from .client import CollectionType, EcocitoClient
-from .const import CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS
+from .const import (
+    CONF_HISTORY_YEARS,
+    CONF_MAX_BACKOFF,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_TRACE_REQUESTS,
+    CONF_TRACKED_TYPES,
+    CONF_TYPE_HISTORY_YEARS,
+    DEFAULT_HISTORY_YEARS,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TRACE_REQUESTS,
+    DOMAIN,
+    HISTORY_LOAD_CONCURRENCY,
+    LOGGER,
+    NO_ADDRESS,
+    SIGNAL_COLLECTION_TYPES_REMOVED,
+    SIGNAL_COORDINATORS_ADDED,
+)
 from .coordinator import (
     CollectionEventsDataUpdateCoordinator,
     CollectionTypesDataUpdateCoordinator,
+    EcocitoDataUpdateCoordinator,
+    EcocitoYearStore,
     WasteDepotVisitsDataUpdateCoordinator,
+    async_fetch_addresses,
+    collection_store_key,
 )
+from .pool import async_acquire_pool, async_release_pool, pool_key
+from .resilience import BackoffPolicy
+from .services import async_setup_services
+from .session import EcocitoSessionStore, async_pop_flow_session
+from .tracing import RequestTracer, TraceFile
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 
 @dataclass(kw_only=True, slots=True)
 class EcocitoYearCoordinators:
     """Coordinators for one address and one year."""
 
-    year: int
     year_offset: int
     collection_types: dict[str, CollectionEventsDataUpdateCoordinator]
     waste_depot: WasteDepotVisitsDataUpdateCoordinator
@@ -44,21 +80,68 @@ class EcocitoAddressData:
 class EcocitoData:
     """All runtime data for the integration."""
 
+    client: EcocitoClient
     collection_types_coordinator: CollectionTypesDataUpdateCoordinator
+    collection_types: dict[str, CollectionType]
     addresses: list[EcocitoAddressData]
+    waste_depot: dict[int, WasteDepotVisitsDataUpdateCoordinator]
+    year_store: EcocitoYearStore
 
 
 type EcocitoConfigEntry = ConfigEntry[EcocitoData]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Ecocito services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: EcocitoConfigEntry) -> bool:
     """Set up ecocito from a config entry."""
+    if entry.unique_id is None:
+        # Entries created before several accounts were supported.
+        hass.config_entries.async_update_entry(
+            entry, unique_id=account_unique_id(entry.data)
+        )
+
+    # Accounts of the same Ecocito domain share connections, rate limit and
+    # circuit breaker.
+    pool = async_acquire_pool(hass, entry.data[CONF_DOMAIN])
+    entry.async_on_unload(
+        functools.partial(async_release_pool, hass, entry.data[CONF_DOMAIN])
+    )
     client = EcocitoClient(
         entry.data[CONF_DOMAIN],
         entry.data[CONF_USERNAME],
         entry.data[CONF_PASSWORD],
+        connector=pool.connector,
+        rate_limiter=pool.rate_limiter(
+            int(
+                entry.options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE)
+            )
+        ),
+        backoff=_backoff_policy(
+            float(entry.options.get(CONF_MAX_BACKOFF, DEFAULT_MAX_BACKOFF))
+        ),
+        circuit_breaker=pool.circuit_breaker,
+        tracer=await _async_request_tracer(hass, entry),
     )
-    await client.authenticate()
+    # Reuse the session of the config flow or of the previous run: an expired
+    # one is detected on the first request, which logs in again.
+    session_store = EcocitoSessionStore(hass, entry.entry_id)
+    entry.async_on_unload(session_store.async_flush)
+    cookies = async_pop_flow_session(hass, entry.unique_id)
+    if cookies:
+        session_store.async_save(cookies)
+    else:
+        cookies = await session_store.async_load()
+    if cookies:
+        client.load_cookies(cookies)
+    else:
+        await client.authenticate()
+        session_store.async_save(client.export_cookies())
+    client.on_authenticated = lambda: session_store.async_save(client.export_cookies())
 
     history_years = int(entry.options.get(CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS))
     time_zone = ZoneInfo(hass.config.time_zone)
@@ -68,78 +151,316 @@ async def async_setup_entry(hass: HomeAssistant, entry: EcocitoConfigEntry) -> b
     # previous hardcoded garbage (15) / recycling (16) type IDs.
     collection_types: list[CollectionType] = await client.get_collection_types()
 
-    addresses = await client.get_addresses(current_year, collection_types)
-    if not addresses:
-        addresses = [None]
+    # Once types have been chosen per address in the options flow, only those
+    # addresses are tracked and new ones are not looked for.
+    # Coordinators keep what they fetch by absolute year so that, at New Year,
+    # each year's data moves on to the next offset instead of being fetched
+    # again.
+    year_store = EcocitoYearStore()
+    tracked: dict[str, list[str]] | None = entry.options.get(CONF_TRACKED_TYPES)
+    if tracked is not None:
+        all_addresses = [address or None for address in tracked]
+        addresses = [address or None for address, ids in tracked.items() if ids]
+    else:
+        # The events read to find the addresses are kept in the year store,
+        # for the first refresh of the current-year coordinators.
+        all_addresses = addresses = await async_fetch_addresses(
+            client, year_store, current_year, collection_types
+        )
+        if not addresses:
+            addresses = [None]
 
-    # Note: address and type discovery happen once at setup time. Adding or
-    # removing addresses/types on the Ecocito account requires reloading the
-    # integration. Type changes are also detected automatically by the
-    # CollectionTypesDataUpdateCoordinator (hourly poll).
-    single_address = len(addresses) <= 1
+    # Types and addresses are polled again hourly by the
+    # CollectionTypesDataUpdateCoordinator; changes are applied incrementally
+    # by _async_apply_discovery without reloading the integration.
+    single_address = len(all_addresses) <= 1
 
     # Create one WasteDepotVisitsDataUpdateCoordinator per year offset so that
     # waste-depot visits (account-wide, not per address) are fetched only once
     # per year regardless of how many addresses are configured.
     waste_depot_by_offset: dict[int, WasteDepotVisitsDataUpdateCoordinator] = {
-        year_offset: WasteDepotVisitsDataUpdateCoordinator(hass, client, year_offset)
+        year_offset: WasteDepotVisitsDataUpdateCoordinator(
+            hass, client, year_offset, year_store
+        )
         for year_offset in range(0, -(history_years + 1), -1)
     }
 
-    all_address_data: list[EcocitoAddressData] = []
-    for address in addresses:
-        year_coordinators: list[EcocitoYearCoordinators] = []
-        for year_offset in range(0, -(history_years + 1), -1):
-            year = current_year + year_offset
-            type_coordinators: dict[str, CollectionEventsDataUpdateCoordinator] = {
-                ctype.id: CollectionEventsDataUpdateCoordinator(
-                    hass, client, ctype, year_offset, location=address
-                )
-                for ctype in collection_types
-            }
-            year_coordinators.append(
-                EcocitoYearCoordinators(
-                    year=year,
-                    year_offset=year_offset,
-                    collection_types=type_coordinators,
-                    waste_depot=waste_depot_by_offset[year_offset],
-                )
-            )
-        all_address_data.append(
-            EcocitoAddressData(
-                location=address,
-                single_address=single_address,
-                coordinators=year_coordinators,
-            )
+    all_address_data = [
+        EcocitoAddressData(
+            location=address,
+            single_address=single_address,
+            coordinators=_create_year_coordinators(
+                hass, entry, client, address, collection_types, waste_depot_by_offset
+            ),
         )
+        for address in addresses
+    ]
 
-    # Refresh per-address coordinators, then waste-depot ones (once per year).
+    # Only the current year is needed to complete the setup: previous years are
+    # loaded in the background once Home Assistant has started (see
+    # _async_load_history), and their sensors added then.
     for address_data in all_address_data:
-        for year_coords in address_data.coordinators:
-            for coordinator in year_coords.collection_types.values():
-                await coordinator.async_config_entry_first_refresh()
-    for waste_depot in waste_depot_by_offset.values():
-        await waste_depot.async_config_entry_first_refresh()
-
-    # The collection types coordinator polls hourly and reloads the integration
-    # if the available types have changed. Seed it with the already-fetched types
-    # to avoid a redundant HTTP request on startup/reload.
-    known_type_ids = frozenset(ctype.id for ctype in collection_types)
+        for coordinator in address_data.coordinators[0].collection_types.values():
+            await coordinator.async_config_entry_first_refresh()
+    await waste_depot_by_offset[0].async_config_entry_first_refresh()
+
+    # The collection types coordinator polls types and addresses hourly. Seed
+    # it with the already-fetched types to avoid a redundant HTTP request on
+    # startup/reload.
     types_coordinator = CollectionTypesDataUpdateCoordinator(
-        hass, client, known_type_ids
+        hass,
+        client,
+        frozenset(ctype.id for ctype in collection_types),
+        known_addresses=None
+        if tracked is not None
+        else frozenset(a for a in addresses if a is not None),
+        year_store=year_store,
+        on_change=functools.partial(_async_apply_discovery, hass, entry),
     )
     types_coordinator.async_set_updated_data(collection_types)
 
     entry.runtime_data = EcocitoData(
+        client=client,
         collection_types_coordinator=types_coordinator,
+        collection_types={ctype.id: ctype for ctype in collection_types},
         addresses=all_address_data,
+        waste_depot=waste_depot_by_offset,
+        year_store=year_store,
     )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    # Its only entities are disabled by default: keep it polling regardless.
+    entry.async_on_unload(types_coordinator.async_add_listener(lambda: None))
+    if history_years:
+        entry.async_on_unload(
+            async_at_started(hass, functools.partial(_async_schedule_history, entry))
+        )
 
     return True
 
 
+@callback
+def _async_schedule_history(entry: EcocitoConfigEntry, hass: HomeAssistant) -> None:
+    """Start loading the previous years in the background."""
+    entry.async_create_background_task(
+        hass, _async_load_history(hass, entry), f"{DOMAIN} history {entry.entry_id}"
+    )
+
+
+async def _async_load_history(hass: HomeAssistant, entry: EcocitoConfigEntry) -> None:
+    """
+    Refresh the coordinators of previous years and add their sensors.
+
+    Years are loaded from the most recent one, a few coordinators at a time so
+    that polls of the current year are not held up behind the history.
+    """
+    data = entry.runtime_data
+    semaphore = asyncio.Semaphore(HISTORY_LOAD_CONCURRENCY)
+
+    async def _async_refresh(coordinator: EcocitoDataUpdateCoordinator) -> None:
+        async with semaphore:
+            await coordinator.async_refresh()
+
+    # Coordinators added later by _async_apply_discovery load by themselves.
+    years = [
+        [
+            data.waste_depot[year_offset],
+            *(
+                coordinator
+                for address_data in data.addresses
+                for year_coords in address_data.coordinators
+                if year_coords.year_offset == year_offset
+                for coordinator in year_coords.collection_types.values()
+            ),
+        ]
+        for year_offset in data.waste_depot
+        if year_offset
+    ]
+    for coordinators in years:
+        await asyncio.gather(*map(_async_refresh, coordinators))
+        async_dispatcher_send(
+            hass, SIGNAL_COORDINATORS_ADDED.format(entry.entry_id), coordinators
+        )
+
+
+def _create_year_coordinators(  # noqa: PLR0913
+    hass: HomeAssistant,
+    entry: EcocitoConfigEntry,
+    client: EcocitoClient,
+    location: str | None,
+    collection_types: list[CollectionType],
+    waste_depot_by_offset: dict[int, WasteDepotVisitsDataUpdateCoordinator],
+) -> list[EcocitoYearCoordinators]:
+    """Create the tracked collection coordinators of one address, per year."""
+    return [
+        EcocitoYearCoordinators(
+            year_offset=year_offset,
+            collection_types={
+                ctype.id: _create_collection_coordinator(
+                    hass, entry, client, ctype, waste_depot, location
+                )
+                for ctype in collection_types
+                if _is_tracked(entry, location, ctype.id, year_offset)
+            },
+            waste_depot=waste_depot,
+        )
+        for year_offset, waste_depot in waste_depot_by_offset.items()
+    ]
+
+
+def _is_tracked(
+    entry: EcocitoConfigEntry, location: str | None, type_id: str, year_offset: int
+) -> bool:
+    """Return whether a collection type is tracked at an address for a year."""
+    tracked = entry.options.get(CONF_TRACKED_TYPES)
+    if tracked is not None and type_id not in tracked.get(location or NO_ADDRESS, ()):
+        return False
+    years = entry.options.get(CONF_TYPE_HISTORY_YEARS, {}).get(type_id)
+    return years is None or -year_offset <= years
+
+
+def _create_collection_coordinator(  # noqa: PLR0913
+    hass: HomeAssistant,
+    entry: EcocitoConfigEntry,
+    client: EcocitoClient,
+    collection_type: CollectionType,
+    waste_depot: WasteDepotVisitsDataUpdateCoordinator,
+    location: str | None,
+) -> CollectionEventsDataUpdateCoordinator:
+    """
+    Create a collection coordinator bound to the config entry.
+
+    It targets the year of the waste depot coordinator and shares its store.
+    """
+    coordinator = CollectionEventsDataUpdateCoordinator(
+        hass,
+        client,
+        collection_type,
+        waste_depot.year_offset,
+        location=location,
+        store=waste_depot.store,
+    )
+    # Coordinators created after setup are outside the config entry context.
+    coordinator.config_entry = entry
+    return coordinator
+
+
+async def _async_apply_discovery(
+    hass: HomeAssistant,
+    entry: EcocitoConfigEntry,
+    collection_types: list[CollectionType],
+    addresses: list[str],
+) -> None:
+    """
+    Apply changes of the account's collection types and addresses.
+
+    Coordinators and sensors are created for new types and addresses only, and
+    the sensors of vanished types are removed; everything else is left as is.
+    Going from a single address to several changes every device, so that case
+    still reloads the integration.
+    """
+    data = entry.runtime_data
+    known_locations = {address_data.location for address_data in data.addresses}
+    new_addresses = [a for a in addresses if a not in known_locations]
+    if new_addresses and any(a.single_address for a in data.addresses):
+        LOGGER.info("New addresses %s found, reloading integration", new_addresses)
+        # Outside this task, which the unload cancels.
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+        return
+
+    current = {ctype.id: ctype for ctype in collection_types}
+    added = [
+        ctype
+        for type_id, ctype in current.items()
+        if type_id not in data.collection_types
+    ]
+    removed = [type_id for type_id in data.collection_types if type_id not in current]
+    data.collection_types = current
+    for type_id in removed:
+        data.year_store.discard(collection_store_key(type_id))
+
+    new_coordinators: list[EcocitoDataUpdateCoordinator] = []
+    for address_data in data.addresses:
+        for year_coords in address_data.coordinators:
+            for type_id in removed:
+                year_coords.collection_types.pop(type_id, None)
+            for ctype in added:
+                if not _is_tracked(
+                    entry, address_data.location, ctype.id, year_coords.year_offset
+                ):
+                    continue
+                coordinator = year_coords.collection_types[ctype.id] = (
+                    _create_collection_coordinator(
+                        hass,
+                        entry,
+                        data.client,
+                        ctype,
+                        year_coords.waste_depot,
+                        address_data.location,
+                    )
+                )
+                new_coordinators.append(coordinator)
+    for address in new_addresses:
+        address_data = EcocitoAddressData(
+            location=address,
+            single_address=False,
+            coordinators=_create_year_coordinators(
+                hass, entry, data.client, address, collection_types, data.waste_depot
+            ),
+        )
+        data.addresses.append(address_data)
+        new_coordinators.extend(
+            coordinator
+            for year_coords in address_data.coordinators
+            for coordinator in year_coords.collection_types.values()
+        )
+
+    if removed:
+        LOGGER.info("Removing sensors of collection types %s", removed)
+        async_dispatcher_send(
+            hass, SIGNAL_COLLECTION_TYPES_REMOVED.format(entry.entry_id), removed
+        )
+    if new_coordinators:
+        LOGGER.info(
+            "Adding collection types %s and addresses %s",
+            [ctype.id for ctype in added],
+            new_addresses,
+        )
+        for coordinator in new_coordinators:
+            await coordinator.async_refresh()
+        async_dispatcher_send(
+            hass, SIGNAL_COORDINATORS_ADDED.format(entry.entry_id), new_coordinators
+        )
+
+
+def account_unique_id(data: Mapping[str, Any]) -> str:
+    """Return the unique id of an account: its Ecocito subdomain and username."""
+    return f"{pool_key(data[CONF_DOMAIN])}_{data[CONF_USERNAME].lower()}"
+
+
+async def _async_request_tracer(
+    hass: HomeAssistant, entry: EcocitoConfigEntry
+) -> RequestTracer | None:
+    """Return the request tracer of the entry, if tracing is enabled."""
+    if not entry.options.get(CONF_TRACE_REQUESTS, DEFAULT_TRACE_REQUESTS):
+        return None
+    path = pathlib.Path(hass.config.path(DOMAIN, f"trace_{entry.entry_id}.jsonl"))
+    trace_file = await hass.async_add_executor_job(TraceFile, path)
+
+    async def _async_close() -> None:
+        await hass.async_add_executor_job(trace_file.close)
+
+    entry.async_on_unload(_async_close)
+    return RequestTracer(trace_file)
+
+
+def _backoff_policy(max_backoff: float) -> BackoffPolicy:
+    """Return the retry policy for a maximum pause (0 disables retries)."""
+    if max_backoff <= 0:
+        return BackoffPolicy(retries=0)
+    return BackoffPolicy(maximum=max_backoff)
+
+
 async def _async_update_listener(
     hass: HomeAssistant, entry: EcocitoConfigEntry
 ) -> None:
@@ -147,6 +468,11 @@ async def _async_update_listener(
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: EcocitoConfigEntry) -> None:
+    """Delete the saved session of a removed config entry."""
+    await EcocitoSessionStore(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: EcocitoConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
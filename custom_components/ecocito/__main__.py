@@ -0,0 +1,274 @@
+"""
+Command-line Ecocito client, to fetch data and profile the client outside HA.
+
+``python -m custom_components.ecocito --help`` lists the commands. Data is
+printed as JSON; ``bench`` times the fetch strategies of a poll against any
+server, e.g. the local fake one (``python -m tests.fake_ecocito``).
+
+Home Assistant need not run, but the ``homeassistant`` package must be
+installed: the integration's ``__init__`` is imported first, and the client
+errors derive from ``HomeAssistantError``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+from datetime import date, datetime
+from typing import Any
+
+import aiohttp
+
+from .client import CollectionType, EcocitoClient
+from .const import POOL_MAX_CONNECTIONS
+from .errors import EcocitoError
+from .transport import CassettePlayer, CassetteRecorder, EcocitoTransport
+
+type Strategy = Callable[
+    [EcocitoClient, list[CollectionType], range], Awaitable[list[Any]]
+]
+
+
+async def _sequential(
+    client: EcocitoClient, types: list[CollectionType], years: range
+) -> list[Any]:
+    """One request per type and year, one after the other."""
+    return [
+        await client.get_collection_events(ctype.id, year)
+        for ctype in types
+        for year in years
+    ]
+
+
+async def _concurrent(
+    client: EcocitoClient, types: list[CollectionType], years: range
+) -> list[Any]:
+    """One request per type and year, all at once (as the coordinators do)."""
+    return await asyncio.gather(
+        *(
+            client.get_collection_events(ctype.id, year)
+            for ctype in types
+            for year in years
+        )
+    )
+
+
+async def _bulk(
+    client: EcocitoClient, types: list[CollectionType], years: range
+) -> list[Any]:
+    """One request per type spanning every year, split by year locally."""
+    results = await asyncio.gather(
+        *(
+            client.get_collection_events_by_year(ctype.id, years[0], years[-1])
+            for ctype in types
+        )
+    )
+    return [events for by_year in results for events in by_year.values()]
+
+
+STRATEGIES: dict[str, Strategy] = {
+    "sequential": _sequential,
+    "concurrent": _concurrent,
+    "bulk": _bulk,
+}
+
+
+def _print_json(data: Any) -> None:
+    print(json.dumps(data, default=str, ensure_ascii=False, indent=2))  # noqa: T201
+
+
+async def _login(client: EcocitoClient, _args: argparse.Namespace) -> None:
+    await client.authenticate()
+    _print_json({"authenticated": True})
+
+
+async def _types(client: EcocitoClient, _args: argparse.Namespace) -> None:
+    await client.authenticate()
+    _print_json([asdict(ctype) for ctype in await client.get_collection_types()])
+
+
+async def _addresses(client: EcocitoClient, args: argparse.Namespace) -> None:
+    await client.authenticate()
+    types = await client.get_collection_types()
+    _print_json(await client.get_addresses(args.year, types))
+
+
+async def _events(client: EcocitoClient, args: argparse.Namespace) -> None:
+    await client.authenticate()
+    type_ids = args.type or [ctype.id for ctype in await client.get_collection_types()]
+    _print_json(
+        [
+            asdict(event)
+            for type_id in type_ids
+            async for page in client.iter_collection_events(
+                type_id, args.start, args.end
+            )
+            for event in page
+        ]
+    )
+
+
+async def _visits(client: EcocitoClient, args: argparse.Namespace) -> None:
+    await client.authenticate()
+    _print_json(
+        [
+            asdict(visit)
+            async for page in client.iter_waste_depot_visits(args.start, args.end)
+            for visit in page
+        ]
+    )
+
+
+async def _bench(client: EcocitoClient, args: argparse.Namespace) -> None:
+    """
+    Time each strategy over ``rounds`` polls of the same session.
+
+    The session is opened and the types fetched beforehand, so only the
+    collection requests are measured.
+    """
+    await client.authenticate()
+    types = await client.get_collection_types()
+    years = range(args.year - args.years + 1, args.year + 1)
+    results = {}
+    for name in args.strategy or STRATEGIES:
+        durations = []
+        requests_before = client.metrics.requests_last_hour
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            events = await STRATEGIES[name](client, types, years)
+            durations.append(time.perf_counter() - start)
+        results[name] = {
+            "requests": (client.metrics.requests_last_hour - requests_before)
+            // args.rounds,
+            "events": sum(len(chunk) for chunk in events),
+            "min_ms": round(min(durations) * 1000, 1),
+            "median_ms": round(statistics.median(durations) * 1000, 1),
+            "max_ms": round(max(durations) * 1000, 1),
+        }
+    _print_json(
+        {"types": len(types), "years": len(years), "rounds": args.rounds, **results}
+    )
+
+
+def _this_year() -> int:
+    return datetime.now().year  # noqa: DTZ005
+
+
+def _add_date_range(command: argparse.ArgumentParser) -> None:
+    year = _this_year()
+    command.add_argument("--start", type=date.fromisoformat, default=date(year, 1, 1))
+    command.add_argument("--end", type=date.fromisoformat, default=date(year, 12, 31))
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.ecocito",
+        description=__doc__.strip().splitlines()[0],
+    )
+    parser.add_argument("--domain", default="", help="Ecocito subdomain")
+    parser.add_argument("--username", default=os.environ.get("ECOCITO_USERNAME"))
+    parser.add_argument(
+        "--password",
+        default=os.environ.get("ECOCITO_PASSWORD"),
+        help="defaults to $ECOCITO_PASSWORD",
+    )
+    parser.add_argument("--base-url", help="server URL, e.g. a local fake server")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=POOL_MAX_CONNECTIONS,
+        help="maximum concurrent connections",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", type=pathlib.Path, help="save a cassette")
+    cassette.add_argument("--replay", type=pathlib.Path, help="replay a cassette")
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="replayed latency factor, 0 for none",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("login", help="check the credentials").set_defaults(
+        handler=_login
+    )
+    commands.add_parser("types", help="list the collection types").set_defaults(
+        handler=_types
+    )
+    addresses = commands.add_parser("addresses", help="list the addresses")
+    addresses.add_argument("--year", type=int, default=_this_year())
+    addresses.set_defaults(handler=_addresses)
+
+    events = commands.add_parser(
+        "events", help="dump the collection events of a date range"
+    )
+    _add_date_range(events)
+    events.add_argument(
+        "--type", action="append", help="collection type id (default: all)"
+    )
+    events.set_defaults(handler=_events)
+    visits = commands.add_parser(
+        "visits", help="dump the waste depot visits of a date range"
+    )
+    _add_date_range(visits)
+    visits.set_defaults(handler=_visits)
+
+    bench = commands.add_parser("bench", help="time the fetch strategies")
+    bench.add_argument("--year", type=int, default=_this_year(), help="last year")
+    bench.add_argument("--years", type=int, default=3, help="years per poll")
+    bench.add_argument("--rounds", type=int, default=5)
+    bench.add_argument(
+        "--strategy", action="append", choices=STRATEGIES, help="default: all"
+    )
+    bench.set_defaults(handler=_bench)
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    transport: EcocitoTransport | None = None
+    if args.record:
+        transport = CassetteRecorder(redact=[args.username, args.password])
+    elif args.replay:
+        transport = CassettePlayer.load(args.replay, args.time_scale)
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    client = EcocitoClient(
+        args.domain,
+        args.username or "",
+        args.password or "",
+        base_url=args.base_url,
+        connector=connector,
+        transport=transport,
+    )
+    try:
+        await args.handler(client, args)
+    finally:
+        await connector.close()
+        if isinstance(transport, CassetteRecorder):
+            transport.save(args.record)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a command, return the exit status."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not (args.domain or args.base_url):
+        parser.error("one of --domain or --base-url is required")
+    try:
+        asyncio.run(_run(args))
+    except EcocitoError as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)  # noqa: T201
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
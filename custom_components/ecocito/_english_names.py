@@ -0,0 +1,64 @@
+"""
+English sensor names, generated from strings.json by script/generate.
+
+Do not edit by hand.
+"""
+
+ENGLISH_SENSOR_NAMES: dict[str, str] = {
+    "garbage_count": "Number of garbage collections",
+    "garbage_count_30d": "Number of garbage collections (last 30 days)",
+    "garbage_count_12m": "Number of garbage collections (last 12 months)",
+    "garbage_anomaly": "Anomaly score of garbage collections",
+    "garbage_total": "Total weight of collected garbage",
+    "garbage_total_30d": "Total weight of collected garbage (last 30 days)",
+    "garbage_total_12m": "Total weight of collected garbage (last 12 months)",
+    "latest_garbage_collection": "Weight of the latest garbage collection",
+    "garbage_count_n": "Number of garbage collections (N-{n})",
+    "garbage_total_n": "Total weight of collected garbage (N-{n})",
+    "recycling_count": "Number of recycling collections",
+    "recycling_count_30d": "Number of recycling collections (last 30 days)",
+    "recycling_count_12m": "Number of recycling collections (last 12 months)",
+    "recycling_anomaly": "Anomaly score of recycling collections",
+    "recycling_total": "Total weight of collected recycling",
+    "recycling_total_30d": "Total weight of collected recycling (last 30 days)",
+    "recycling_total_12m": "Total weight of collected recycling (last 12 months)",
+    "latest_recycling_collection": "Weight of the latest recycling collection",
+    "recycling_count_n": "Number of recycling collections (N-{n})",
+    "recycling_total_n": "Total weight of collected recycling (N-{n})",
+    "green_waste_count": "Number of green waste collections",
+    "green_waste_count_30d": "Number of green waste collections (last 30 days)",
+    "green_waste_count_12m": "Number of green waste collections (last 12 months)",
+    "green_waste_anomaly": "Anomaly score of green waste collections",
+    "green_waste_total": "Total weight of collected green waste",
+    "green_waste_total_30d": "Total weight of collected green waste (last 30 days)",
+    "green_waste_total_12m": "Total weight of collected green waste (last 12 months)",
+    "latest_green_waste_collection": "Weight of the latest green waste collection",
+    "green_waste_count_n": "Number of green waste collections (N-{n})",
+    "green_waste_total_n": "Total weight of collected green waste (N-{n})",
+    "badge_count": "Number of badge collections",
+    "badge_count_30d": "Number of badge collections (last 30 days)",
+    "badge_count_12m": "Number of badge collections (last 12 months)",
+    "badge_anomaly": "Anomaly score of badge collections",
+    "badge_total": "Total weight of collected badge",
+    "badge_total_30d": "Total weight of collected badge (last 30 days)",
+    "badge_total_12m": "Total weight of collected badge (last 12 months)",
+    "latest_badge_collection": "Weight of the latest badge collection",
+    "badge_count_n": "Number of badge collections (N-{n})",
+    "badge_total_n": "Total weight of collected badge (N-{n})",
+    "collection_count": "Number of {type} collections",
+    "collection_count_30d": "Number of {type} collections (last 30 days)",
+    "collection_count_12m": "Number of {type} collections (last 12 months)",
+    "collection_anomaly": "Anomaly score of {type} collections",
+    "collection_total": "Total weight of collected {type}",
+    "collection_total_30d": "Total weight of collected {type} (last 30 days)",
+    "collection_total_12m": "Total weight of collected {type} (last 12 months)",
+    "latest_collection": "Weight of the latest {type} collection",
+    "collection_count_n": "Number of {type} collections (N-{n})",
+    "collection_total_n": "Total weight of collected {type} (N-{n})",
+    "waste_deposit_visit": "Number of visits to waste deposit",
+    "waste_deposit_visit_n": "Number of visits to waste deposit (N-{n})",
+    "last_poll_duration": "Last poll duration",
+    "requests_last_hour": "HTTP requests in the last hour",
+    "average_response_time": "Average response time",
+    "consecutive_failures": "Consecutive failures",
+}
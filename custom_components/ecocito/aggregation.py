@@ -0,0 +1,166 @@
+"""Incremental aggregations over the Ecocito event timeline."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections import Counter, deque
+from collections.abc import Hashable, Iterable
+from datetime import datetime, timedelta
+
+from .client import CollectionEvent
+
+type EventKey = tuple[datetime, str, str, float]
+
+
+def event_key(event: CollectionEvent) -> EventKey:
+    """Return a hashable identity for a collection event."""
+    return (event.date, event.location, event.type, event.quantity)
+
+
+def diff_events(
+    old_keys: Counter[EventKey], events: Iterable[CollectionEvent]
+) -> tuple[Counter[EventKey], list[CollectionEvent], list[EventKey]]:
+    """
+    Compare a new list of events with the keys of the previous one.
+
+    Return the keys of the new list, the events it adds and the keys of the
+    events it no longer contains.
+    """
+    events = list(events)
+    new_keys = Counter(event_key(event) for event in events)
+    added = new_keys - old_keys
+    new_events = []
+    for event in events:
+        key = event_key(event)
+        if added[key] > 0:
+            added[key] -= 1
+            new_events.append(event)
+    removed = list((old_keys - new_keys).elements())
+    return new_keys, new_events, removed
+
+
+class SlidingWindow:
+    """
+    Count and sum of the values of the last ``period``, kept incrementally.
+
+    Values are added and removed by key as their sources change, and evicted
+    from the oldest once they fall out of the window, so an update costs the
+    size of the change rather than a scan of every event. A key fed by several
+    sources (a year moving from one coordinator to the next) is counted once
+    and removed with its last reference.
+
+    Removed values are looked up by key and left in the time-ordered queue as
+    tombstones, skipped on eviction and swept once they outnumber the others.
+    """
+
+    def __init__(self, period: timedelta) -> None:
+        """Initialize the window."""
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self._refs: Counter[Hashable] = Counter()
+        self._entries: dict[Hashable, tuple[datetime, Hashable, float]] = {}
+        self._window: deque[tuple[datetime, Hashable, float]] = deque()
+        self._tombstones = 0
+        self._cutoff: datetime | None = None
+
+    def add(self, key: Hashable, when: datetime, value: float) -> None:
+        """Add a value, unless its key is already known or it has expired."""
+        self._refs[key] += 1
+        if self._refs[key] > 1 or (self._cutoff is not None and when < self._cutoff):
+            return
+        entry = (when, key, value)
+        if not self._window or when >= self._window[-1][0]:
+            self._window.append(entry)
+        else:
+            index = bisect.bisect(self._window, when, key=lambda item: item[0])
+            self._window.insert(index, entry)
+        self._entries[key] = entry
+        self.count += 1
+        self.total += value
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a reference to a key, and its value with the last one."""
+        if (refs := self._refs[key] - 1) > 0:
+            self._refs[key] = refs
+            return
+        del self._refs[key]
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+        self._subtract(entry[2])
+        self._tombstones += 1
+        if self._tombstones > len(self._entries):
+            self._window = deque(item for item in self._window if self._is_live(item))
+            self._tombstones = 0
+
+    def evict(self, now: datetime) -> bool:
+        """Drop the values older than the window, returning True if any was."""
+        self._cutoff = now - self.period
+        evicted = False
+        while self._window and self._window[0][0] < self._cutoff:
+            entry = self._window.popleft()
+            if not self._is_live(entry):
+                self._tombstones -= 1
+                continue
+            del self._entries[entry[1]]
+            self._subtract(entry[2])
+            evicted = True
+        return evicted
+
+    def _is_live(self, entry: tuple[datetime, Hashable, float]) -> bool:
+        # A key removed then added again has a new entry.
+        return self._entries.get(entry[1]) is entry
+
+    def _subtract(self, value: float) -> None:
+        self.count -= 1
+        # Reset rather than accumulate rounding errors once empty.
+        self.total = self.total - value if self._entries else 0.0
+
+
+class RunningStats:
+    """
+    Mean, variance and exponentially weighted mean of a series, kept online.
+
+    The mean and variance use Welford's algorithm; the EWMA follows the most
+    recent values. Memory does not grow with the series.
+    """
+
+    def __init__(self, alpha: float) -> None:
+        """Initialize the statistics, ``alpha`` being the EWMA smoothing factor."""
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.ewma: float | None = None
+        self._m2 = 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Return the sample standard deviation."""
+        if self.count < 2:  # noqa: PLR2004
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def z_score(self, value: float) -> float | None:
+        """Return how many standard deviations a value is from the mean."""
+        if (stddev := self.stddev) == 0:
+            return None
+        return (value - self.mean) / stddev
+
+    def add(self, value: float, *, chronological: bool = True) -> None:
+        """
+        Add a value.
+
+        Values older than those already added (history loaded afterwards) only
+        update the mean and variance, which do not depend on the order.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if chronological:
+            self.ewma = (
+                value
+                if self.ewma is None
+                else self.alpha * value + (1 - self.alpha) * self.ewma
+            )
@@ -3,29 +3,54 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
+import contextlib
+import functools
 import json
 import re
+import time
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-from bs4 import BeautifulSoup as bs  # noqa: N813
+from yarl import URL
 
 from .const import (
-    ECOCITO_COLLECTION_ENDPOINT,
-    ECOCITO_COLLECTION_PAGE_ENDPOINT,
+    ECOCITO_BASE_URL,
+    ECOCITO_COLLECTION_PAGE_URI,
+    ECOCITO_COLLECTION_URI,
     ECOCITO_DEFAULT_COLLECTION_TYPE,
-    ECOCITO_LOGIN_ENDPOINT,
     ECOCITO_LOGIN_PASSWORD_KEY,
     ECOCITO_LOGIN_URI,
     ECOCITO_LOGIN_USERNAME_KEY,
-    ECOCITO_WASTE_DEPOSIT_ENDPOINT,
+    ECOCITO_WASTE_DEPOSIT_URI,
     LOGGER,
 )
 from .errors import CannotConnectError, EcocitoError, InvalidAuthenticationError
+from .metrics import EcocitoMetrics
+from .parsers import CollectionTypeSelectParser
+from .resilience import (
+    RETRYABLE_STATUSES,
+    BackoffPolicy,
+    CircuitBreaker,
+    TokenBucket,
+    parse_retry_after,
+)
+from .tracing import RequestTiming, RequestTracer
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+    from .transport import EcocitoTransport, Response
 
 _MAX_RETRIES = 3
 _HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+_HTML_CHUNK_SIZE = 8192
+_PAGE_SIZE = 1000
 
 
 @dataclass(kw_only=True, slots=True)
@@ -58,120 +83,287 @@ class WasteDepotVisit(EcocitoEvent):
     """Represents a voluntary waste depot visit."""
 
 
+def _soup(content: str) -> BeautifulSoup:
+    """
+    Parse a page with BeautifulSoup.
+
+    bs4 is imported on first use: it is only needed to log in and to inspect
+    unexpected responses, not to import the integration.
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, "html.parser")
+
+
+async def _by_year[T: EcocitoEvent](
+    pages: AsyncIterator[list[T]], first_year: int, last_year: int
+) -> dict[int, list[T]]:
+    """Split the events of a multi-year range by year, every year included."""
+    years: dict[int, list[T]] = {year: [] for year in range(first_year, last_year + 1)}
+    async for page in pages:
+        for event in page:
+            if (events := years.get(event.date.year)) is not None:
+                events.append(event)
+    return years
+
+
 class EcocitoClient:
     """Ecocito client."""
 
-    def __init__(self, domain: str, username: str, password: str) -> None:
-        """Init the Ecocito client."""
+    def __init__(  # noqa: PLR0913
+        self,
+        domain: str,
+        username: str,
+        password: str,
+        *,
+        base_url: str | None = None,
+        connector: aiohttp.BaseConnector | None = None,
+        rate_limiter: TokenBucket | None = None,
+        backoff: BackoffPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        tracer: RequestTracer | None = None,
+        transport: EcocitoTransport | None = None,
+    ) -> None:
+        """
+        Init the Ecocito client.
+
+        ``base_url`` overrides the ``https://<domain>.ecocito.com`` server, e.g.
+        to target a local fake server in benchmarks. ``connector``,
+        ``rate_limiter`` and ``circuit_breaker`` may be shared by all clients
+        of the same Ecocito domain; the connector is then never closed here.
+        ``tracer`` records the phase timings of every request when given.
+        ``transport`` sends the requests in place of the session, e.g. to
+        record them to a cassette or replay one.
+        """
         self._domain = domain.split(".", maxsplit=1)[0]
+        self._base_url = (
+            base_url.rstrip("/") if base_url else ECOCITO_BASE_URL.format(self._domain)
+        )
         self._username = username
         self._password = password
-        self._cookies = aiohttp.CookieJar()
+        # A custom server is usually reached through an IP address, from which
+        # aiohttp only accepts cookies in unsafe mode.
+        self._cookies = aiohttp.CookieJar(unsafe=base_url is not None)
+        self._connector = connector
         self._auth_lock = asyncio.Lock()
+        self._rate_limiter = rate_limiter
+        self._backoff = backoff or BackoffPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.metrics = EcocitoMetrics()
+        self.tracer = tracer
+        self.transport = transport
+        # Called after every successful login, e.g. to persist the session.
+        self.on_authenticated: Callable[[], None] | None = None
+
+    def export_cookies(self) -> list[dict[str, str]]:
+        """Return the session cookies, to be restored with ``load_cookies``."""
+        return [
+            {"name": cookie.key, "value": cookie.value, "path": cookie["path"] or "/"}
+            for cookie in self._cookies
+        ]
+
+    def load_cookies(self, cookies: list[dict[str, str]]) -> None:
+        """
+        Restore session cookies, e.g. saved before a restart.
+
+        They are not checked here: a rejected session is answered with the login
+        page, on which the client logs in again.
+        """
+        jar: SimpleCookie = SimpleCookie()
+        for cookie in cookies:
+            jar[cookie["name"]] = cookie["value"]
+            jar[cookie["name"]]["path"] = cookie.get("path", "/")
+        self._cookies.update_cookies(jar, URL(self._base_url))
+
+    @contextlib.asynccontextmanager
+    async def _request(
+        self, method: str, url: str, *, what: str, **kwargs: Any
+    ) -> AsyncIterator[Response]:
+        """
+        Send an HTTP request to Ecocito and yield the response.
+
+        ``ClientResponseError`` (4xx/5xx) is mapped to InvalidAuthenticationError
+        for 401/403 and EcocitoError otherwise; it is a subclass of
+        ``ClientError`` (network, mapped to CannotConnectError) so it is caught
+        first. Timeouts are mapped to CannotConnectError too. ``what``
+        describes the operation for the error messages.
+        """
+        try:
+            async with aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=self._connector is None,
+                cookie_jar=self._cookies,
+                timeout=_HTTP_TIMEOUT,
+                trace_configs=[self.tracer.trace_config] if self.tracer else None,
+            ) as session:
+                response, start, timing = await self._send(
+                    session, method, url, **kwargs
+                )
+                try:
+                    yield response
+                finally:
+                    response.release()
+                    self.metrics.record_request(time.monotonic() - start)
+                    if timing is not None:
+                        self.tracer.finish(timing)
+        except aiohttp.ClientResponseError as e:
+            if e.status in (401, 403):
+                msg = f"Authentication error while {what}: {e}"
+                raise InvalidAuthenticationError(msg) from e
+            msg = f"Unexpected server response while {what}: {e}"
+            raise EcocitoError(msg) from e
+        except (aiohttp.ClientError, TimeoutError) as e:
+            msg = f"Cannot connect to Ecocito while {what}: {e!r}"
+            raise CannotConnectError(msg) from e
+
+    async def _send(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> tuple[Response, float, RequestTiming | None]:
+        """
+        Send a request, pausing and retrying while Ecocito throttles or fails.
+
+        Every attempt is first checked against the circuit breaker, which fails
+        fast while Ecocito is considered down, then takes a token from the rate
+        limiter. Responses with a retryable status are retried after the
+        backoff policy delay, which honors the ``Retry-After`` header. Return
+        the response, the start time of the successful attempt and its timing
+        (when traced).
+        """
+        send = (
+            session.request
+            if self.transport is None
+            else functools.partial(self.transport.request, session)
+        )
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            start = time.monotonic()
+            timing = RequestTiming() if self.tracer is not None else None
+            try:
+                response = await send(
+                    method,
+                    url,
+                    raise_for_status=True,
+                    trace_request_ctx=timing,
+                    **kwargs,
+                )
+            except aiohttp.ClientResponseError as e:
+                self.metrics.record_request(time.monotonic() - start)
+                if e.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                if e.status not in RETRYABLE_STATUSES:
+                    raise
+                retry_after = parse_retry_after(
+                    e.headers.get("Retry-After") if e.headers else None
+                )
+                delay = self._backoff.delay(attempt, retry_after)
+                if delay is None:
+                    raise
+                LOGGER.debug(
+                    "Ecocito answered %s, retrying in %.1f seconds", e.status, delay
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+            except (aiohttp.ClientError, TimeoutError):
+                self.metrics.record_request(time.monotonic() - start)
+                self.circuit_breaker.record_failure()
+                raise
+            else:
+                self.circuit_breaker.record_success()
+                return response, start, timing
+
+    async def _fetch_text(self, url: str, *, what: str, **kwargs: Any) -> str:
+        """Send a GET request and return the response body."""
+        async with self._request("GET", url, what=what, **kwargs) as response:
+            return await response.text()
+
+    async def _feed_html(
+        self, url: str, parser: CollectionTypeSelectParser, *, what: str
+    ) -> None:
+        """
+        Stream a page into an incremental parser.
+
+        Reading stops as soon as the parser is done: the rest of the body is
+        never downloaded, and the connection is closed instead of reused.
+        """
+        async with self._request("GET", url, what=what) as response:
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                errors="replace"
+            )
+            async for chunk in response.content.iter_chunked(_HTML_CHUNK_SIZE):
+                parser.feed(decoder.decode(chunk))
+                if parser.done:
+                    return
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
 
     async def authenticate(self) -> None:
         """Authenticate to Ecocito."""
         async with (
             self._auth_lock,
-            aiohttp.ClientSession(
-                cookie_jar=self._cookies, timeout=_HTTP_TIMEOUT
-            ) as session,
+            self._request(
+                "POST",
+                f"{self._base_url}{ECOCITO_LOGIN_URI}",
+                what="logging in",
+                data={
+                    ECOCITO_LOGIN_USERNAME_KEY: self._username,
+                    ECOCITO_LOGIN_PASSWORD_KEY: self._password,
+                },
+            ) as response,
         ):
-            try:
-                async with session.post(
-                    ECOCITO_LOGIN_ENDPOINT.format(self._domain),
-                    data={
-                        ECOCITO_LOGIN_USERNAME_KEY: self._username,
-                        ECOCITO_LOGIN_PASSWORD_KEY: self._password,
-                    },
-                    raise_for_status=True,
-                ) as response:
-                    if not self._cookies:
-                        raise InvalidAuthenticationError
-                    html = bs(await response.text(), "html.parser")
-                    error = html.find_all("div", {"class": "validation-summary-errors"})
-                    if error:
-                        raise InvalidAuthenticationError(error[0].find("li").text)
-                    LOGGER.debug("Connected as %s", self._username)
-            except aiohttp.ClientResponseError as e:
-                if e.status in (401, 403):
-                    msg = f"Authentication error: {e}"
-                    raise InvalidAuthenticationError(msg) from e
-                msg = f"Unexpected server response during authentication: {e}"
-                raise EcocitoError(msg) from e
-            except aiohttp.ClientError as e:
-                msg = f"Cannot connect to Ecocito: {e}"
-                raise CannotConnectError(msg) from e
+            if not self._cookies:
+                raise InvalidAuthenticationError
+            html = _soup(await response.text())
+            error = html.find_all("div", {"class": "validation-summary-errors"})
+            if error:
+                raise InvalidAuthenticationError(error[0].find("li").text)
+            LOGGER.debug("Connected as %s", self._username)
+        if self.on_authenticated is not None:
+            self.on_authenticated()
 
     async def get_collection_types(self) -> list[CollectionType]:
         """Return the list of collection types from the collection page."""
-        async with aiohttp.ClientSession(
-            cookie_jar=self._cookies, timeout=_HTTP_TIMEOUT
-        ) as session:
-            for attempt in range(_MAX_RETRIES):
-                try:
-                    async with session.get(
-                        ECOCITO_COLLECTION_PAGE_ENDPOINT.format(self._domain),
-                        raise_for_status=True,
-                    ) as response:
-                        content = await response.text()
-                except aiohttp.ClientResponseError as e:
-                    if e.status in (401, 403):
-                        msg = (
-                            f"Authentication error while fetching collection types: {e}"
-                        )
-                        raise InvalidAuthenticationError(msg) from e
-                    msg = (
-                        f"Unexpected server response while fetching"
-                        f" collection types: {e}"
-                    )
-                    raise EcocitoError(msg) from e
-                except aiohttp.ClientError as e:
-                    msg = f"Unable to get collection types: {e}"
-                    raise CannotConnectError(msg) from e
-
-                html = bs(content, "html.parser")
-
-                # Session may have expired; check for login form.
-                form = html.find("form", action=re.compile(f"{ECOCITO_LOGIN_URI}"))
-                if form:
-                    LOGGER.debug("The session has expired, re-authenticating.")
-                    await self.authenticate()
-                    if attempt == _MAX_RETRIES - 1:
-                        msg = "Max retries reached while fetching collection types"
-                        raise EcocitoError(msg) from None
-                    continue
-
-                # The collection type selector uses Filtres_IdMatiere as its
-                # identifier (name: Filtres.IdMatiere).
-                select = html.find("select", {"id": "Filtres_IdMatiere"}) or html.find(
-                    "select", {"name": "Filtres.IdMatiere"}
+        for attempt in range(_MAX_RETRIES):
+            parser = CollectionTypeSelectParser()
+            await self._feed_html(
+                f"{self._base_url}{ECOCITO_COLLECTION_PAGE_URI}",
+                parser,
+                what="fetching collection types",
+            )
+
+            # Session may have expired; check for login form.
+            if parser.login_form:
+                LOGGER.debug("The session has expired, re-authenticating.")
+                await self.authenticate()
+                if attempt == _MAX_RETRIES - 1:
+                    msg = "Max retries reached while fetching collection types"
+                    raise EcocitoError(msg) from None
+                continue
+
+            if not parser.found:
+                # Log all select elements found to help diagnose the issue.
+                LOGGER.debug(
+                    "IdMatiere select not found. All <select> elements: %s",
+                    parser.selects,
                 )
-                if not select:
-                    # Log all select elements found to help diagnose the issue.
-                    all_selects = html.find_all("select")
-                    LOGGER.debug(
-                        "IdMatiere select not found. All <select> elements: %s",
-                        [(s.get("id"), s.get("name")) for s in all_selects],
-                    )
-                    msg = "Cannot find collection type selector on the Ecocito page"
-                    raise EcocitoError(msg)
-
-                types = [
-                    CollectionType(id=opt["value"], name=opt.get_text(strip=True))
-                    for opt in select.find_all("option")
-                    if opt.get("value", "")
-                    not in (
-                        "",
-                        str(ECOCITO_DEFAULT_COLLECTION_TYPE),
-                    )
-                ]
-                if not types:
-                    msg = "No collection types found on the Ecocito page"
-                    raise EcocitoError(msg)
-
-                LOGGER.debug("Discovered %d collection type(s)", len(types))
-                return types
+                msg = "Cannot find collection type selector on the Ecocito page"
+                raise EcocitoError(msg)
+
+            types = [
+                CollectionType(id=value, name=name)
+                for value, name in parser.options
+                if value not in ("", str(ECOCITO_DEFAULT_COLLECTION_TYPE))
+            ]
+            if not types:
+                msg = "No collection types found on the Ecocito page"
+                raise EcocitoError(msg)
+
+            LOGGER.debug("Discovered %d collection type(s)", len(types))
+            return types
         msg = "Max retries reached while fetching collection types"
         raise EcocitoError(msg)
 
@@ -179,138 +371,170 @@ class EcocitoClient:
         self, event_type: str, year: int
     ) -> list[CollectionEvent]:
         """Return the list of the collection events for a type and a year."""
-        async with aiohttp.ClientSession(
-            cookie_jar=self._cookies, timeout=_HTTP_TIMEOUT
-        ) as session:
-            for attempt in range(_MAX_RETRIES):
-                try:
-                    async with session.get(
-                        ECOCITO_COLLECTION_ENDPOINT.format(self._domain),
-                        params={
-                            "charger": "true",
-                            "skip": "0",
-                            "take": "1000",
-                            "requireTotalCount": "true",
-                            "idMatiere": str(event_type),
-                            "dateDebut": f"{year}-01-01T00:00:00.000Z",
-                            "dateFin": f"{year}-12-31T23:59:59.999Z",
-                        },
-                        raise_for_status=True,
-                    ) as response:
-                        content = await response.text()
-                except aiohttp.ClientResponseError as e:
-                    if e.status in (401, 403):
-                        msg = (
-                            f"Authentication error while fetching"
-                            f" collection events: {e}"
-                        )
-                        raise InvalidAuthenticationError(msg) from e
-                    msg = (
-                        f"Unexpected server response while fetching"
-                        f" collection events: {e}"
-                    )
-                    raise EcocitoError(msg) from e
-                except aiohttp.ClientError as e:
-                    msg = f"Unable to get collection events: {e}"
-                    raise CannotConnectError(msg) from e
-
-                try:
-                    payload = json.loads(content)
-                except json.JSONDecodeError:
-                    # Non-JSON response likely means the session has expired
-                    # and the server returned an HTML login page.
-                    await self._handle_expired_session(content)
-                    if attempt == _MAX_RETRIES - 1:
-                        msg = "Max retries reached while fetching collection events"
-                        raise EcocitoError(msg) from None
-                    continue
-
-                try:
-                    return [
-                        CollectionEvent(
-                            type=event_type,
-                            date=datetime.fromisoformat(row["DATE_DONNEE"]),
-                            location=row["LIBELLE_ADRESSE"],
-                            quantity=row["QUANTITE_NETTE"],
-                        )
-                        for row in payload.get("data", [])
-                    ]
-                except (KeyError, ValueError) as e:
-                    msg = f"Unexpected server response from Ecocito: {e}"
-                    raise EcocitoError(msg) from e
-        msg = "Max retries reached while fetching collection events"
-        raise EcocitoError(msg)
+        return [
+            event
+            async for page in self.iter_collection_events(
+                event_type, date(year, 1, 1), date(year, 12, 31)
+            )
+            for event in page
+        ]
+
+    async def get_collection_events_by_year(
+        self, event_type: str, first_year: int, last_year: int
+    ) -> dict[int, list[CollectionEvent]]:
+        """
+        Return the collection events of a type for a range of years, by year.
+
+        The years are fetched in one request spanning them (paged if needed)
+        instead of one request per year.
+        """
+        return await _by_year(
+            self.iter_collection_events(
+                event_type, date(first_year, 1, 1), date(last_year, 12, 31)
+            ),
+            first_year,
+            last_year,
+        )
 
     async def get_addresses(
         self, year: int, collection_types: list[CollectionType]
     ) -> list[str]:
         """Return sorted unique addresses from all collection types."""
-        locations: set[str] = set()
-        for ctype in collection_types:
-            events = await self.get_collection_events(ctype.id, year)
-            locations.update(event.location for event in events if event.location)
-        return sorted(locations)
+        results = await asyncio.gather(
+            *(self.get_collection_events(ctype.id, year) for ctype in collection_types)
+        )
+        return sorted(
+            {event.location for events in results for event in events if event.location}
+        )
 
     async def get_waste_depot_visits(self, year: int) -> list[WasteDepotVisit]:
         """Return the list of the waste depot visits for a year."""
-        async with aiohttp.ClientSession(
-            cookie_jar=self._cookies, timeout=_HTTP_TIMEOUT
-        ) as session:
-            for attempt in range(_MAX_RETRIES):
-                try:
-                    async with session.get(
-                        ECOCITO_WASTE_DEPOSIT_ENDPOINT.format(self._domain),
-                        params={
-                            "charger": "true",
-                            "skip": "0",
-                            "take": "1000",
-                            "requireTotalCount": "true",
-                            "idMatiere": str(ECOCITO_DEFAULT_COLLECTION_TYPE),
-                            "dateDebut": f"{year}-01-01T00:00:00.000Z",
-                            "dateFin": f"{year}-12-31T23:59:59.999Z",
-                        },
-                        raise_for_status=True,
-                    ) as response:
-                        content = await response.text()
-                except aiohttp.ClientResponseError as e:
-                    if e.status in (401, 403):
-                        msg = (
-                            f"Authentication error while fetching"
-                            f" waste depot visits: {e}"
-                        )
-                        raise InvalidAuthenticationError(msg) from e
-                    msg = (
-                        f"Unexpected server response while fetching"
-                        f" waste depot visits: {e}"
+        return [
+            visit
+            async for page in self.iter_waste_depot_visits(
+                date(year, 1, 1), date(year, 12, 31)
+            )
+            for visit in page
+        ]
+
+    async def get_waste_depot_visits_by_year(
+        self, first_year: int, last_year: int
+    ) -> dict[int, list[WasteDepotVisit]]:
+        """Return the waste depot visits of a range of years, by year."""
+        return await _by_year(
+            self.iter_waste_depot_visits(
+                date(first_year, 1, 1), date(last_year, 12, 31)
+            ),
+            first_year,
+            last_year,
+        )
+
+    async def iter_collection_events(
+        self, event_type: str, start: date, end: date
+    ) -> AsyncIterator[list[CollectionEvent]]:
+        """
+        Yield the collection events of a type between two days, by page.
+
+        A page is only requested once the previous one was consumed, so any
+        date range is processed in the memory of one page; stopping early
+        sends no further request.
+        """
+        async for rows in self._iter_pages(
+            f"{self._base_url}{ECOCITO_COLLECTION_URI}",
+            event_type,
+            start,
+            end,
+            what="fetching collection events",
+        ):
+            try:
+                yield [
+                    CollectionEvent(
+                        type=event_type,
+                        date=datetime.fromisoformat(row["DATE_DONNEE"]),
+                        location=row["LIBELLE_ADRESSE"],
+                        quantity=row["QUANTITE_NETTE"],
                     )
-                    raise EcocitoError(msg) from e
-                except aiohttp.ClientError as e:
-                    msg = f"Unable to get waste depot visits: {e}"
-                    raise CannotConnectError(msg) from e
+                    for row in rows
+                ]
+            except (KeyError, ValueError) as e:
+                msg = f"Unexpected server response from Ecocito: {e}"
+                raise EcocitoError(msg) from e
 
-                try:
-                    payload = json.loads(content)
-                except json.JSONDecodeError:
-                    await self._handle_expired_session(content)
-                    if attempt == _MAX_RETRIES - 1:
-                        msg = "Max retries reached while fetching waste depot visits"
-                        raise EcocitoError(msg) from None
-                    continue
+    async def iter_waste_depot_visits(
+        self, start: date, end: date
+    ) -> AsyncIterator[list[WasteDepotVisit]]:
+        """
+        Yield the waste depot visits between two days, by page.
+
+        Pages are requested as they are consumed, like
+        ``iter_collection_events``.
+        """
+        async for rows in self._iter_pages(
+            f"{self._base_url}{ECOCITO_WASTE_DEPOSIT_URI}",
+            str(ECOCITO_DEFAULT_COLLECTION_TYPE),
+            start,
+            end,
+            what="fetching waste depot visits",
+        ):
+            try:
+                yield [
+                    WasteDepotVisit(date=datetime.fromisoformat(row["DATE_DONNEE"]))
+                    for row in rows
+                ]
+            except (KeyError, ValueError) as e:
+                msg = f"Unexpected server response from Ecocito: {e}"
+                raise EcocitoError(msg) from e
 
-                try:
-                    return [
-                        WasteDepotVisit(date=datetime.fromisoformat(row["DATE_DONNEE"]))
-                        for row in payload.get("data", [])
-                    ]
-                except (KeyError, ValueError) as e:
-                    msg = f"Unexpected server response from Ecocito: {e}"
-                    raise EcocitoError(msg) from e
-        msg = "Max retries reached while fetching waste depot visits"
+    async def _iter_pages(
+        self, url: str, type_id: str, start: date, end: date, *, what: str
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield the rows of a paged Ecocito endpoint, one page at a time.
+
+        Pages are requested until one is short or ``totalCount`` is reached, so
+        that only one page is held in memory whatever the date range.
+        """
+        skip = 0
+        while True:
+            payload = await self._fetch_json(
+                url,
+                what=what,
+                params={
+                    "charger": "true",
+                    "skip": str(skip),
+                    "take": str(_PAGE_SIZE),
+                    "requireTotalCount": "true",
+                    "idMatiere": type_id,
+                    "dateDebut": f"{start.isoformat()}T00:00:00.000Z",
+                    "dateFin": f"{end.isoformat()}T23:59:59.999Z",
+                },
+            )
+            rows = payload.get("data", [])
+            yield rows
+            skip += len(rows)
+            total = payload.get("totalCount")
+            if len(rows) < _PAGE_SIZE or (isinstance(total, int) and skip >= total):
+                return
+
+    async def _fetch_json(self, url: str, *, what: str, **kwargs: Any) -> Any:
+        """Send a GET request and decode its JSON body, re-authenticating if needed."""
+        for attempt in range(_MAX_RETRIES):
+            content = await self._fetch_text(url, what=what, **kwargs)
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError:
+                # Non-JSON response likely means the session has expired
+                # and the server returned an HTML login page.
+                await self._handle_expired_session(content)
+                if attempt == _MAX_RETRIES - 1:
+                    msg = f"Max retries reached while {what}"
+                    raise EcocitoError(msg) from None
+        msg = f"Max retries reached while {what}"
         raise EcocitoError(msg)
 
     async def _handle_expired_session(self, content: str) -> None:
         """Re-authenticate if the session has expired, raise otherwise."""
-        html = bs(content, "html.parser")
+        html = _soup(content)
         form = html.find("form", action=re.compile(f"{ECOCITO_LOGIN_URI}"))
         if form:
             LOGGER.debug("The session has expired, re-authenticating.")
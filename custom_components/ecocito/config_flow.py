@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Any
+from zoneinfo import ZoneInfo
 
 import voluptuous as vol
 from homeassistant.config_entries import (
     ConfigEntry,
+    ConfigEntryState,
     ConfigFlow,
     ConfigFlowResult,
     OptionsFlow,
@@ -15,14 +18,34 @@ from homeassistant.config_entries import (
 from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
 )
 
-from .client import EcocitoClient
-from .const import CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS, DOMAIN
-from .errors import CannotConnectError, InvalidAuthenticationError
+from . import account_unique_id
+from .client import CollectionType, EcocitoClient
+from .const import (
+    CONF_HISTORY_YEARS,
+    CONF_MAX_BACKOFF,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_TRACE_REQUESTS,
+    CONF_TRACKED_TYPES,
+    CONF_TYPE_HISTORY_YEARS,
+    DEFAULT_HISTORY_YEARS,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TRACE_REQUESTS,
+    DOMAIN,
+    NO_ADDRESS,
+)
+from .errors import CannotConnectError, EcocitoError, InvalidAuthenticationError
+from .session import SessionCookies, async_stash_flow_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,28 +58,50 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
-    """Validate the user input allows us to connect."""
+async def validate_input(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> SessionCookies | None:
+    """Validate the user input allows us to connect, returning the session."""
     client = EcocitoClient(data[CONF_DOMAIN], data[CONF_USERNAME], data[CONF_PASSWORD])
     await client.authenticate()
+    return client.export_cookies()
 
 
 class EcocitoOptionsFlow(OptionsFlow):
-    """Handle options for the Ecocito integration."""
+    """
+    Handle options for the Ecocito integration.
+
+    The general options are followed, when the entry is loaded, by the choice
+    of the collection types tracked at each address and of the years of
+    history of each tracked type.
+    """
 
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
         self._config_entry = config_entry
+        self._options: dict[str, Any] = {}
+        self._types: list[CollectionType] = []
+        self._addresses: list[str] = []
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the options step."""
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
-        current = self._config_entry.options.get(
-            CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS
-        )
+            # The tracking options are only changed by the next steps.
+            self._options = {
+                **{
+                    key: value
+                    for key, value in self._config_entry.options.items()
+                    if key in (CONF_TRACKED_TYPES, CONF_TYPE_HISTORY_YEARS)
+                },
+                **user_input,
+            }
+            if self._config_entry.state is not ConfigEntryState.LOADED:
+                return self.async_create_entry(data=self._options)
+            return await self.async_step_tracking()
+        options = self._config_entry.options
+        current = options.get(CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS)
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -66,10 +111,161 @@ class EcocitoOptionsFlow(OptionsFlow):
                             min=0, max=5, step=1, mode=NumberSelectorMode.BOX
                         )
                     ),
+                    vol.Optional(
+                        CONF_REQUESTS_PER_MINUTE,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE
+                            )
+                        },
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0, max=600, step=1, mode=NumberSelectorMode.BOX
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MAX_BACKOFF,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_MAX_BACKOFF, DEFAULT_MAX_BACKOFF
+                            )
+                        },
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=600,
+                            step=1,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_TRACE_REQUESTS,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_TRACE_REQUESTS, DEFAULT_TRACE_REQUESTS
+                            )
+                        },
+                    ): BooleanSelector(),
                 }
             ),
         )
 
+    async def async_step_tracking(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Choose the collection types tracked at each address."""
+        if user_input is not None:
+            self._options[CONF_TRACKED_TYPES] = {
+                address: user_input.get(self._address_field(address), [])
+                for address in self._addresses or [NO_ADDRESS]
+            }
+            if not int(self._options.get(CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS)):
+                self._options.pop(CONF_TYPE_HISTORY_YEARS, None)
+                return self.async_create_entry(data=self._options)
+            return await self.async_step_years()
+
+        client: EcocitoClient = self._config_entry.runtime_data.client
+        try:
+            self._types = await client.get_collection_types()
+            self._addresses = await client.get_addresses(
+                datetime.now(tz=ZoneInfo(self.hass.config.time_zone)).year,
+                self._types,
+            )
+        except EcocitoError as err:
+            _LOGGER.warning(
+                "Cannot discover the addresses and collection types: %s", err
+            )
+            return self.async_abort(reason="cannot_connect")
+
+        tracked: dict[str, list[str]] | None = self._config_entry.options.get(
+            CONF_TRACKED_TYPES
+        )
+        type_ids = [ctype.id for ctype in self._types]
+        type_options = [
+            SelectOptionDict(value=ctype.id, label=ctype.name) for ctype in self._types
+        ]
+        return self.async_show_form(
+            step_id="tracking",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        self._address_field(address),
+                        # New addresses and types are tracked by default.
+                        default=type_ids
+                        if tracked is None or address not in tracked
+                        else [
+                            type_id
+                            for type_id in type_ids
+                            if type_id in tracked[address]
+                        ],
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=type_options,
+                            multiple=True,
+                            mode=SelectSelectorMode.LIST,
+                        )
+                    )
+                    for address in self._addresses or [NO_ADDRESS]
+                }
+            ),
+        )
+
+    async def async_step_years(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Choose the years of history of each tracked collection type."""
+        tracked_ids = {
+            type_id
+            for type_ids in self._options[CONF_TRACKED_TYPES].values()
+            for type_id in type_ids
+        }
+        types = [ctype for ctype in self._types if ctype.id in tracked_ids]
+        if user_input is not None or not types:
+            self._options[CONF_TYPE_HISTORY_YEARS] = {
+                ctype.id: int(user_input[self._type_field(ctype)]) for ctype in types
+            }
+            return self.async_create_entry(data=self._options)
+
+        history_years = int(
+            self._options.get(CONF_HISTORY_YEARS, DEFAULT_HISTORY_YEARS)
+        )
+        current: dict[str, int] = self._config_entry.options.get(
+            CONF_TYPE_HISTORY_YEARS, {}
+        )
+        return self.async_show_form(
+            step_id="years",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        self._type_field(ctype),
+                        default=min(
+                            current.get(ctype.id, history_years), history_years
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=history_years,
+                            step=1,
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    )
+                    for ctype in types
+                }
+            ),
+            description_placeholders={"history_years": str(history_years)},
+        )
+
+    @staticmethod
+    def _address_field(address: str) -> str:
+        """Return the form field of an address, labelled with the address."""
+        return address or CONF_TRACKED_TYPES
+
+    @staticmethod
+    def _type_field(ctype: CollectionType) -> str:
+        """Return the form field of a collection type, labelled with its name."""
+        return f"{ctype.name} ({ctype.id})"
+
 
 class EcocitoConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for ecocito."""
@@ -88,8 +284,10 @@ class EcocitoConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            await self.async_set_unique_id(account_unique_id(user_input))
+            self._abort_if_unique_id_configured()
             try:
-                await validate_input(self.hass, user_input)
+                cookies = await validate_input(self.hass, user_input)
             except CannotConnectError:
                 errors["base"] = "cannot_connect"
             except InvalidAuthenticationError:
@@ -98,6 +296,9 @@ class EcocitoConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
+                # The entry is set up with this session rather than a new login.
+                if cookies:
+                    async_stash_flow_session(self.hass, self.unique_id, cookies)
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME], data=user_input
                 )
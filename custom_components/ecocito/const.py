@@ -1,7 +1,9 @@
 """Constants for the ecocito integration."""
 
 import logging
+import re
 from dataclasses import dataclass
+from datetime import timedelta
 
 DOMAIN = "ecocito"
 LOGGER = logging.getLogger(__package__)
@@ -11,6 +13,58 @@ LOGGER = logging.getLogger(__package__)
 CONF_HISTORY_YEARS = "history_years"
 DEFAULT_HISTORY_YEARS = 2
 
+# Collection types tracked per address ("" when the account has no address)
+# and years of history per collection type, both chosen in the options flow.
+# Without them, every discovered type of every address is tracked for
+# history_years.
+CONF_TRACKED_TYPES = "tracked_types"
+CONF_TYPE_HISTORY_YEARS = "type_history_years"
+NO_ADDRESS = ""
+
+# Requests per minute allowed per Ecocito domain (0 disables rate limiting),
+# and the longest pause accepted before retrying a throttled request.
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+DEFAULT_REQUESTS_PER_MINUTE = 60
+CONF_MAX_BACKOFF = "max_backoff"
+DEFAULT_MAX_BACKOFF = 60
+# Record the phase timings of every request to a rotating file in the
+# configuration directory.
+CONF_TRACE_REQUESTS = "trace_requests"
+DEFAULT_TRACE_REQUESTS = False
+
+# Runtime data shared by all config entries (hass.data[DOMAIN])
+
+DATA_POOLS = "pools"
+# Session cookies of config flows, handed over to the setup of their entry
+DATA_SESSIONS = "sessions"
+# Successive logins are saved at most once per this many seconds.
+SESSION_SAVE_DELAY = 10
+RATE_LIMIT_BURST = 10
+# Concurrent connections to one Ecocito domain, shared by all its accounts.
+POOL_MAX_CONNECTIONS = 4
+
+# Coordinators of previous years refreshed at once after Home Assistant started
+HISTORY_LOAD_CONCURRENCY = 2
+
+# Rolling window sensors: periods, and how often expired events are evicted
+ROLLING_WINDOWS = {"30d": timedelta(days=30), "12m": timedelta(days=365)}
+ROLLING_WINDOW_EVICT_INTERVAL = timedelta(hours=1)
+
+# Collection weight anomalies: smoothing factor of the weight EWMA, samples
+# needed before scoring, and z-score above which a collection is unusual
+ANOMALY_EWMA_ALPHA = 0.2
+ANOMALY_MIN_SAMPLES = 10
+ANOMALY_Z_THRESHOLD = 3.0
+EVENT_COLLECTION_ANOMALY = f"{DOMAIN}_collection_anomaly"
+
+# Fired for every collection that appears between two refreshes of a year
+EVENT_NEW_COLLECTION = f"{DOMAIN}_new_collection"
+
+# Dispatcher signals, formatted with the config entry id
+
+SIGNAL_COORDINATORS_ADDED = f"{DOMAIN}_coordinators_added_{{}}"
+SIGNAL_COLLECTION_TYPES_REMOVED = f"{DOMAIN}_collection_types_removed_{{}}"
+
 # Service Device
 
 DEVICE_ATTRIBUTION = "Données fournies par Ecocito"
@@ -21,11 +75,12 @@ DEVICE_MODEL = "Calendrier Ecocito"
 # Ecocito - Base
 
 ECOCITO_DOMAIN = "{}.ecocito.com"
+ECOCITO_BASE_URL = f"https://{ECOCITO_DOMAIN}"
 
 # Ecocito - Login
 
 ECOCITO_LOGIN_URI = "/Usager/Profil/Connexion"
-ECOCITO_LOGIN_ENDPOINT = f"https://{ECOCITO_DOMAIN}{ECOCITO_LOGIN_URI}"
+ECOCITO_LOGIN_ENDPOINT = f"{ECOCITO_BASE_URL}{ECOCITO_LOGIN_URI}"
 ECOCITO_LOGIN_USERNAME_KEY = "Identifiant"
 ECOCITO_LOGIN_PASSWORD_KEY = "MotDePasse"  # noqa: S105
 
@@ -33,19 +88,23 @@ ECOCITO_LOGIN_PASSWORD_KEY = "MotDePasse"  # noqa: S105
 ECOCITO_DEFAULT_COLLECTION_TYPE = -1
 
 # Ecocito - Collection endpoints
-ECOCITO_COLLECTION_PAGE_ENDPOINT = f"https://{ECOCITO_DOMAIN}/Usager/Collecte"
-ECOCITO_COLLECTION_ENDPOINT = f"https://{ECOCITO_DOMAIN}/Usager/Collecte/GetCollecte"
+ECOCITO_COLLECTION_PAGE_URI = "/Usager/Collecte"
+ECOCITO_COLLECTION_PAGE_ENDPOINT = f"{ECOCITO_BASE_URL}{ECOCITO_COLLECTION_PAGE_URI}"
+ECOCITO_COLLECTION_URI = "/Usager/Collecte/GetCollecte"
+ECOCITO_COLLECTION_ENDPOINT = f"{ECOCITO_BASE_URL}{ECOCITO_COLLECTION_URI}"
 
 # Ecocito - Waste deposit visits
-ECOCITO_WASTE_DEPOSIT_ENDPOINT = f"https://{ECOCITO_DOMAIN}/Usager/Apport/GetApport"
+ECOCITO_WASTE_DEPOSIT_URI = "/Usager/Apport/GetApport"
+ECOCITO_WASTE_DEPOSIT_ENDPOINT = f"{ECOCITO_BASE_URL}{ECOCITO_WASTE_DEPOSIT_URI}"
 
 
 # ── Collection type hints ──────────────────────────────────────────────────────
 # Maps a regex pattern (matched case-insensitively against the API type name)
 # to a (translation_key, icon) hint used to give known types a proper icon and
-# localised sensor name.  First match wins.
+# localised sensor name.  First match wins.  Patterns are compiled once here.
 #
-# To add a new type: append a tuple (pattern, translation_key, icon).
+# To add a new type: append a tuple (re.compile(pattern, re.IGNORECASE),
+# CollectionTypeHint(translation_key, icon)).
 # If no pattern matches the API name, the generic "collection" fallback is used
 # and the raw API name is injected via the {type} translation placeholder.
 
@@ -58,25 +117,25 @@ class CollectionTypeHint:
     icon: str
 
 
-COLLECTION_TYPE_HINTS: list[tuple[str, CollectionTypeHint]] = [
+COLLECTION_TYPE_HINTS: list[tuple[re.Pattern[str], CollectionTypeHint]] = [
     # Household waste / ordures ménagères
     (
-        r"ordures?\s+m[eé]nag[eè]res?|\bOM\b",
+        re.compile(r"ordures?\s+m[eé]nag[eè]res?|\bOM\b", re.IGNORECASE),
         CollectionTypeHint(translation_key="garbage", icon="mdi:trash-can"),
     ),
     # Selective sorting / collecte sélective / recyclage
     (
-        r"recyclage|tri\s+s[eé]lectif|\bCS\b",
+        re.compile(r"recyclage|tri\s+s[eé]lectif|\bCS\b", re.IGNORECASE),
         CollectionTypeHint(translation_key="recycling", icon="mdi:recycle"),
     ),
     # Green waste / déchets verts
     (
-        r"d[eé]chets?\s+verts?|\bDV\b",
+        re.compile(r"d[eé]chets?\s+verts?|\bDV\b", re.IGNORECASE),
         CollectionTypeHint(translation_key="green_waste", icon="mdi:leaf"),
     ),
     # Badge / access card deposits
     (
-        r"badge",
+        re.compile(r"badge", re.IGNORECASE),
         CollectionTypeHint(translation_key="badge", icon="mdi:card-account-details"),
     ),
 ]
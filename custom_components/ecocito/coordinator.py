@@ -2,18 +2,181 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import time
 from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Awaitable, Callable, Coroutine
 from datetime import datetime, timedelta
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .aggregation import EventKey, diff_events
 from .client import CollectionEvent, CollectionType, EcocitoClient, WasteDepotVisit
-from .const import DOMAIN, LOGGER
-from .errors import CannotConnectError, EcocitoError, InvalidAuthenticationError
+from .const import DOMAIN, EVENT_NEW_COLLECTION, LOGGER
+from .errors import EcocitoError, InvalidAuthenticationError
+
+WASTE_DEPOT_STORE_KEY = "waste_depot"
+
+
+def collection_store_key(type_id: str) -> str:
+    """Return the year store key of a collection type."""
+    return f"collection_{type_id}"
+
+
+async def async_fetch_addresses(
+    client: EcocitoClient,
+    store: EcocitoYearStore,
+    year: int,
+    collection_types: list[CollectionType],
+) -> list[str]:
+    """
+    Return the sorted addresses of the events of a year, of every type.
+
+    The events are kept in the year store, where the first refresh of the
+    coordinators of that year finds them instead of fetching them again.
+    """
+    results = await asyncio.gather(
+        *(client.get_collection_events(ctype.id, year) for ctype in collection_types)
+    )
+    for ctype, events in zip(collection_types, results, strict=True):
+        store.set(collection_store_key(ctype.id), year, events, final=False)
+    return sorted(
+        {event.location for events in results for event in events if event.location}
+    )
+
+
+class EcocitoYearStore:
+    """
+    Data fetched from Ecocito, keyed by absolute year.
+
+    Coordinators target a year relative to the current one, which shifts at
+    New Year. Keeping what they fetch under the absolute year lets the data of
+    a year follow it to its next offset instead of being downloaded again: a
+    year fetched after it ended is final and is served from here from then on,
+    so a rollover only costs the new year and a last sync of the closed one.
+
+    Closed years are fetched together: the first coordinator needing one
+    fetches every closed year of its key that is not final yet in a single
+    spanning request, and the fetches in progress are shared. Years older
+    than the oldest one targeted by the coordinators of a key are forgotten.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the store."""
+        self._years: dict[tuple[str, int], tuple[list, bool]] = {}
+        self._year_offsets: dict[str, set[int]] = {}
+        self._pending: dict[str, tuple[range, asyncio.Task[dict[int, list]]]] = {}
+
+    def get(self, key: str, year: int) -> list | None:
+        """Return the latest data of a year, if it was fetched."""
+        if (entry := self._years.get((key, year))) is None:
+            return None
+        return entry[0]
+
+    def get_final(self, key: str, year: int) -> list | None:
+        """Return the data of a year if it was fetched after the year ended."""
+        if (entry := self._years.get((key, year))) is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def set(self, key: str, year: int, data: list, *, final: bool) -> None:
+        """Store the data of a year."""
+        self._years[key, year] = (data, final)
+
+    def add_year_offset(self, key: str, year_offset: int) -> None:
+        """Register the year offset of a coordinator of a key."""
+        self._year_offsets.setdefault(key, set()).add(year_offset)
+
+    async def async_fetch(
+        self,
+        key: str,
+        year: int,
+        current_year: int,
+        fetch: Callable[[int, int], Awaitable[dict[int, list]]],
+        *,
+        latest: bool = False,
+    ) -> list:
+        """
+        Return the data of a year, from the store once final.
+
+        ``fetch`` returns the data of a range of years, by year. The current
+        year is fetched on its own; a closed year with the other registered
+        closed years not final yet. With ``latest``, data stored before the
+        year ended is served as well.
+        """
+        self._evict_expired(key, current_year)
+        data = self.get(key, year) if latest else self.get_final(key, year)
+        if data is not None:
+            return data
+        pending = self._pending.get(key)
+        if pending is None or year not in pending[0]:
+            years = self._years_to_fetch(key, year, current_year)
+            task = asyncio.create_task(
+                self._async_fetch_years(key, years, current_year, fetch)
+            )
+            pending = self._pending[key] = (years, task)
+            task.add_done_callback(functools.partial(self._fetch_done, key))
+        # Shielded: a cancelled coordinator must not cancel the others' fetch.
+        return (await asyncio.shield(pending[1]))[year]
+
+    def discard(self, key: str) -> None:
+        """Forget every year of a key."""
+        for stored in [stored for stored in self._years if stored[0] == key]:
+            del self._years[stored]
+        self._year_offsets.pop(key, None)
+
+    def _evict_expired(self, key: str, current_year: int) -> None:
+        """Forget the years of a key that New Year moved out of its window."""
+        if not (year_offsets := self._year_offsets.get(key)):
+            return
+        first_year = current_year + min(year_offsets)
+        for stored in [
+            stored
+            for stored in self._years
+            if stored[0] == key and stored[1] < first_year
+        ]:
+            del self._years[stored]
+
+    def _years_to_fetch(self, key: str, year: int, current_year: int) -> range:
+        if year >= current_year:
+            return range(year, year + 1)
+        years = [
+            year,
+            *(
+                current_year + year_offset
+                for year_offset in self._year_offsets.get(key, ())
+                if year_offset < 0
+                and self.get_final(key, current_year + year_offset) is None
+            ),
+        ]
+        return range(min(years), max(years) + 1)
+
+    async def _async_fetch_years(
+        self,
+        key: str,
+        years: range,
+        current_year: int,
+        fetch: Callable[[int, int], Awaitable[dict[int, list]]],
+    ) -> dict[int, list]:
+        data = await fetch(years[0], years[-1])
+        for year in years:
+            self.set(key, year, data.get(year, []), final=year < current_year)
+        return {year: data.get(year, []) for year in years}
+
+    def _fetch_done(self, key: str, task: asyncio.Task[dict[int, list]]) -> None:
+        if (pending := self._pending.get(key)) is not None and pending[1] is task:
+            del self._pending[key]
+        if not task.cancelled():
+            # Raised to the coordinators waiting for it, if any are left.
+            task.exception()
 
 
 class EcocitoDataUpdateCoordinator[T: list](DataUpdateCoordinator[T], ABC):
@@ -35,18 +198,38 @@ class EcocitoDataUpdateCoordinator[T: list](DataUpdateCoordinator[T], ABC):
         )
         self.client = client
         self._time_zone = ZoneInfo(hass.config.time_zone)
+        # Set while the last refresh failed and the previous data is served.
+        self.stale = False
+        self.last_success: datetime | None = None
 
     async def _async_update_data(self) -> T:
-        """Get the latest data from Ecocito."""
+        """
+        Get the latest data from Ecocito.
+
+        When Ecocito cannot be reached (or the circuit breaker is open) and data
+        was already fetched, keep serving it flagged as stale instead of making
+        every entity unavailable.
+        """
+        start = time.monotonic()
+        success = False
         try:
-            return await self._fetch_data()
-        except CannotConnectError as ex:
-            raise UpdateFailed(ex) from ex
+            data = await self._fetch_data()
+            success = True
         except InvalidAuthenticationError as ex:
             msg = "Credentials are no longer valid. Please reauthenticate"
             raise ConfigEntryAuthFailed(msg) from ex
         except EcocitoError as ex:
-            raise UpdateFailed(ex) from ex
+            if self.data is None:
+                raise UpdateFailed(ex) from ex
+            LOGGER.debug("Serving stale data for %s: %s", self.name, ex)
+            self.stale = True
+            return self.data
+        else:
+            self.stale = False
+            self.last_success = dt_util.utcnow()
+        finally:
+            self.client.metrics.record_poll(time.monotonic() - start, success=success)
+        return data
 
     @abstractmethod
     async def _fetch_data(self) -> T:
@@ -54,35 +237,130 @@ class EcocitoDataUpdateCoordinator[T: list](DataUpdateCoordinator[T], ABC):
         raise NotImplementedError
 
 
+class EcocitoYearDataUpdateCoordinator[T: list](EcocitoDataUpdateCoordinator[T]):
+    """Coordinator of one year, relative to the current one."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: EcocitoClient,
+        year_offset: int,
+        store: EcocitoYearStore | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(hass, client)
+        self.year_offset = year_offset
+        self.store = store if store is not None else EcocitoYearStore()
+        self._fetched = False
+
+    @property
+    def year(self) -> int:
+        """Return the year currently targeted."""
+        return datetime.now(tz=self._time_zone).year + self.year_offset
+
+    async def _fetch_year(self, key: str) -> T:
+        """Return the data of the targeted year, from the store once final."""
+        current_year = datetime.now(tz=self._time_zone).year
+        # The first refresh takes what is already stored, such as the events
+        # fetched at setup to find the addresses; later ones poll Ecocito.
+        data = await self.store.async_fetch(
+            key,
+            current_year + self.year_offset,
+            current_year,
+            self._fetch_years_data,
+            latest=not self._fetched,
+        )
+        self._fetched = True
+        return data
+
+    @abstractmethod
+    async def _fetch_years_data(self, first_year: int, last_year: int) -> dict[int, T]:
+        """Fetch the data of a range of years, by year."""
+        raise NotImplementedError
+
+
 class CollectionEventsDataUpdateCoordinator(
-    EcocitoDataUpdateCoordinator[list[CollectionEvent]]
+    EcocitoYearDataUpdateCoordinator[list[CollectionEvent]]
 ):
     """Collection events update for a specific collection type from Ecocito."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         hass: HomeAssistant,
         client: EcocitoClient,
         collection_type: CollectionType,
         year_offset: int,
         location: str | None = None,
+        store: EcocitoYearStore | None = None,
     ) -> None:
         """Initialize the coordinator."""
-        super().__init__(hass, client)
+        super().__init__(hass, client, year_offset, store)
         self.collection_type = collection_type
-        self._year_offset = year_offset
-        self._location = location
+        self.location = location
+        self.store.add_year_offset(
+            collection_store_key(collection_type.id), year_offset
+        )
+        # Changes of the last refresh, for incremental aggregations.
+        self.new_events: list[CollectionEvent] = []
+        self.removed_events: list[EventKey] = []
+        self._event_keys: Counter[EventKey] = Counter()
+        # Year of the events indexed in _event_keys.
+        self._keys_year: int | None = None
+
+    async def _async_update_data(self) -> list[CollectionEvent]:
+        """Get the latest events and what changed since the previous refresh."""
+        self.new_events, self.removed_events = [], []
+        previous = self.data
+        year = self.year
+        events = await super()._async_update_data()
+        if events is not previous:
+            self._event_keys, self.new_events, self.removed_events = diff_events(
+                self._event_keys, events
+            )
+            # Loading a year (at startup, or when New Year moves it to this
+            # coordinator) brings its whole history, not new collections.
+            if year == self._keys_year:
+                self._fire_new_collections()
+            self._keys_year = year
+        return events
+
+    def _fire_new_collections(self) -> None:
+        """Fire an event for each collection that appeared since the last refresh."""
+        for event in self.new_events:
+            self.hass.bus.async_fire(
+                EVENT_NEW_COLLECTION,
+                {
+                    "config_entry_id": self.config_entry.entry_id,
+                    "collection_type_id": self.collection_type.id,
+                    "collection_type": self.collection_type.name,
+                    "location": event.location,
+                    "date": event.date.isoformat(),
+                    "weight": event.quantity,
+                },
+            )
 
     async def _fetch_data(self) -> list[CollectionEvent]:
         """Fetch the data."""
-        events = await self.client.get_collection_events(
-            self.collection_type.id,
-            datetime.now(tz=self._time_zone).year + self._year_offset,
-        )
-        if self._location is not None:
-            events = [e for e in events if e.location == self._location]
+        # The store holds the events of every address.
+        events = await self._fetch_year(collection_store_key(self.collection_type.id))
+        if self.location is not None:
+            events = [e for e in events if e.location == self.location]
         return events
 
+    async def _fetch_years_data(
+        self, first_year: int, last_year: int
+    ) -> dict[int, list[CollectionEvent]]:
+        """Fetch the events of a range of years, for every address."""
+        if first_year == last_year:
+            return {
+                first_year: await self.client.get_collection_events(
+                    self.collection_type.id, first_year
+                )
+            }
+        return await self.client.get_collection_events_by_year(
+            self.collection_type.id, first_year, last_year
+        )
+
 
 class CollectionTypesDataUpdateCoordinator(
     EcocitoDataUpdateCoordinator[list[CollectionType]]
@@ -90,52 +368,116 @@ class CollectionTypesDataUpdateCoordinator(
     """
     Collection types update coordinator.
 
-    Polls the Ecocito page hourly and triggers an integration reload if the
-    available collection types have changed since the last setup.
+    Polls the Ecocito page hourly and, when the available collection types (or
+    the account addresses, if tracked) have changed since the last poll, hands
+    the new lists to ``on_change`` so the integration can apply the difference
+    without reloading.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         hass: HomeAssistant,
         client: EcocitoClient,
         known_type_ids: frozenset[str],
+        *,
+        known_addresses: frozenset[str] | None = None,
+        year_store: EcocitoYearStore | None = None,
+        on_change: Callable[
+            [list[CollectionType], list[str]], Coroutine[Any, Any, None]
+        ]
+        | None = None,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(hass, client)
         self.update_interval = timedelta(hours=1)
         self._known_type_ids = known_type_ids
+        self._known_addresses = known_addresses
+        self._year_store = year_store
+        self._on_change = on_change
 
     async def _fetch_data(self) -> list[CollectionType]:
-        """Fetch the collection types and reload if they have changed."""
+        """Fetch the collection types and report any change."""
         types = await self.client.get_collection_types()
         current_ids = frozenset(t.id for t in types)
-        if current_ids != self._known_type_ids:
+        types_changed = current_ids != self._known_type_ids
+        addresses: list[str] = []
+        if self._known_addresses is not None:
+            addresses = await self._async_addresses(types, types_changed=types_changed)
+        changed = types_changed or (
+            self._known_addresses is not None
+            and not self._known_addresses.issuperset(addresses)
+        )
+        if changed:
             LOGGER.info(
-                "Collection types changed (was %s, now %s), reloading integration",
+                "Collection types or addresses changed (types were %s, now %s)",
                 self._known_type_ids,
                 current_ids,
             )
-            self.hass.async_create_task(
-                self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            )
+            if self._on_change is not None:
+                # Cancelled if the entry unloads while the change is applied.
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    self._on_change(types, addresses),
+                    f"{DOMAIN} discovery {self.config_entry.entry_id}",
+                )
             self._known_type_ids = current_ids
+            if self._known_addresses is not None:
+                self._known_addresses = self._known_addresses.union(addresses)
         return types
 
+    async def _async_addresses(
+        self, types: list[CollectionType], *, types_changed: bool
+    ) -> list[str]:
+        """
+        Return the addresses of the account.
+
+        They are read from the current-year events the collection coordinators
+        keep in the year store, without any request; when the types changed,
+        the events of each type are fetched into the store, where the
+        coordinators of new types find them.
+        """
+        year = datetime.now(tz=self._time_zone).year
+        if self._year_store is None:
+            return await self.client.get_addresses(year, types)
+        if types_changed:
+            return await async_fetch_addresses(
+                self.client, self._year_store, year, types
+            )
+        return sorted(
+            {
+                event.location
+                for ctype in types
+                for event in self._year_store.get(collection_store_key(ctype.id), year)
+                or ()
+                if event.location
+            }
+        )
+
 
 class WasteDepotVisitsDataUpdateCoordinator(
-    EcocitoDataUpdateCoordinator[list[WasteDepotVisit]]
+    EcocitoYearDataUpdateCoordinator[list[WasteDepotVisit]]
 ):
     """Waste depot visits list update from Ecocito."""
 
     def __init__(
-        self, hass: HomeAssistant, client: EcocitoClient, year_offset: int
+        self,
+        hass: HomeAssistant,
+        client: EcocitoClient,
+        year_offset: int,
+        store: EcocitoYearStore | None = None,
     ) -> None:
         """Initialize the coordinator."""
-        super().__init__(hass, client)
-        self._year_offset = year_offset
+        super().__init__(hass, client, year_offset, store)
+        self.store.add_year_offset(WASTE_DEPOT_STORE_KEY, year_offset)
 
     async def _fetch_data(self) -> list[WasteDepotVisit]:
         """Fetch the data."""
-        return await self.client.get_waste_depot_visits(
-            datetime.now(tz=self._time_zone).year + self._year_offset
-        )
+        return await self._fetch_year(WASTE_DEPOT_STORE_KEY)
+
+    async def _fetch_years_data(
+        self, first_year: int, last_year: int
+    ) -> dict[int, list[WasteDepotVisit]]:
+        """Fetch the visits of a range of years."""
+        if first_year == last_year:
+            return {first_year: await self.client.get_waste_depot_visits(first_year)}
+        return await self.client.get_waste_depot_visits_by_year(first_year, last_year)
@@ -0,0 +1,50 @@
+"""Diagnostics support for the Ecocito integration."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import EcocitoConfigEntry
+from .const import CONF_TRACKED_TYPES
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: EcocitoConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = entry.runtime_data
+    types_coordinator = data.collection_types_coordinator
+    tracer = types_coordinator.client.tracer
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": _redact_options(entry.options),
+        },
+        "collection_types": [
+            {"id": ctype.id, "name": ctype.name}
+            for ctype in types_coordinator.data or []
+        ],
+        "addresses": len(data.addresses),
+        "metrics": types_coordinator.client.metrics.as_dict(),
+        "circuit_breaker": types_coordinator.client.circuit_breaker.state,
+        "request_timings": tracer.as_dict() if tracer is not None else None,
+    }
+
+
+def _redact_options(options: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the options with the tracked addresses, used as keys, redacted."""
+    options = dict(options)
+    if (tracked := options.get(CONF_TRACKED_TYPES)) is not None:
+        # Numbered to keep the keys distinct; "" stands for no address.
+        options[CONF_TRACKED_TYPES] = {
+            f"{REDACTED}_{index}" if address else address: type_ids
+            for index, (address, type_ids) in enumerate(tracked.items(), start=1)
+        }
+    return options
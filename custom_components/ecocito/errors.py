@@ -13,3 +13,7 @@ class CannotConnectError(EcocitoError):
 
 class InvalidAuthenticationError(EcocitoError):
     """Error to indicate there is invalid auth."""
+
+
+class CircuitOpenError(CannotConnectError):
+    """Requests are suspended after repeated failures to reach Ecocito."""
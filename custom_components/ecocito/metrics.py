@@ -0,0 +1,80 @@
+"""Runtime metrics for the Ecocito integration."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+# Window over which HTTP request counts and response times are aggregated.
+_REQUEST_WINDOW = 3600.0
+
+
+class EcocitoMetrics:
+    """
+    HTTP and polling statistics of one Ecocito client.
+
+    Request samples are kept in a time-ordered deque pruned to the last hour,
+    with a running sum so that the count and average are O(1) to read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._requests: deque[tuple[float, float]] = deque()
+        self._requests_duration = 0.0
+        self._listeners: list[Callable[[], None]] = []
+        self.last_poll_duration: float | None = None
+        self.consecutive_failures = 0
+
+    def record_request(self, duration: float) -> None:
+        """Record one HTTP request and its duration in seconds."""
+        self._requests.append((time.monotonic(), duration))
+        self._requests_duration += duration
+        self._prune()
+
+    def record_poll(self, duration: float, *, success: bool) -> None:
+        """Record one coordinator refresh and notify listeners."""
+        self.last_poll_duration = duration
+        self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @property
+    def requests_last_hour(self) -> int:
+        """Return the number of HTTP requests sent during the last hour."""
+        self._prune()
+        return len(self._requests)
+
+    @property
+    def average_response_time(self) -> float | None:
+        """Return the average HTTP response time (seconds) over the last hour."""
+        self._prune()
+        if not self._requests:
+            return None
+        return self._requests_duration / len(self._requests)
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable:
+        """Listen for metric updates; return a callable removing the listener."""
+        self._listeners.append(update_callback)
+
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a snapshot of the metrics, used by the diagnostics dump."""
+        return {
+            "last_poll_duration": self.last_poll_duration,
+            "requests_last_hour": self.requests_last_hour,
+            "average_response_time": self.average_response_time,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+    def _prune(self) -> None:
+        """Drop request samples older than the aggregation window."""
+        cutoff = time.monotonic() - _REQUEST_WINDOW
+        while self._requests and self._requests[0][0] < cutoff:
+            _, duration = self._requests.popleft()
+            self._requests_duration -= duration
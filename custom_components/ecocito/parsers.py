@@ -0,0 +1,76 @@
+"""Incremental HTML extractors for Ecocito pages."""
+
+from __future__ import annotations
+
+from html.parser import HTMLParser
+
+from .const import ECOCITO_LOGIN_URI
+
+# The collection type selector uses Filtres_IdMatiere as its identifier
+# (name: Filtres.IdMatiere).
+_SELECT_ID = "Filtres_IdMatiere"
+_SELECT_NAME = "Filtres.IdMatiere"
+
+
+class CollectionTypeSelectParser(HTMLParser):
+    """
+    Extract the collection type options from the collection page.
+
+    The page is fed chunk by chunk as it is downloaded; ``done`` becomes True
+    once the closing tag of the selector (or a login form, when the session
+    has expired) has been seen, so the rest of the body need not be read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        super().__init__()
+        self.options: list[tuple[str, str]] = []
+        self.selects: list[tuple[str | None, str | None]] = []
+        self.found = False
+        self.login_form = False
+        self.done = False
+        self._in_select = False
+        self._option_value: str | None = None
+        self._option_text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Handle an opening tag."""
+        if self.done:
+            return
+        if tag == "form":
+            if ECOCITO_LOGIN_URI in (dict(attrs).get("action") or ""):
+                self.login_form = self.done = True
+        elif tag == "select":
+            attributes = dict(attrs)
+            select_id, name = attributes.get("id"), attributes.get("name")
+            self.selects.append((select_id, name))
+            if select_id == _SELECT_ID or name == _SELECT_NAME:
+                self.found = self._in_select = True
+        elif tag == "option" and self._in_select:
+            self._close_option()
+            self._option_value = dict(attrs).get("value") or ""
+
+    def handle_endtag(self, tag: str) -> None:
+        """Handle a closing tag."""
+        if not self._in_select:
+            return
+        if tag == "option":
+            self._close_option()
+        elif tag == "select":
+            self._close_option()
+            self._in_select = False
+            self.done = True
+
+    def handle_data(self, data: str) -> None:
+        """Collect the label of the current option."""
+        if self._option_value is not None:
+            self._option_text.append(data)
+
+    def _close_option(self) -> None:
+        """Record the current option, whose closing tag is optional."""
+        if self._option_value is not None:
+            self.options.append(
+                (self._option_value, "".join(self._option_text).strip())
+            )
+        self._option_value = None
+        self._option_text = []
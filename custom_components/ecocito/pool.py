@@ -0,0 +1,72 @@
+"""Resources shared by every config entry of the same Ecocito domain."""
+
+from __future__ import annotations
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import ssl as ssl_util
+
+from .const import DATA_POOLS, DOMAIN, POOL_MAX_CONNECTIONS, RATE_LIMIT_BURST
+from .resilience import CircuitBreaker, TokenBucket
+
+
+class EcocitoPool:
+    """
+    Connection pool, rate limiter and circuit breaker of one Ecocito domain.
+
+    Every account of a domain sends its requests through the same connector,
+    whose connection limit also caps how many requests run concurrently, so
+    adding accounts queues their polls instead of multiplying the load.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self.connector = aiohttp.TCPConnector(
+            limit=POOL_MAX_CONNECTIONS, ssl=ssl_util.get_default_context()
+        )
+        self.circuit_breaker = CircuitBreaker()
+        self.users = 0
+        self._rate_limiter: TokenBucket | None = None
+
+    def rate_limiter(self, requests_per_minute: int) -> TokenBucket | None:
+        """
+        Return the domain rate limiter, set to the latest configured rate.
+
+        Returns None when rate limiting is disabled (0 requests per minute).
+        """
+        if requests_per_minute <= 0:
+            return None
+        rate = requests_per_minute / 60
+        capacity = float(min(RATE_LIMIT_BURST, requests_per_minute))
+        if self._rate_limiter is None:
+            self._rate_limiter = TokenBucket(rate, capacity)
+        else:
+            self._rate_limiter.configure(rate, capacity)
+        return self._rate_limiter
+
+
+def pool_key(domain: str) -> str:
+    """Return the key of a domain's pool: its Ecocito subdomain."""
+    return domain.split(".", maxsplit=1)[0]
+
+
+@callback
+def async_acquire_pool(hass: HomeAssistant, domain: str) -> EcocitoPool:
+    """Return the pool of an Ecocito domain, creating it for its first user."""
+    pools: dict[str, EcocitoPool] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_POOLS, {}
+    )
+    if (pool := pools.get(pool_key(domain))) is None:
+        pool = pools[pool_key(domain)] = EcocitoPool()
+    pool.users += 1
+    return pool
+
+
+async def async_release_pool(hass: HomeAssistant, domain: str) -> None:
+    """Release a pool, closing its connections once its last user is gone."""
+    pools: dict[str, EcocitoPool] = hass.data[DOMAIN][DATA_POOLS]
+    pool = pools[pool_key(domain)]
+    pool.users -= 1
+    if pool.users <= 0:
+        del pools[pool_key(domain)]
+        await pool.connector.close()
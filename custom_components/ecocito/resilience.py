@@ -0,0 +1,154 @@
+"""Rate limiting and retry policies for the Ecocito client."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from .errors import CircuitOpenError
+
+# HTTP statuses worth retrying after a pause: throttling and transient errors.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens are refilled continuously at ``rate`` per second up to ``capacity``
+    (the allowed burst). Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def configure(self, rate: float, capacity: float) -> None:
+        """Change the rate and burst of a bucket shared by several clients."""
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = min(self._tokens, capacity)
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding the Ecocito servers.
+
+    After ``failure_threshold`` consecutive failures (network errors, timeouts
+    or 5xx responses) the circuit opens and requests fail instantly with
+    CircuitOpenError. Once ``reset_timeout`` seconds have elapsed, a single
+    probe request is let through (half-open): its success closes the circuit,
+    its failure keeps it open for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 300.0
+    ) -> None:
+        """Initialize a closed circuit."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the circuit state: closed, open or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if self._opened_at is None:
+            return
+        now = time.monotonic()
+        remaining = self._opened_at + self.reset_timeout - now
+        if remaining > 0:
+            msg = (
+                f"Ecocito is unreachable, requests are suspended for"
+                f" {remaining:.0f} more seconds"
+            )
+            raise CircuitOpenError(msg)
+        # Half-open: let this probe through and re-arm the timer so that
+        # concurrent requests keep failing fast until the probe completes.
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self.failure_threshold and self._opened_at is None:
+            self._opened_at = time.monotonic()
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class BackoffPolicy:
+    """Exponential backoff with jitter for throttled or failing requests."""
+
+    retries: int = 3
+    base: float = 1.0
+    maximum: float = 60.0
+
+    def delay(self, attempt: int, retry_after: float | None) -> float | None:
+        """
+        Return the delay before retrying, or None to give up.
+
+        A server-provided ``Retry-After`` is honored as is, unless it exceeds
+        ``maximum``: the request is then abandoned until the next poll rather
+        than keeping a coordinator busy. Otherwise the delay doubles with each
+        attempt, half of it being randomized to spread concurrent retries.
+        """
+        if attempt >= self.retries:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.maximum else None
+        ceiling = min(self.maximum, self.base * 2**attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)  # noqa: S311
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
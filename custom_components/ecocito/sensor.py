@@ -5,50 +5,58 @@ from __future__ import annotations
 import contextlib
 import dataclasses
 import functools
-import json
-import pathlib
-import re
-from collections.abc import Callable
-from datetime import datetime
+from abc import abstractmethod
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfMass
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfMass, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util
 
 from . import EcocitoConfigEntry
+from ._english_names import ENGLISH_SENSOR_NAMES
+from .aggregation import EventKey, RunningStats, SlidingWindow, event_key
 from .client import CollectionEvent, CollectionType, EcocitoEvent
 from .const import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_Z_THRESHOLD,
     COLLECTION_TYPE_DEFAULT_HINT,
     COLLECTION_TYPE_HINTS,
     DEVICE_ATTRIBUTION,
+    EVENT_COLLECTION_ANOMALY,
+    LOGGER,
+    ROLLING_WINDOW_EVICT_INTERVAL,
+    ROLLING_WINDOWS,
+    SIGNAL_COLLECTION_TYPES_REMOVED,
+    SIGNAL_COORDINATORS_ADDED,
     CollectionTypeHint,
 )
+from .coordinator import (
+    CollectionEventsDataUpdateCoordinator,
+    EcocitoDataUpdateCoordinator,
+    WasteDepotVisitsDataUpdateCoordinator,
+)
 from .entity import EcocitoEntity
-
-
-@functools.lru_cache(maxsize=1)
-def _get_english_sensor_names() -> dict[str, str]:
-    """Lazily load and cache English sensor names from strings.json."""
-    try:
-        data = json.loads((pathlib.Path(__file__).parent / "strings.json").read_text())
-        return {
-            k: v.get("name", k)
-            for k, v in data.get("entity", {}).get("sensor", {}).items()
-        }
-    except (OSError, ValueError):
-        return {}
+from .metrics import EcocitoMetrics
 
 
 def _english_name(translation_key: str, placeholders: dict | None) -> str:
     """Return the English name for a translation key with placeholders resolved."""
-    name = _get_english_sensor_names().get(translation_key, translation_key)
+    name = ENGLISH_SENSOR_NAMES.get(translation_key, translation_key)
     if placeholders:
         with contextlib.suppress(KeyError, ValueError):
             name = name.format(**placeholders)
@@ -63,7 +71,7 @@ def _resolve_collection_type_hint(name: str) -> CollectionTypeHint:
     Falls back to COLLECTION_TYPE_DEFAULT_HINT for unknown types.
     """
     for pattern, hint in COLLECTION_TYPE_HINTS:
-        if re.search(pattern, name, re.IGNORECASE):
+        if pattern.search(name):
             return hint
     return COLLECTION_TYPE_DEFAULT_HINT
 
@@ -111,20 +119,104 @@ class EcocitoSensorEntityDescription[T](SensorEntityDescription):
     english_name: str = dataclasses.field(default="")
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class EcocitoMetricSensorEntityDescription(SensorEntityDescription):
+    """Class to describe an Ecocito diagnostic sensor fed by the client metrics."""
+
+    value_fn: Callable[[EcocitoMetrics], StateType] = dataclasses.field(default=None)  # type: ignore[assignment]
+    english_name: str = dataclasses.field(default="")
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class EcocitoRollingSensorEntityDescription(SensorEntityDescription):
+    """Class to describe an Ecocito sensor over a sliding time window."""
+
+    period: timedelta
+    value_fn: Callable[[SlidingWindow], StateType] = dataclasses.field(default=None)  # type: ignore[assignment]
+    english_name: str = dataclasses.field(default="")
+
+
+def _seconds_to_ms(value: float | None) -> float | None:
+    """Convert a duration in seconds to milliseconds."""
+    return None if value is None else round(value * 1000, 1)
+
+
+def _build_metric_sensor_descriptions() -> list[EcocitoMetricSensorEntityDescription]:
+    """Build the diagnostic sensor descriptions for the client metrics."""
+    return [
+        EcocitoMetricSensorEntityDescription(
+            key="last_poll_duration",
+            translation_key="last_poll_duration",
+            english_name=_english_name("last_poll_duration", None),
+            value_fn=lambda metrics: _seconds_to_ms(metrics.last_poll_duration),
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        EcocitoMetricSensorEntityDescription(
+            key="requests_last_hour",
+            translation_key="requests_last_hour",
+            english_name=_english_name("requests_last_hour", None),
+            value_fn=lambda metrics: metrics.requests_last_hour,
+            icon="mdi:web",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        EcocitoMetricSensorEntityDescription(
+            key="average_response_time",
+            translation_key="average_response_time",
+            english_name=_english_name("average_response_time", None),
+            value_fn=lambda metrics: _seconds_to_ms(metrics.average_response_time),
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        EcocitoMetricSensorEntityDescription(
+            key="consecutive_failures",
+            translation_key="consecutive_failures",
+            english_name=_english_name("consecutive_failures", None),
+            value_fn=lambda metrics: metrics.consecutive_failures,
+            icon="mdi:alert-circle-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+    ]
+
+
 def _build_collection_type_sensor_descriptions(
     collection_type: CollectionType,
     year_offset: int,
-) -> list[EcocitoSensorEntityDescription]:
+) -> tuple[EcocitoSensorEntityDescription, ...]:
+    """
+    Return the sensor entity descriptions for a collection type and year offset.
+
+    Descriptions are frozen and identical for every address, so they are
+    memoized and shared instead of being rebuilt for each coordinator.
+    """
+    return _collection_type_sensor_descriptions(
+        collection_type.id, collection_type.name, year_offset
+    )
+
+
+@functools.cache
+def _collection_type_sensor_descriptions(
+    type_id: str, type_name: str, year_offset: int
+) -> tuple[EcocitoSensorEntityDescription, ...]:
     """Build sensor entity descriptions for a given collection type and year offset."""
-    type_id = collection_type.id
-    hint = _resolve_collection_type_hint(collection_type.name)
+    hint = _resolve_collection_type_hint(type_name)
     type_key = hint.translation_key
     icon = hint.icon
 
     # For known types (specific translation key), no {type} placeholder needed.
     # For unknown types (generic "collection" key), inject the raw name.
     is_generic = type_key == COLLECTION_TYPE_DEFAULT_HINT.translation_key
-    type_placeholders = {"type": collection_type.name} if is_generic else None
+    type_placeholders = {"type": type_name} if is_generic else None
 
     if year_offset == 0:
         count_key = f"{type_key}_count"
@@ -132,7 +224,7 @@ def _build_collection_type_sensor_descriptions(
         latest_key = (
             "latest_collection" if is_generic else f"latest_{type_key}_collection"
         )
-        return [
+        return (
             EcocitoSensorEntityDescription(
                 key=f"collection_count_{type_id}",
                 translation_key=count_key,
@@ -167,14 +259,14 @@ def _build_collection_type_sensor_descriptions(
                 state_class=SensorStateClass.MEASUREMENT,
                 suggested_display_precision=0,
             ),
-        ]
+        )
     n = abs(year_offset)
     n_placeholders = (
-        {"n": str(n)} if not is_generic else {"type": collection_type.name, "n": str(n)}
+        {"n": str(n)} if not is_generic else {"type": type_name, "n": str(n)}
     )
     count_n_key = f"{type_key}_count_n"
     total_n_key = f"{type_key}_total_n"
-    return [
+    return (
         EcocitoSensorEntityDescription(
             key=f"collection_count_{type_id}_n{n}",
             translation_key=count_n_key,
@@ -197,15 +289,77 @@ def _build_collection_type_sensor_descriptions(
             state_class=SensorStateClass.TOTAL,
             suggested_display_precision=0,
         ),
-    ]
+    )
 
 
+@functools.cache
+def _build_rolling_sensor_descriptions(
+    type_id: str, type_name: str
+) -> tuple[EcocitoRollingSensorEntityDescription, ...]:
+    """Build the sliding window sensor descriptions of a collection type."""
+    hint = _resolve_collection_type_hint(type_name)
+    is_generic = hint.translation_key == COLLECTION_TYPE_DEFAULT_HINT.translation_key
+    placeholders = {"type": type_name} if is_generic else None
+    descriptions: list[EcocitoRollingSensorEntityDescription] = []
+    for window, period in ROLLING_WINDOWS.items():
+        count_key = f"{hint.translation_key}_count_{window}"
+        total_key = f"{hint.translation_key}_total_{window}"
+        descriptions.extend(
+            (
+                EcocitoRollingSensorEntityDescription(
+                    key=f"rolling_count_{type_id}_{window}",
+                    translation_key=count_key,
+                    translation_placeholders=placeholders,
+                    english_name=_english_name(count_key, placeholders),
+                    period=period,
+                    value_fn=lambda window: window.count,
+                    icon=hint.icon,
+                    state_class=SensorStateClass.MEASUREMENT,
+                ),
+                EcocitoRollingSensorEntityDescription(
+                    key=f"rolling_total_{type_id}_{window}",
+                    translation_key=total_key,
+                    translation_placeholders=placeholders,
+                    english_name=_english_name(total_key, placeholders),
+                    period=period,
+                    value_fn=lambda window: window.total,
+                    icon=hint.icon,
+                    native_unit_of_measurement=UnitOfMass.KILOGRAMS,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    suggested_display_precision=0,
+                ),
+            )
+        )
+    return tuple(descriptions)
+
+
+@functools.cache
+def _build_anomaly_sensor_description(
+    type_id: str, type_name: str
+) -> SensorEntityDescription:
+    """Build the anomaly sensor description of a collection type."""
+    hint = _resolve_collection_type_hint(type_name)
+    is_generic = hint.translation_key == COLLECTION_TYPE_DEFAULT_HINT.translation_key
+    placeholders = {"type": type_name} if is_generic else None
+    translation_key = f"{hint.translation_key}_anomaly"
+    return EcocitoSensorEntityDescription(
+        key=f"collection_anomaly_{type_id}",
+        translation_key=translation_key,
+        translation_placeholders=placeholders,
+        english_name=_english_name(translation_key, placeholders),
+        icon="mdi:scale-unbalanced",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    )
+
+
+@functools.cache
 def _build_waste_depot_sensor_descriptions(
     year_offset: int,
-) -> list[EcocitoSensorEntityDescription]:
+) -> tuple[EcocitoSensorEntityDescription, ...]:
     """Build waste depot sensor entity descriptions for a given year offset."""
     if year_offset == 0:
-        return [
+        return (
             EcocitoSensorEntityDescription(
                 key="waste_deposit_visit",
                 translation_key="waste_deposit_visit",
@@ -215,8 +369,8 @@ def _build_waste_depot_sensor_descriptions(
                 last_updated_fn=get_latest_date,
                 state_class=SensorStateClass.TOTAL,
             ),
-        ]
-    return [
+        )
+    return (
         EcocitoSensorEntityDescription(
             key=f"waste_deposit_visit_n{abs(year_offset)}",
             translation_key="waste_deposit_visit_n",
@@ -229,7 +383,7 @@ def _build_waste_depot_sensor_descriptions(
             last_updated_fn=get_latest_date,
             state_class=SensorStateClass.TOTAL,
         ),
-    ]
+    )
 
 
 class EcocitoSensor[T](EcocitoEntity[T], SensorEntity):
@@ -243,14 +397,282 @@ class EcocitoSensor[T](EcocitoEntity[T], SensorEntity):
         return self.entity_description.value_fn(self.coordinator.data)
 
     @property
-    def extra_state_attributes(self) -> dict[str, datetime | None] | None:
+    def extra_state_attributes(self) -> dict[str, datetime | bool | None] | None:
         """Return the state attributes of the sensor."""
-        return {
+        attributes: dict[str, datetime | bool | None] = {
             "last_collection_date": self.entity_description.last_updated_fn(
                 self.coordinator.data
             ),
+            "stale": self.coordinator.stale,
+        }
+        # Only exposed while stale so that it doesn't change on every poll.
+        if self.coordinator.stale:
+            attributes["last_successful_update"] = self.coordinator.last_success
+        return attributes
+
+
+class EcocitoEventStreamSensor(EcocitoEntity[list[CollectionEvent]], SensorEntity):
+    """
+    Sensor maintained incrementally from the events of a collection type.
+
+    Fed by the coordinators of the current and previous years: the events
+    already fetched are loaded once, then only the changes of each refresh
+    are applied.
+    """
+
+    _attr_attribution = DEVICE_ATTRIBUTION
+
+    def __init__(
+        self,
+        coordinators: list[CollectionEventsDataUpdateCoordinator],
+        description: SensorEntityDescription,
+        location: str | None = None,
+    ) -> None:
+        """Initialize the sensor, bound to the first (current year) coordinator."""
+        super().__init__(coordinators[0], description, location)
+        self._coordinators = coordinators
+
+    async def async_added_to_hass(self) -> None:
+        """Load the events already fetched and follow their changes."""
+        await super().async_added_to_hass()
+        self._load(
+            [
+                event
+                for coordinator in self._coordinators
+                for event in coordinator.data or []
+            ]
+        )
+        for coordinator in self._coordinators[1:]:
+            self.async_on_remove(
+                coordinator.async_add_listener(
+                    functools.partial(self._async_apply_update, coordinator)
+                )
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Apply the changes of the current year."""
+        self._apply(self.coordinator)
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_apply_update(
+        self, coordinator: CollectionEventsDataUpdateCoordinator
+    ) -> None:
+        """Apply the changes of a previous year."""
+        if coordinator.new_events or coordinator.removed_events:
+            self._apply(coordinator)
+            self.async_write_ha_state()
+
+    @abstractmethod
+    def _load(self, events: list[CollectionEvent]) -> None:
+        """Load the events fetched before the sensor was added."""
+
+    @abstractmethod
+    def _apply(self, coordinator: CollectionEventsDataUpdateCoordinator) -> None:
+        """Apply the changes of a coordinator's last refresh."""
+
+
+class EcocitoRollingSensor(EcocitoEventStreamSensor):
+    """
+    Sensor over the last days or months of a collection type.
+
+    Events are kept in a sliding window; those that fall out of it are evicted
+    on a timer.
+    """
+
+    entity_description: EcocitoRollingSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinators: list[CollectionEventsDataUpdateCoordinator],
+        description: EcocitoRollingSensorEntityDescription,
+        location: str | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinators, description, location)
+        self._window = SlidingWindow(description.period)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._window)
+
+    async def async_added_to_hass(self) -> None:
+        """Start evicting expired events."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_evict, ROLLING_WINDOW_EVICT_INTERVAL
+            )
+        )
+
+    def _load(self, events: list[CollectionEvent]) -> None:
+        for event in events:
+            self._add(event)
+        self._window.evict(dt_util.utcnow())
+
+    def _apply(self, coordinator: CollectionEventsDataUpdateCoordinator) -> None:
+        for key in coordinator.removed_events:
+            self._window.remove(key)
+        for event in coordinator.new_events:
+            self._add(event)
+
+    def _add(self, event: CollectionEvent) -> None:
+        # Ecocito dates are naive local times, the window compares them to UTC.
+        self._window.add(event_key(event), dt_util.as_utc(event.date), event.quantity)
+
+    @callback
+    def _async_evict(self, now: datetime) -> None:
+        """Evict the events that fell out of the window."""
+        if self._window.evict(now):
+            self.async_write_ha_state()
+
+
+class EcocitoAnomalySensor(EcocitoEventStreamSensor):
+    """
+    Anomaly score of the latest collection weight of a type.
+
+    The score is the number of standard deviations between the weight and the
+    mean of the previous ones, from running statistics kept in constant memory.
+    A new collection scoring above ANOMALY_Z_THRESHOLD fires
+    EVENT_COLLECTION_ANOMALY.
+
+    Only events newer than (or, for history loaded later, older than) those
+    already counted are added, so a year moving from one coordinator to the
+    next at New Year is not counted twice. The keys of the events at both ends
+    of that range are kept too, so that a new event sharing the date of one
+    already counted is still added.
+    """
+
+    def __init__(
+        self,
+        coordinators: list[CollectionEventsDataUpdateCoordinator],
+        description: SensorEntityDescription,
+        location: str | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinators, description, location)
+        self._stats = RunningStats(ANOMALY_EWMA_ALPHA)
+        self._first: datetime | None = None
+        self._last: datetime | None = None
+        # Keys of the events counted at the first and last dates.
+        self._bound_keys: dict[datetime, Counter[EventKey]] = {}
+        self._latest: CollectionEvent | None = None
+        self._z_score: float | None = None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return None if self._z_score is None else round(self._z_score, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the statistics of the series."""
+        return {
+            "latest_weight": None if self._latest is None else self._latest.quantity,
+            "mean": round(self._stats.mean, 1) if self._stats.count else None,
+            "standard_deviation": round(self._stats.stddev, 1),
+            "ewma": None if self._stats.ewma is None else round(self._stats.ewma, 1),
+            "samples": self._stats.count,
+            "anomaly": self._is_anomaly(self._z_score),
         }
 
+    def _is_anomaly(self, z_score: float | None) -> bool:
+        return (
+            z_score is not None
+            and self._stats.count > ANOMALY_MIN_SAMPLES
+            and abs(z_score) >= ANOMALY_Z_THRESHOLD
+        )
+
+    def _load(self, events: list[CollectionEvent]) -> None:
+        self._add(events, notify=False)
+
+    def _apply(self, coordinator: CollectionEventsDataUpdateCoordinator) -> None:
+        # Only collections of the current year are news.
+        self._add(coordinator.new_events, notify=coordinator is self.coordinator)
+
+    def _add(self, events: list[CollectionEvent], *, notify: bool) -> None:
+        """Add the events outside the range already counted."""
+        first, last = self._first, self._last
+        seen: Counter[EventKey] = Counter()
+        for event in sorted(events, key=lambda event: event.date):
+            if first is not None and first < event.date < last:
+                continue
+            key = event_key(event)
+            seen[key] += 1
+            bound_keys = self._bound_keys.setdefault(event.date, Counter())
+            if seen[key] <= bound_keys[key]:
+                continue
+            bound_keys[key] += 1
+            if self._last is not None and event.date < self._last:
+                # History loaded after more recent events.
+                self._stats.add(event.quantity, chronological=False)
+                self._first = min(self._first, event.date)
+            else:
+                z_score = self._stats.z_score(event.quantity)
+                self._stats.add(event.quantity)
+                self._latest, self._z_score = event, z_score
+                self._first = self._first or event.date
+                self._last = event.date
+                if notify and self._is_anomaly(z_score):
+                    self._fire_anomaly(event, z_score)
+        for when in [
+            when for when in self._bound_keys if when not in (self._first, self._last)
+        ]:
+            del self._bound_keys[when]
+
+    def _fire_anomaly(self, event: CollectionEvent, z_score: float) -> None:
+        LOGGER.info(
+            "Unusual %s collection of %s kg on %s (z-score %.1f)",
+            self.coordinator.collection_type.name,
+            event.quantity,
+            event.date,
+            z_score,
+        )
+        self.hass.bus.async_fire(
+            EVENT_COLLECTION_ANOMALY,
+            {
+                "entity_id": self.entity_id,
+                "collection_type": self.coordinator.collection_type.name,
+                "location": event.location,
+                "date": event.date.isoformat(),
+                "weight": event.quantity,
+                "mean": round(self._stats.mean, 1),
+                "z_score": round(z_score, 2),
+            },
+        )
+
+
+class EcocitoMetricSensor(EcocitoEntity[list[CollectionType]], SensorEntity):
+    """
+    Diagnostic sensor exposing the Ecocito client metrics.
+
+    Bound to the collection types coordinator for its device and unique ID,
+    but refreshed whenever any coordinator records a poll.
+    """
+
+    entity_description: EcocitoMetricSensorEntityDescription
+
+    @property
+    def available(self) -> bool:
+        """Return True: the metrics stay meaningful while Ecocito is down."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.client.metrics)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to metric updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.client.metrics.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -258,34 +680,125 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Ecocito sensors based on a config entry."""
-    # Warm the strings.json cache off the event loop so the synchronous
-    # _english_name() lookups below (via _build_*_sensor_descriptions) don't
-    # perform blocking file I/O inside the event loop.
-    await hass.async_add_executor_job(_get_english_sensor_names)
-
-    entities: list[EcocitoSensor[Any]] = []
-    # Track waste-depot coordinators that have already been added as sensors.
-    # Waste-depot visits are account-wide (not per address), so the coordinator
-    # is shared across all addresses for a given year; only add its sensors once.
-    registered_waste_depot: set[int] = set()
-    for address_data in entry.runtime_data.addresses:
-        location = address_data.location if not address_data.single_address else None
-        for year_coords in address_data.coordinators:
-            for coordinator in year_coords.collection_types.values():
-                entities.extend(
-                    EcocitoSensor(coordinator, description, location=location)
-                    for description in _build_collection_type_sensor_descriptions(
-                        coordinator.collection_type, year_coords.year_offset
+    data = entry.runtime_data
+    entities: list[SensorEntity] = [
+        EcocitoMetricSensor(data.collection_types_coordinator, description)
+        for description in _build_metric_sensor_descriptions()
+    ]
+    # Collection sensors per type, so that a vanished type's can be removed.
+    sensors_by_type: defaultdict[str, list[SensorEntity]] = defaultdict(list)
+
+    def _sensors(
+        coordinators: Iterable[EcocitoDataUpdateCoordinator],
+    ) -> list[SensorEntity]:
+        # A single address is not part of the device (see EcocitoAddressData).
+        single_address = any(a.single_address for a in data.addresses)
+        sensors: list[SensorEntity] = []
+        for coordinator in coordinators:
+            if isinstance(coordinator, WasteDepotVisitsDataUpdateCoordinator):
+                # Waste-depot visits are account-wide (not per address).
+                sensors.extend(
+                    EcocitoSensor(coordinator, description, location=None)
+                    for description in _build_waste_depot_sensor_descriptions(
+                        coordinator.year_offset
                     )
                 )
-            waste_depot = year_coords.waste_depot
-            coord_id = id(waste_depot)
-            if coord_id not in registered_waste_depot:
-                registered_waste_depot.add(coord_id)
-                entities.extend(
-                    EcocitoSensor(waste_depot, description, location=None)
-                    for description in _build_waste_depot_sensor_descriptions(
-                        year_coords.year_offset
+            elif isinstance(coordinator, CollectionEventsDataUpdateCoordinator):
+                sensors.extend(
+                    _collection_sensors(
+                        coordinator, None if single_address else coordinator.location
                     )
                 )
+        return sensors
+
+    def _collection_sensors(
+        coordinator: CollectionEventsDataUpdateCoordinator, location: str | None
+    ) -> list[SensorEntity]:
+        ctype = coordinator.collection_type
+        type_sensors: list[SensorEntity] = [
+            EcocitoSensor(coordinator, description, location=location)
+            for description in _build_collection_type_sensor_descriptions(
+                ctype, coordinator.year_offset
+            )
+        ]
+        if coordinator.year_offset == 0:
+            coordinators = _stream_coordinators(coordinator)
+            type_sensors.extend(
+                EcocitoRollingSensor(coordinators, description, location=location)
+                for description in _build_rolling_sensor_descriptions(
+                    ctype.id, ctype.name
+                )
+            )
+            type_sensors.append(
+                EcocitoAnomalySensor(
+                    coordinators,
+                    _build_anomaly_sensor_description(ctype.id, ctype.name),
+                    location=location,
+                )
+            )
+        sensors_by_type[ctype.id].extend(type_sensors)
+        return type_sensors
+
+    def _stream_coordinators(
+        coordinator: CollectionEventsDataUpdateCoordinator,
+    ) -> list[CollectionEventsDataUpdateCoordinator]:
+        # Rolling windows and statistics reach into the previous year, when it
+        # is tracked.
+        type_id = coordinator.collection_type.id
+        for address_data in data.addresses:
+            years = address_data.coordinators
+            if years[0].collection_types.get(type_id) is coordinator:
+                return [
+                    coordinator,
+                    *(
+                        year_coords.collection_types[type_id]
+                        for year_coords in years[1:2]
+                        if type_id in year_coords.collection_types
+                    ),
+                ]
+        return [coordinator]
+
+    # Sensors of previous years are added once loaded (_async_load_history).
+    current_year = [address_data.coordinators[0] for address_data in data.addresses]
+    entities.extend(
+        _sensors(
+            [
+                data.waste_depot[0],
+                *(
+                    coordinator
+                    for year_coords in current_year
+                    for coordinator in year_coords.collection_types.values()
+                ),
+            ]
+        )
+    )
     async_add_entities(entities)
+
+    @callback
+    def _async_add_coordinators(
+        coordinators: list[EcocitoDataUpdateCoordinator],
+    ) -> None:
+        async_add_entities(_sensors(coordinators))
+
+    @callback
+    def _async_remove_collection_types(type_ids: list[str]) -> None:
+        registry = er.async_get(hass)
+        for type_id in type_ids:
+            for sensor in sensors_by_type.pop(type_id, []):
+                if sensor.registry_entry is not None:
+                    registry.async_remove(sensor.entity_id)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_COORDINATORS_ADDED.format(entry.entry_id),
+            _async_add_coordinators,
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_COLLECTION_TYPES_REMOVED.format(entry.entry_id),
+            _async_remove_collection_types,
+        )
+    )
@@ -0,0 +1,473 @@
+"""Services for the Ecocito integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import csv
+import json
+import pathlib
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import date
+from typing import TYPE_CHECKING, Any, TextIO
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .client import CollectionEvent, CollectionType, WasteDepotVisit
+from .const import DOMAIN, LOGGER
+from .coordinator import WASTE_DEPOT_STORE_KEY, collection_store_key
+
+if TYPE_CHECKING:
+    from . import EcocitoConfigEntry, EcocitoData
+
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_GET_EVENTS = "get_events"
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_ADDRESSES = "addresses"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+ATTR_TYPE = "type"
+ATTR_ADDRESS = "address"
+ATTR_MEMORY = "memory"
+ATTR_TOP = "top"
+
+EXPORT_DIRECTORY = "ecocito"
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_FIELDS = ("date", "kind", "type_id", "type_name", "location", "quantity")
+DEFAULT_PROFILE_TOP = 25
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_ADDRESSES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+GET_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_TYPE): cv.string,
+        vol.Optional(ATTR_ADDRESS): cv.string,
+    }
+)
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_MEMORY, default=False): cv.boolean,
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Ecocito services."""
+
+    async def _async_export_history(call: ServiceCall) -> ServiceResponse:
+        return await async_export_history(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_get_events(call: ServiceCall) -> ServiceResponse:
+        return await async_get_events(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_EVENTS,
+        _async_get_events,
+        schema=GET_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        return await async_profile_refresh(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _get_entry(hass: HomeAssistant, entry_id: str) -> EcocitoConfigEntry:
+    """Return a loaded Ecocito config entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        msg = f"Unknown Ecocito config entry: {entry_id}"
+        raise ServiceValidationError(msg)
+    if entry.state is not ConfigEntryState.LOADED:
+        msg = f"The Ecocito config entry {entry.title} is not loaded"
+        raise ServiceValidationError(msg)
+    return entry
+
+
+async def async_export_history(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """
+    Export the collection events and waste depot visits of a date range.
+
+    Rows are streamed to the file one page at a time, so memory use does not
+    depend on the range. Years already held by the coordinators are not
+    downloaded again.
+    """
+    entry = _get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    start, end = _get_range(call)
+    export_format: str = call.data[ATTR_FORMAT]
+    filename = pathlib.Path(
+        call.data.get(ATTR_FILENAME)
+        or f"ecocito_{slugify(entry.title)}_{start}_{end}.{export_format}"
+    ).name
+    path = pathlib.Path(hass.config.path(EXPORT_DIRECTORY, filename))
+
+    addresses = _wanted_addresses(entry.runtime_data, call.data.get(ATTR_ADDRESSES))
+    writer = await hass.async_add_executor_job(_ExportWriter, path, export_format)
+    count = 0
+    try:
+        async for rows in _async_export_rows(entry.runtime_data, start, end, addresses):
+            await hass.async_add_executor_job(writer.write, rows)
+            count += len(rows)
+    finally:
+        await hass.async_add_executor_job(writer.close)
+    LOGGER.info("Exported %d rows to %s", count, path)
+
+    if call.return_response:
+        return {"path": str(path), "rows": count}
+    return None
+
+
+async def async_get_events(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Return the collection events and waste depot visits of a date range.
+
+    The range is split into years: those held by the coordinators are answered
+    from them, the others are fetched concurrently, without creating
+    coordinators or entities. Waste depot visits are only returned when no
+    collection type is requested.
+    """
+    entry = _get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    start, end = _get_range(call)
+    data = entry.runtime_data
+    if (type_id := call.data.get(ATTR_TYPE)) is None:
+        ctypes = list(data.collection_types.values())
+    elif (ctype := data.collection_types.get(type_id)) is not None:
+        ctypes = [ctype]
+    else:
+        msg = f"Unknown collection type: {type_id}"
+        raise ServiceValidationError(msg)
+    address = call.data.get(ATTR_ADDRESS)
+    addresses = (
+        frozenset((address,)) if address is not None else _wanted_addresses(data, None)
+    )
+
+    async def _collection_rows(
+        ctype: CollectionType, year: int, first: date, last: date
+    ) -> list[dict[str, Any]]:
+        events = data.year_store.get(collection_store_key(ctype.id), year)
+        if events is None:
+            events = await _flatten(
+                data.client.iter_collection_events(ctype.id, first, last)
+            )
+        return [
+            _collection_row(ctype, event)
+            for event in events
+            if first <= event.date.date() <= last
+            and (addresses is None or event.location in addresses)
+        ]
+
+    async def _waste_depot_rows(
+        year: int, first: date, last: date
+    ) -> list[dict[str, Any]]:
+        visits = data.year_store.get(WASTE_DEPOT_STORE_KEY, year)
+        if visits is None:
+            visits = await _flatten(data.client.iter_waste_depot_visits(first, last))
+        return [
+            _waste_depot_row(visit)
+            for visit in visits
+            if first <= visit.date.date() <= last
+        ]
+
+    fetches = []
+    for year, first, last in _years(start, end):
+        fetches.extend(_collection_rows(ctype, year, first, last) for ctype in ctypes)
+        if type_id is None:
+            fetches.append(_waste_depot_rows(year, first, last))
+    results = await asyncio.gather(*fetches)
+
+    rows = [row for result in results for row in result]
+    rows.sort(key=lambda row: row["date"])
+    return {"events": rows}
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """
+    Refresh the data coordinators of an entry under cProfile.
+
+    The collection types coordinator is left out: its discovery may change the
+    entry, or reload it, while the others are being profiled.
+
+    The profile is written as a pstats file to the ecocito folder of the
+    configuration directory. With ``memory``, allocations are traced as well
+    and the lines holding the most memory afterwards are written to a report
+    next to it. Other tasks running on the event loop meanwhile are profiled
+    too.
+    """
+    entry = _get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    data = entry.runtime_data
+    coordinators = [
+        *data.waste_depot.values(),
+        *(
+            coordinator
+            for address_data in data.addresses
+            for year_coords in address_data.coordinators
+            for coordinator in year_coords.collection_types.values()
+        ),
+    ]
+    # Leave tracemalloc running if something else started it.
+    trace_memory = call.data[ATTR_MEMORY] and not tracemalloc.is_tracing()
+    base = pathlib.Path(
+        hass.config.path(
+            EXPORT_DIRECTORY,
+            f"profile_{slugify(entry.title)}_{dt_util.utcnow():%Y%m%d%H%M%S}",
+        )
+    )
+    pstats_path = base.with_suffix(".pstats")
+    allocations_path = base.with_suffix(".allocations.txt")
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        msg = f"Cannot start the profiler: {err}"
+        raise HomeAssistantError(msg) from err
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+    finally:
+        duration = time.perf_counter() - started
+        profiler.disable()
+        snapshot = None
+        if call.data[ATTR_MEMORY]:
+            snapshot = tracemalloc.take_snapshot()
+            if trace_memory:
+                tracemalloc.stop()
+
+    await hass.async_add_executor_job(
+        _write_profile,
+        profiler,
+        pstats_path,
+        snapshot,
+        allocations_path,
+        call.data[ATTR_TOP],
+    )
+    LOGGER.info(
+        "Profiled the refresh of %d coordinators in %.2f s, written to %s",
+        len(coordinators),
+        duration,
+        pstats_path,
+    )
+
+    if call.return_response:
+        return {
+            "duration": round(duration, 3),
+            "coordinators": len(coordinators),
+            "pstats": str(pstats_path),
+            "allocations": str(allocations_path) if snapshot is not None else None,
+        }
+    return None
+
+
+def _get_range(call: ServiceCall) -> tuple[date, date]:
+    """Return the validated date range of a service call."""
+    start: date = call.data[ATTR_START]
+    end: date = call.data[ATTR_END]
+    if start > end:
+        msg = "The start date must not be after the end date"
+        raise ServiceValidationError(msg)
+    return start, end
+
+
+def _years(start: date, end: date) -> Iterator[tuple[int, date, date]]:
+    """Split a date range into years and the part of the range in each."""
+    for year in range(start.year, end.year + 1):
+        yield year, max(start, date(year, 1, 1)), min(end, date(year, 12, 31))
+
+
+def _wanted_addresses(
+    data: EcocitoData, addresses: list[str] | None
+) -> frozenset[str] | None:
+    """
+    Return the addresses to export, None for all.
+
+    Defaults to the addresses tracked by the integration, unless it found none.
+    """
+    if addresses:
+        return frozenset(addresses)
+    locations = {address_data.location for address_data in data.addresses}
+    if None in locations:
+        return None
+    return frozenset(location for location in locations if location is not None)
+
+
+async def _async_export_rows(
+    data: EcocitoData,
+    start: date,
+    end: date,
+    addresses: frozenset[str] | None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield the export rows of a date range, one page at a time."""
+    for year, first, last in _years(start, end):
+        for ctype in list(data.collection_types.values()):
+            cached = data.year_store.get(collection_store_key(ctype.id), year)
+            pages = (
+                _as_pages(cached)
+                if cached is not None
+                else data.client.iter_collection_events(ctype.id, first, last)
+            )
+            async for events in pages:
+                if rows := [
+                    _collection_row(ctype, event)
+                    for event in events
+                    if first <= event.date.date() <= last
+                    and (addresses is None or event.location in addresses)
+                ]:
+                    yield rows
+
+        visits = data.year_store.get(WASTE_DEPOT_STORE_KEY, year)
+        pages = (
+            _as_pages(visits)
+            if visits is not None
+            else data.client.iter_waste_depot_visits(first, last)
+        )
+        async for visits in pages:
+            if rows := [
+                _waste_depot_row(visit)
+                for visit in visits
+                if first <= visit.date.date() <= last
+            ]:
+                yield rows
+
+
+async def _flatten[T](pages: AsyncIterator[list[T]]) -> list[T]:
+    """Collect the items of every page."""
+    return [item async for page in pages for item in page]
+
+
+async def _as_pages[T](items: list[T]) -> AsyncIterator[list[T]]:
+    """Yield cached items as a single page."""
+    yield items
+
+
+def _collection_row(ctype: CollectionType, event: CollectionEvent) -> dict[str, Any]:
+    return {
+        "date": event.date.isoformat(),
+        "kind": "collection",
+        "type_id": ctype.id,
+        "type_name": ctype.name,
+        "location": event.location,
+        "quantity": event.quantity,
+    }
+
+
+def _waste_depot_row(visit: WasteDepotVisit) -> dict[str, Any]:
+    return {
+        "date": visit.date.isoformat(),
+        "kind": "waste_depot",
+        "type_id": None,
+        "type_name": None,
+        "location": None,
+        "quantity": None,
+    }
+
+
+class _ExportWriter:
+    """Write export rows to a CSV or JSON Lines file (in the executor)."""
+
+    def __init__(self, path: pathlib.Path, export_format: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: TextIO = path.open("w", encoding="utf-8", newline="")
+        self._csv: csv.DictWriter | None = None
+        if export_format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, rows: Iterable[dict[str, Any]]) -> None:
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self._file.writelines(
+                json.dumps(row, ensure_ascii=False) + "\n" for row in rows
+            )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _write_profile(
+    profiler: cProfile.Profile,
+    pstats_path: pathlib.Path,
+    snapshot: tracemalloc.Snapshot | None,
+    allocations_path: pathlib.Path,
+    top: int,
+) -> None:
+    """Write a profile and the top allocations of a snapshot (in the executor)."""
+    pstats_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(pstats_path)
+    if snapshot is None:
+        return
+    statistics = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(
+                inclusive=False, filename_pattern="<frozen importlib._bootstrap*>"
+            ),
+        )
+    ).statistics("lineno")
+    total = sum(stat.size for stat in statistics)
+    with allocations_path.open("w", encoding="utf-8") as file:
+        file.write(
+            f"Top {top} of {len(statistics)} lines, "
+            f"{total / 1024:.1f} KiB allocated in total\n\n"
+        )
+        file.writelines(f"{stat}\n" for stat in statistics[:top])
@@ -0,0 +1,67 @@
+"""Persistence of the Ecocito session cookies."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_SESSIONS, DOMAIN, SESSION_SAVE_DELAY
+
+STORAGE_VERSION = 1
+
+type SessionCookies = list[dict[str, str]]
+
+
+class EcocitoSessionStore:
+    """
+    Session cookies of a config entry, kept across restarts.
+
+    They are stored in a private file (readable by its owner only), so that
+    setting up the entry again reuses the session instead of logging in.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[SessionCookies] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session", private=True
+        )
+        self._pending: SessionCookies | None = None
+
+    async def async_load(self) -> SessionCookies | None:
+        """Return the saved cookies, if any."""
+        return await self._store.async_load()
+
+    @callback
+    def async_save(self, cookies: SessionCookies) -> None:
+        """Save the cookies shortly, coalescing successive logins."""
+        self._pending = cookies
+        self._store.async_delay_save(self._take_pending, SESSION_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Save the cookies now if a save is pending, e.g. before a reload."""
+        if self._pending is not None:
+            await self._store.async_save(self._take_pending())
+
+    def _take_pending(self) -> SessionCookies:
+        cookies, self._pending = self._pending or [], None
+        return cookies
+
+    async def async_remove(self) -> None:
+        """Delete the saved cookies."""
+        await self._store.async_remove()
+
+
+@callback
+def async_stash_flow_session(
+    hass: HomeAssistant, unique_id: str, cookies: SessionCookies
+) -> None:
+    """Keep the session a config flow logged in with, for the entry setup."""
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SESSIONS, {})[unique_id] = cookies
+
+
+@callback
+def async_pop_flow_session(
+    hass: HomeAssistant, unique_id: str | None
+) -> SessionCookies | None:
+    """Return the session stashed by the config flow of an account, once."""
+    return hass.data.get(DOMAIN, {}).get(DATA_SESSIONS, {}).pop(unique_id, None)
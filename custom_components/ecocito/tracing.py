@@ -0,0 +1,253 @@
+"""HTTP request phase timings for the Ecocito client."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import logging.handlers
+import pathlib
+import queue
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+# Phases of a request, in order. ``connect`` covers TCP and TLS (aiohttp does
+# not tell them apart), ``server`` runs from the connection being ready to the
+# response headers, and ``transfer`` until the body was read.
+PHASES = ("queued", "dns", "connect", "server", "transfer")
+
+TRACE_FILE_MAX_BYTES = 1024 * 1024
+TRACE_FILE_BACKUPS = 3
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Phase durations (seconds) of one HTTP request attempt."""
+
+    method: str = ""
+    endpoint: str = ""
+    status: int | None = None
+    error: str | None = None
+    queued: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    server: float = 0.0
+    transfer: float = 0.0
+    # Monotonic times of the request start, of the last phase start and of
+    # the response headers, while the request runs.
+    started: float = 0.0
+    mark: float = 0.0
+    dns_started: float = 0.0
+    headers_received: float | None = None
+
+    @property
+    def total(self) -> float:
+        """Return the duration of the request."""
+        return sum(getattr(self, phase) for phase in PHASES)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing as a trace file record, in milliseconds."""
+        return {
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "error": self.error,
+            **{phase: round(getattr(self, phase) * 1000, 2) for phase in PHASES},
+            "total": round(self.total * 1000, 2),
+        }
+
+
+@dataclass(slots=True)
+class EndpointTimings:
+    """Phase durations aggregated over the requests to one endpoint."""
+
+    count: int = 0
+    errors: int = 0
+    max_total: float = 0.0
+    totals: dict[str, float] = dataclasses.field(
+        default_factory=lambda: dict.fromkeys(PHASES, 0.0)
+    )
+
+    def add(self, timing: RequestTiming) -> None:
+        """Add a request."""
+        self.count += 1
+        self.errors += timing.error is not None
+        self.max_total = max(self.max_total, timing.total)
+        for phase in PHASES:
+            self.totals[phase] += getattr(timing, phase)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the average phase durations, in milliseconds."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "average": {
+                phase: round(total / self.count * 1000, 2)
+                for phase, total in self.totals.items()
+            },
+            "max_total": round(self.max_total * 1000, 2),
+        }
+
+
+class TraceFile:
+    """
+    Rotating JSON Lines file of request timings.
+
+    Records are queued and written by a background thread, so tracing never
+    blocks the event loop. Open and close it in the executor.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        """Open the file and start the writer thread."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=TRACE_FILE_MAX_BYTES,
+            backupCount=TRACE_FILE_BACKUPS,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._listener.start()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Queue a record."""
+        self._queue.put_nowait(
+            logging.makeLogRecord({"msg": json.dumps(record), "levelno": logging.INFO})
+        )
+
+    def close(self) -> None:
+        """Write the queued records and close the file."""
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+
+class RequestTracer:
+    """
+    Record the phase timings of the requests of an Ecocito client.
+
+    ``trace_config`` is attached to the client sessions only when tracing is
+    enabled, so a client without a tracer pays nothing. Each attempt carries
+    its RequestTiming as the aiohttp ``trace_request_ctx``; failed attempts
+    are recorded by the exception hook, successful ones by ``finish`` once the
+    body was read.
+    """
+
+    def __init__(self, trace_file: TraceFile | None = None) -> None:
+        """Initialize the tracer, optionally writing every request to a file."""
+        self.trace_file = trace_file
+        self.endpoints: dict[str, EndpointTimings] = {}
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_connection_queued_start.append(self._on_mark)
+        self.trace_config.on_connection_queued_end.append(self._on_queued_end)
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        self.trace_config.on_connection_create_start.append(self._on_mark)
+        self.trace_config.on_connection_create_end.append(self._on_create_end)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_request_exception.append(self._on_request_exception)
+
+    def finish(self, timing: RequestTiming) -> None:
+        """Record a request whose body has been read."""
+        if timing.headers_received is not None:
+            timing.transfer = time.monotonic() - timing.headers_received
+        self._record(timing)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings aggregated per endpoint."""
+        return {
+            endpoint: timings.as_dict()
+            for endpoint, timings in sorted(self.endpoints.items())
+        }
+
+    def _record(self, timing: RequestTiming) -> None:
+        self.endpoints.setdefault(timing.endpoint, EndpointTimings()).add(timing)
+        if self.trace_file is not None:
+            self.trace_file.write(
+                {"time": datetime.now(tz=UTC).isoformat(), **timing.as_dict()}
+            )
+
+    @staticmethod
+    def _timing(context: SimpleNamespace) -> RequestTiming | None:
+        return context.trace_request_ctx
+
+    async def _on_request_start(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.method = params.method
+            timing.endpoint = params.url.path
+            timing.started = timing.mark = time.monotonic()
+
+    async def _on_mark(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.mark = time.monotonic()
+
+    async def _on_queued_end(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.queued += time.monotonic() - timing.mark
+
+    async def _on_dns_start(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.dns_started = time.monotonic()
+
+    async def _on_dns_end(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.dns += time.monotonic() - timing.dns_started
+
+    async def _on_create_end(
+        self, _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            # DNS resolution happens while the connection is being created.
+            timing.connect += time.monotonic() - timing.mark - timing.dns
+
+    async def _on_request_end(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.status = params.response.status
+            timing.headers_received = now = time.monotonic()
+            timing.server = (
+                now - timing.started - timing.queued - timing.dns - timing.connect
+            )
+
+    async def _on_request_exception(
+        self,
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        if (timing := self._timing(context)) is not None:
+            timing.status = getattr(params.exception, "status", None)
+            timing.error = type(params.exception).__name__
+            timing.server = (
+                time.monotonic()
+                - timing.started
+                - timing.queued
+                - timing.dns
+                - timing.connect
+            )
+            self._record(timing)
@@ -0,0 +1,265 @@
+"""Record and replay of the HTTP exchanges of the Ecocito client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pathlib
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+CASSETTE_VERSION = 1
+# Response headers kept in cassettes; the others may identify the account.
+_RECORDED_HEADERS = ("Content-Type", "Retry-After")
+_ADDRESS_KEY = "LIBELLE_ADRESSE"
+_REDACTED = "REDACTED"
+
+type Interaction = dict[str, Any]
+
+
+class RecordedResponse:
+    """A response served from a cassette, or fully read while recording."""
+
+    def __init__(
+        self, status: int, headers: dict[str, str], body: bytes, url: URL
+    ) -> None:
+        """Initialize the response."""
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.url = url
+        self.charset = "utf-8"
+        self.content = _BodyStream(body)
+        self._body = body
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._body
+
+    async def text(self) -> str:
+        """Return the decoded body."""
+        return self._body.decode(self.charset, errors="replace")
+
+    def release(self) -> None:
+        """Do nothing: the body is already in memory."""
+
+
+class _BodyStream:
+    """The ``content`` stream of a recorded response."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+type Response = aiohttp.ClientResponse | RecordedResponse
+
+
+class EcocitoTransport(ABC):
+    """Send the requests of an Ecocito client in place of its session."""
+
+    @abstractmethod
+    async def request(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> Response:
+        """Send a request, raising ``ClientResponseError`` for error statuses."""
+
+
+class CassetteRecorder(EcocitoTransport):
+    """
+    Send requests through the session and record them in a cassette.
+
+    Cassettes are meant to be shared, so they are sanitized: request bodies
+    (the login form), cookie values and most headers are dropped, the
+    ``redact`` strings (e.g. username) are replaced in the bodies, and every
+    address is replaced by a stable placeholder. Responses are read in full
+    before being handed to the client.
+    """
+
+    def __init__(self, redact: Iterable[str] = ()) -> None:
+        """Initialize the recorder."""
+        self.interactions: list[Interaction] = []
+        self._redact = [secret for secret in redact if secret]
+        self._addresses: dict[str, str] = {}
+
+    async def request(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> Response:
+        """Send a request and record it."""
+        start = time.monotonic()
+        try:
+            response = await session.request(method, url, **kwargs)
+        except aiohttp.ClientResponseError as e:
+            self._record(method, url, kwargs, e.status, e.headers, [], b"", start)
+            raise
+        try:
+            body = await response.read()
+        finally:
+            response.release()
+        self._record(
+            method,
+            url,
+            kwargs,
+            response.status,
+            response.headers,
+            list(response.cookies),
+            body,
+            start,
+        )
+        return RecordedResponse(
+            response.status,
+            _recorded_headers(response.headers),
+            body,
+            response.url,
+        )
+
+    def save(self, path: pathlib.Path) -> None:
+        """Write the cassette to a file (blocking)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {"version": CASSETTE_VERSION, "interactions": self.interactions},
+                ensure_ascii=False,
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+
+    def _record(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        kwargs: dict[str, Any],
+        status: int,
+        headers: Any,
+        cookies: list[str],
+        body: bytes,
+        start: float,
+    ) -> None:
+        self.interactions.append(
+            {
+                "method": method,
+                "path": URL(url).path,
+                "params": dict(kwargs.get("params") or {}),
+                "status": status,
+                "headers": _recorded_headers(headers),
+                "cookies": cookies,
+                "body": self._sanitize(body.decode("utf-8", errors="replace")),
+                "elapsed": round(time.monotonic() - start, 4),
+            }
+        )
+
+    def _sanitize(self, body: str) -> str:
+        for secret in self._redact:
+            body = body.replace(secret, _REDACTED)
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            return body
+        if not isinstance(payload, dict) or not isinstance(payload.get("data"), list):
+            return body
+        for row in payload["data"]:
+            if isinstance(row, dict) and isinstance(row.get(_ADDRESS_KEY), str):
+                row[_ADDRESS_KEY] = self._addresses.setdefault(
+                    row[_ADDRESS_KEY], f"Adresse {len(self._addresses) + 1}"
+                )
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class CassettePlayer(EcocitoTransport):
+    """
+    Serve requests from a cassette, without any network access.
+
+    A request is answered by the next recording of the same method, path and
+    query parameters, or else of the same method and path (dates differ from
+    one day to the next); the last recording is repeated once all were
+    served. Each answer is delayed by its recorded duration multiplied by
+    ``time_scale`` (0 answers at once).
+    """
+
+    def __init__(
+        self, interactions: list[Interaction], time_scale: float = 1.0
+    ) -> None:
+        """Initialize the player."""
+        self.time_scale = time_scale
+        self._queues: dict[tuple, list[Interaction]] = {}
+        self._positions: dict[tuple, int] = {}
+        for interaction in interactions:
+            for key in _keys(
+                interaction["method"], interaction["path"], interaction["params"]
+            ):
+                self._queues.setdefault(key, []).append(interaction)
+
+    @classmethod
+    def load(cls, path: pathlib.Path, time_scale: float = 1.0) -> CassettePlayer:
+        """Read a cassette from a file (blocking)."""
+        cassette = json.loads(path.read_text(encoding="utf-8"))
+        if cassette.get("version") != CASSETTE_VERSION:
+            msg = f"Unsupported cassette version: {cassette.get('version')}"
+            raise ValueError(msg)
+        return cls(cassette["interactions"], time_scale)
+
+    async def request(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs: Any
+    ) -> Response:
+        """Answer a request from the cassette."""
+        request_url = URL(url)
+        params = {
+            key: str(value) for key, value in (kwargs.get("params") or {}).items()
+        }
+        interaction = self._next(method, request_url.path, params)
+        if interaction is None:
+            msg = f"No recorded response for {method} {request_url.path}"
+            raise aiohttp.ClientConnectionError(msg)
+        if self.time_scale > 0:
+            await asyncio.sleep(interaction["elapsed"] * self.time_scale)
+
+        headers = interaction["headers"]
+        if interaction["status"] >= 400:  # noqa: PLR2004
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(
+                    request_url, method, CIMultiDictProxy(CIMultiDict()), request_url
+                ),
+                (),
+                status=interaction["status"],
+                headers=CIMultiDictProxy(CIMultiDict(headers)),
+            )
+        if interaction["cookies"]:
+            session.cookie_jar.update_cookies(
+                dict.fromkeys(interaction["cookies"], _REDACTED), request_url
+            )
+        return RecordedResponse(
+            interaction["status"],
+            headers,
+            interaction["body"].encode("utf-8"),
+            request_url,
+        )
+
+    def _next(
+        self, method: str, path: str, params: dict[str, str]
+    ) -> Interaction | None:
+        for key in _keys(method, path, params):
+            if queue := self._queues.get(key):
+                position = self._positions.get(key, 0)
+                self._positions[key] = position + 1
+                return queue[min(position, len(queue) - 1)]
+        return None
+
+
+def _keys(method: str, path: str, params: dict[str, str]) -> tuple[tuple, tuple]:
+    """Return the exact and the loose matching keys of a request."""
+    return (method, path, tuple(sorted(params.items()))), (method, path)
+
+
+def _recorded_headers(headers: Any) -> dict[str, str]:
+    if not headers:
+        return {}
+    return {name: headers[name] for name in _RECORDED_HEADERS if name in headers}
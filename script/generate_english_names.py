@@ -0,0 +1,46 @@
+"""
+Generate custom_components/ecocito/_english_names.py from strings.json.
+
+The English sensor names are used to build stable entity ids. Generating
+them ahead of time avoids reading and parsing strings.json when the sensor
+platform is set up. Run ``script/generate`` after editing strings.json.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+
+COMPONENT = pathlib.Path(__file__).parent.parent / "custom_components" / "ecocito"
+OUTPUT = COMPONENT / "_english_names.py"
+
+HEADER = '''"""
+English sensor names, generated from strings.json by script/generate.
+
+Do not edit by hand.
+"""
+
+ENGLISH_SENSOR_NAMES: dict[str, str] = {
+'''
+
+
+def english_sensor_names() -> dict[str, str]:
+    """Return the English sensor names of strings.json by translation key."""
+    data = json.loads((COMPONENT / "strings.json").read_text(encoding="utf-8"))
+    return {
+        key: value.get("name", key)
+        for key, value in data.get("entity", {}).get("sensor", {}).items()
+    }
+
+
+def render() -> str:
+    """Render the generated module."""
+    lines = (
+        f"    {json.dumps(key)}: {json.dumps(name, ensure_ascii=False)},\n"
+        for key, name in english_sensor_names().items()
+    )
+    return HEADER + "".join(lines) + "}\n"
+
+
+if __name__ == "__main__":
+    OUTPUT.write_text(render(), encoding="utf-8")
@@ -0,0 +1,133 @@
+"""
+End-to-end client benchmarks against the local fake Ecocito server.
+
+Account shapes are ``AxTxYxR`` (addresses x types x years x rows) and can be
+overridden with ``ECOCITO_BENCH_ACCOUNTS=1x2x3x52,10x10x6x104``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tracemalloc
+from collections.abc import Callable, Coroutine, Generator
+from typing import Any
+
+import pytest
+
+from custom_components.ecocito.client import CollectionType, EcocitoClient
+from tests.fake_ecocito import (
+    FAKE_PASSWORD,
+    FAKE_USERNAME,
+    FakeAccount,
+    FakeEcocitoServer,
+)
+
+# The fake Ecocito server listens on a local socket.
+pytestmark = [pytest.mark.bench, pytest.mark.usefixtures("socket_enabled")]
+
+_ACCOUNT_SPECS = os.environ.get("ECOCITO_BENCH_ACCOUNTS", "1x2x3x52,3x6x6x104")
+_ROUNDS = 5
+
+
+@pytest.fixture(params=_ACCOUNT_SPECS.split(","))
+def fake_server(
+    request: pytest.FixtureRequest, event_loop: asyncio.AbstractEventLoop
+) -> Generator[FakeEcocitoServer]:
+    server = FakeEcocitoServer(FakeAccount.parse(request.param))
+    event_loop.run_until_complete(server.start())
+    yield server
+    event_loop.run_until_complete(server.stop())
+
+
+async def _authenticated_client(server: FakeEcocitoServer) -> EcocitoClient:
+    client = EcocitoClient("bench", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url)
+    await client.authenticate()
+    return client
+
+
+def _years(server: FakeEcocitoServer) -> range:
+    return range(
+        server.current_year - server.account.years + 1, server.current_year + 1
+    )
+
+
+def _peak_memory_kib(
+    loop: asyncio.AbstractEventLoop,
+    coro_factory: Callable[[], Coroutine[Any, Any, Any]],
+) -> int:
+    tracemalloc.start()
+    try:
+        loop.run_until_complete(coro_factory())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+
+async def _setup(server: FakeEcocitoServer) -> list[str]:
+    """Replay the client calls made by async_setup_entry."""
+    client = await _authenticated_client(server)
+    types = await client.get_collection_types()
+    return await client.get_addresses(server.current_year, types)
+
+
+async def _poll(
+    client: EcocitoClient, server: FakeEcocitoServer, types: list[CollectionType]
+) -> int:
+    """Run one refresh of every coordinator concurrently, return the row count."""
+    years = _years(server)
+    results = await asyncio.gather(
+        *(
+            client.get_collection_events(ctype.id, year)
+            for ctype in types
+            for year in years
+        ),
+        *(client.get_waste_depot_visits(year) for year in years),
+    )
+    return sum(len(result) for result in results)
+
+
+@pytest.mark.benchmark(group="client-setup")
+def test_setup(
+    benchmark: Any,
+    event_loop: asyncio.AbstractEventLoop,
+    fake_server: FakeEcocitoServer,
+) -> None:
+    benchmark.extra_info["peak_memory_kib"] = _peak_memory_kib(
+        event_loop, lambda: _setup(fake_server)
+    )
+    addresses = benchmark.pedantic(
+        lambda: event_loop.run_until_complete(_setup(fake_server)), rounds=_ROUNDS
+    )
+
+    assert addresses == fake_server.account.address_labels
+
+
+@pytest.mark.benchmark(group="client-poll")
+def test_poll_throughput(
+    benchmark: Any,
+    event_loop: asyncio.AbstractEventLoop,
+    fake_server: FakeEcocitoServer,
+) -> None:
+    client = event_loop.run_until_complete(_authenticated_client(fake_server))
+    types = event_loop.run_until_complete(client.get_collection_types())
+    requests_before = fake_server.request_count
+
+    benchmark.extra_info["peak_memory_kib"] = _peak_memory_kib(
+        event_loop, lambda: _poll(client, fake_server, types)
+    )
+    rows = benchmark.pedantic(
+        lambda: event_loop.run_until_complete(_poll(client, fake_server, types)),
+        rounds=_ROUNDS,
+    )
+
+    account = fake_server.account
+    years = len(_years(fake_server))
+    assert rows == years * (
+        account.types * account.addresses * account.rows + account.depot_visits
+    )
+    benchmark.extra_info["rows_per_poll"] = rows
+    benchmark.extra_info["requests_per_poll"] = (
+        fake_server.request_count - requests_before
+    ) // (_ROUNDS + 1)
@@ -0,0 +1,45 @@
+"""
+Import-time benchmark of the integration.
+
+Measures the import with ``python -X importtime`` as ``tests/test_imports.py``
+does, which checks that heavy dependencies are imported lazily, and holds it
+to a tighter budget. Override the budget with ``ECOCITO_IMPORT_BUDGET_MS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any
+
+import pytest
+
+from tests.test_imports import IMPORTED_MODULE, cumulative_ms, import_times
+
+pytestmark = pytest.mark.bench
+
+_LOGGER = logging.getLogger(__name__)
+
+_BUDGET_MS = float(os.environ.get("ECOCITO_IMPORT_BUDGET_MS", "500"))
+
+
+def test_import_time(record_property: Any) -> None:
+    times = import_times()
+    total_ms = cumulative_ms(times)
+    own_ms = (
+        sum(
+            self_us
+            for name, (_, self_us, _) in times.items()
+            if name.startswith("custom_components.ecocito")
+        )
+        / 1000
+    )
+    record_property("import_time_ms", round(total_ms, 1))
+    record_property("own_import_time_ms", round(own_ms, 1))
+    _LOGGER.info(
+        "Importing %s: %.1f ms (%.1f ms in the integration modules)",
+        IMPORTED_MODULE,
+        total_ms,
+        own_ms,
+    )
+    assert total_ms < _BUDGET_MS
@@ -0,0 +1,50 @@
+"""
+Collection page parsing benchmarks.
+
+Compares reading the collection types from a captured collection page with a
+full BeautifulSoup parse (the former implementation) and with the incremental
+extractor fed 8 KiB chunks, which stops at the end of the selector.
+"""
+
+from __future__ import annotations
+
+import codecs
+from typing import Any
+
+import pytest
+from bs4 import BeautifulSoup as bs  # noqa: N813
+
+from custom_components.ecocito.parsers import CollectionTypeSelectParser
+from tests.test_parsers import COLLECTION_PAGE
+
+pytestmark = pytest.mark.bench
+
+_CHUNK_SIZE = 8192
+_BODY = COLLECTION_PAGE.encode()
+
+
+def _beautifulsoup() -> list[tuple[str, str]]:
+    html = bs(_BODY.decode(), "html.parser")
+    select = html.find("select", {"id": "Filtres_IdMatiere"})
+    return [
+        (option["value"], option.get_text(strip=True))
+        for option in select.find_all("option")
+    ]
+
+
+def _incremental() -> list[tuple[str, str]]:
+    parser = CollectionTypeSelectParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(_BODY), _CHUNK_SIZE):
+        parser.feed(decoder.decode(_BODY[start : start + _CHUNK_SIZE]))
+        if parser.done:
+            break
+    return parser.options
+
+
+@pytest.mark.benchmark(group="collection-types")
+@pytest.mark.parametrize(
+    "extract", [_beautifulsoup, _incremental], ids=["beautifulsoup", "incremental"]
+)
+def test_collection_types_extraction(benchmark: Any, extract: Any) -> None:
+    assert benchmark(extract) == _beautifulsoup()
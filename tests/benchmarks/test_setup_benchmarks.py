@@ -0,0 +1,178 @@
+"""
+Scalability benchmarks for the integration setup.
+
+``async_setup_entry`` creates addresses x (history_years + 1) x types
+coordinators and two to three sensors for each of them. These benchmarks set
+the integration up against a mocked client serving synthetic data and report
+the setup wall time (current year only), the time until previous years are
+loaded, the peak memory and the time spent registering entities; the setup
+time is measured by pytest-benchmark, the others are added to its
+``extra_info``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ecocito.client import (
+    CollectionEvent,
+    CollectionType,
+    WasteDepotVisit,
+)
+from custom_components.ecocito.const import CONF_HISTORY_YEARS, DOMAIN
+
+pytestmark = pytest.mark.bench
+
+_ROWS_PER_YEAR = 12
+
+
+def _make_client(addresses: int, types: int) -> MagicMock:
+    """Return a mocked EcocitoClient serving synthetic data."""
+    locations = [f"{index + 1} rue de la Paix" for index in range(addresses)]
+    collection_types = [
+        CollectionType(id=str(15 + index), name=f"Type {index}")
+        for index in range(types)
+    ]
+
+    async def get_collection_events(event_type: str, year: int) -> list:
+        return [
+            CollectionEvent(
+                date=datetime(year, month + 1, 1, tzinfo=UTC),
+                location=location,
+                type=event_type,
+                quantity=float(month),
+            )
+            for location in locations
+            for month in range(_ROWS_PER_YEAR)
+        ]
+
+    async def get_waste_depot_visits(year: int) -> list:
+        return [WasteDepotVisit(date=datetime(year, 6, 1, tzinfo=UTC))]
+
+    async def get_collection_events_by_year(
+        event_type: str, first_year: int, last_year: int
+    ) -> dict:
+        return {
+            year: await get_collection_events(event_type, year)
+            for year in range(first_year, last_year + 1)
+        }
+
+    async def get_waste_depot_visits_by_year(first_year: int, last_year: int) -> dict:
+        return {
+            year: await get_waste_depot_visits(year)
+            for year in range(first_year, last_year + 1)
+        }
+
+    client = MagicMock()
+    client.authenticate = AsyncMock()
+    client.export_cookies = MagicMock(return_value=[])
+    client.get_collection_types = AsyncMock(return_value=collection_types)
+    client.get_collection_events = AsyncMock(side_effect=get_collection_events)
+    client.get_waste_depot_visits = AsyncMock(side_effect=get_waste_depot_visits)
+    client.get_collection_events_by_year = AsyncMock(
+        side_effect=get_collection_events_by_year
+    )
+    client.get_waste_depot_visits_by_year = AsyncMock(
+        side_effect=get_waste_depot_visits_by_year
+    )
+    return client
+
+
+@pytest.mark.benchmark(group="setup")
+@pytest.mark.parametrize(
+    "scale",
+    [(1, 2, 2), (10, 10, 5)],
+    ids=["small", "large"],
+)
+def test_setup_scalability(
+    benchmark: Any,
+    event_loop: asyncio.AbstractEventLoop,
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    scale: tuple[int, int, int],
+) -> None:
+    addresses, types, history_years = scale
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_DOMAIN: "test.ecocito.com",
+            CONF_USERNAME: "user@test.com",
+            CONF_PASSWORD: "password123",
+        },
+        options={CONF_HISTORY_YEARS: history_years},
+    )
+    entry.add_to_hass(hass)
+
+    registration_time = 0.0
+    original_add_entities = EntityPlatform.async_add_entities
+
+    async def timed_add_entities(
+        self: EntityPlatform, *args: Any, **kwargs: Any
+    ) -> None:
+        nonlocal registration_time
+        start = time.perf_counter()
+        try:
+            await original_add_entities(self, *args, **kwargs)
+        finally:
+            registration_time += time.perf_counter() - start
+
+    async def setup() -> None:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    with (
+        patch(
+            "custom_components.ecocito.EcocitoClient",
+            return_value=_make_client(addresses, types),
+        ),
+        patch.object(EntityPlatform, "async_add_entities", timed_add_entities),
+    ):
+        tracemalloc.start()
+        try:
+            # A config entry is set up once: a single round, current year only.
+            benchmark.pedantic(lambda: event_loop.run_until_complete(setup()), rounds=1)
+            # Previous years are loaded in the background after the setup.
+            start = time.perf_counter()
+            event_loop.run_until_complete(
+                hass.async_block_till_done(wait_background_tasks=True)
+            )
+            history_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    years = history_years + 1
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    coordinators = sum(
+        len(year_coords.collection_types)
+        for address_data in entry.runtime_data.addresses
+        for year_coords in address_data.coordinators
+    )
+    assert coordinators == addresses * years * types
+    # Per address and type: 3 current-year sensors, 4 rolling window sensors,
+    # 1 anomaly sensor and 2 per history year; the waste-depot sensors (1 per
+    # year) and diagnostic sensors are account-wide.
+    assert len(entities) == addresses * types * (8 + 2 * history_years) + years + 4
+
+    benchmark.extra_info["coordinators"] = coordinators
+    benchmark.extra_info["entities"] = len(entities)
+    benchmark.extra_info["history_load_time_s"] = round(history_time, 3)
+    benchmark.extra_info["peak_memory_kib"] = peak_memory // 1024
+    benchmark.extra_info["entity_registration_time_s"] = round(registration_time, 3)
+
+    assert event_loop.run_until_complete(
+        hass.config_entries.async_unload(entry.entry_id)
+    )
+    event_loop.run_until_complete(hass.async_block_till_done())
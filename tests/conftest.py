@@ -102,7 +102,12 @@ def mock_client() -> MagicMock:
     client.get_collection_types = AsyncMock(return_value=[])
     client.get_collection_events = AsyncMock(return_value=[])
     client.get_waste_depot_visits = AsyncMock(return_value=[])
+    client.get_collection_events_by_year = AsyncMock(return_value={})
+    client.get_waste_depot_visits_by_year = AsyncMock(return_value={})
     client.get_addresses = AsyncMock(return_value=[])
+    client.export_cookies = MagicMock(
+        return_value=[{"name": "session", "value": "token", "path": "/"}]
+    )
     return client
 
 
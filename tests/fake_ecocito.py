@@ -0,0 +1,314 @@
+"""
+Local fake Ecocito server for end-to-end client tests and benchmarks.
+
+Serves the login form, the ``/Usager/Collecte`` HTML page and the
+``GetCollecte`` / ``GetApport`` JSON endpoints from synthetic data, with
+optional session expiry, throttling (HTTP 429 + ``Retry-After``) and injected
+latency. Run ``python -m tests.fake_ecocito`` to start it standalone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+from custom_components.ecocito.const import (
+    ECOCITO_COLLECTION_PAGE_URI,
+    ECOCITO_COLLECTION_URI,
+    ECOCITO_DEFAULT_COLLECTION_TYPE,
+    ECOCITO_LOGIN_PASSWORD_KEY,
+    ECOCITO_LOGIN_URI,
+    ECOCITO_LOGIN_USERNAME_KEY,
+    ECOCITO_WASTE_DEPOSIT_URI,
+)
+
+FAKE_USERNAME = "user@test.com"
+FAKE_PASSWORD = "password123"  # noqa: S105
+
+_SESSION_COOKIE = "ASP.NET_SessionId"
+_TYPE_NAMES = ("Ordures ménagères", "Recyclage", "Déchets verts", "Badge")
+
+_HTML_LOGIN_FORM = (
+    "<html><body>"
+    f'<form action="{ECOCITO_LOGIN_URI}" method="post">'
+    f'<input name="{ECOCITO_LOGIN_USERNAME_KEY}"/>'
+    f'<input name="{ECOCITO_LOGIN_PASSWORD_KEY}" type="password"/>'
+    "</form></body></html>"
+)
+_HTML_INVALID_CREDENTIALS = (
+    "<html><body>"
+    '<div class="validation-summary-errors">'
+    "<ul><li>Identifiants invalides</li></ul>"
+    "</div></body></html>"
+)
+_HTML_WELCOME = "<html><body>Bienvenue</body></html>"
+
+
+@dataclass(kw_only=True, frozen=True)
+class FakeAccount:
+    """Shape of the synthetic account: addresses x types x years x rows."""
+
+    addresses: int = 1
+    types: int = 2
+    years: int = 3
+    rows: int = 52
+    depot_visits: int = 12
+
+    @classmethod
+    def parse(cls, spec: str) -> FakeAccount:
+        """Parse an ``AxTxYxR`` specification, e.g. ``2x4x3x52``."""
+        addresses, types, years, rows = (int(part) for part in spec.split("x"))
+        return cls(addresses=addresses, types=types, years=years, rows=rows)
+
+    @property
+    def type_ids(self) -> list[str]:
+        """Return the collection type identifiers."""
+        return [str(15 + index) for index in range(self.types)]
+
+    @property
+    def address_labels(self) -> list[str]:
+        """Return the address labels."""
+        return [f"{index + 1} rue de la Paix" for index in range(self.addresses)]
+
+    def type_name(self, type_id: str) -> str:
+        """Return the display name of a collection type."""
+        index = int(type_id) - 15
+        return _TYPE_NAMES[index] if index < len(_TYPE_NAMES) else f"Type {index}"
+
+
+@dataclass(kw_only=True)
+class _Data:
+    """Pre-generated rows, sorted by date."""
+
+    collections: dict[str, list[dict]] = field(default_factory=dict)
+    depot_visits: list[dict] = field(default_factory=list)
+
+
+def _generate(account: FakeAccount, current_year: int) -> _Data:
+    """Generate deterministic rows for every address, type and year."""
+    data = _Data()
+    first_year = current_year - account.years + 1
+    for type_index, type_id in enumerate(account.type_ids):
+        rows: list[dict] = []
+        for year in range(first_year, current_year + 1):
+            start = datetime(year, 1, 1)  # noqa: DTZ001
+            step = max(1, 365 // max(1, account.rows))
+            for address_index, address in enumerate(account.address_labels):
+                rows.extend(
+                    {
+                        "DATE_DONNEE": (start + timedelta(days=row * step)).isoformat(),
+                        "LIBELLE_ADRESSE": address,
+                        "QUANTITE_NETTE": float(
+                            10 + (address_index * 7 + type_index * 3 + row) % 50
+                        ),
+                    }
+                    for row in range(account.rows)
+                )
+        rows.sort(key=lambda row: row["DATE_DONNEE"])
+        data.collections[type_id] = rows
+    for year in range(first_year, current_year + 1):
+        step = max(1, 365 // max(1, account.depot_visits))
+        data.depot_visits.extend(
+            {
+                "DATE_DONNEE": (
+                    datetime(year, 1, 1) + timedelta(days=visit * step)  # noqa: DTZ001
+                ).isoformat()
+            }
+            for visit in range(account.depot_visits)
+        )
+    return data
+
+
+def _render_collection_page(account: FakeAccount) -> str:
+    """Render a collection page shaped like the real one."""
+    options = "".join(
+        f'<option value="{type_id}">{account.type_name(type_id)}</option>'
+        for type_id in account.type_ids
+    )
+    # The real page carries a large header, navigation and inline scripts
+    # before the filter form, and the results grid after it.
+    padding = "".join(
+        f'<li class="menu-item"><a href="/Usager/Page{index}">Page {index}</a></li>'
+        for index in range(200)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Mes collectes</title>"
+        "<script>var config = {};</script></head><body>"
+        f"<nav><ul>{padding}</ul></nav>"
+        '<form id="filtres" method="get">'
+        '<select id="Filtres_IdMatiere" name="Filtres.IdMatiere">'
+        f'<option value="{ECOCITO_DEFAULT_COLLECTION_TYPE}">'
+        "Tous les types de déchets</option>"
+        f"{options}</select></form>"
+        f'<div id="grid"><table>{padding}</table></div>'
+        "</body></html>"
+    )
+
+
+class FakeEcocitoServer:
+    """In-process fake Ecocito server."""
+
+    def __init__(
+        self,
+        account: FakeAccount | None = None,
+        *,
+        latency: float = 0.0,
+        session_ttl: int | None = None,
+        rate_limit: float | None = None,
+        current_year: int | None = None,
+    ) -> None:
+        """
+        Initialize the server.
+
+        ``session_ttl`` expires a session after that many authenticated
+        requests; ``rate_limit`` answers 429 above that many requests per
+        second; ``latency`` is added to every response, in seconds.
+        """
+        self.account = account or FakeAccount()
+        self.latency = latency
+        self.session_ttl = session_ttl
+        self.rate_limit = rate_limit
+        self.current_year = current_year or datetime.now().year  # noqa: DTZ005
+        self.requests: dict[str, int] = {}
+        self._data = _generate(self.account, self.current_year)
+        self._page = _render_collection_page(self.account)
+        self._sessions: dict[str, int] = {}
+        self._window_start = 0.0
+        self._window_count = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    @property
+    def request_count(self) -> int:
+        """Return the total number of requests served."""
+        return sum(self.requests.values())
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening and return the base URL."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post(ECOCITO_LOGIN_URI, self._login)
+        app.router.add_get(ECOCITO_COLLECTION_PAGE_URI, self._collection_page)
+        app.router.add_get(ECOCITO_COLLECTION_URI, self._collections)
+        app.router.add_get(ECOCITO_WASTE_DEPOSIT_URI, self._depot_visits)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: web.RequestHandler
+    ) -> web.StreamResponse:
+        """Count requests, then apply latency and throttling."""
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit is not None:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return web.Response(status=429, headers={"Retry-After": "1"})
+        return await handler(request)
+
+    def _authenticated(self, request: web.Request) -> bool:
+        """Consume one request of the caller's session, if any."""
+        token = request.cookies.get(_SESSION_COOKIE)
+        if token is None or token not in self._sessions:
+            return False
+        if self.session_ttl is not None:
+            self._sessions[token] -= 1
+            if self._sessions[token] < 0:
+                del self._sessions[token]
+                return False
+        return True
+
+    async def _login(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if (
+            form.get(ECOCITO_LOGIN_USERNAME_KEY) != FAKE_USERNAME
+            or form.get(ECOCITO_LOGIN_PASSWORD_KEY) != FAKE_PASSWORD
+        ):
+            return web.Response(
+                text=_HTML_INVALID_CREDENTIALS, content_type="text/html"
+            )
+        token = secrets.token_hex(16)
+        self._sessions[token] = self.session_ttl or 0
+        response = web.Response(text=_HTML_WELCOME, content_type="text/html")
+        response.set_cookie(_SESSION_COOKIE, token)
+        return response
+
+    async def _collection_page(self, request: web.Request) -> web.Response:
+        if not self._authenticated(request):
+            return web.Response(text=_HTML_LOGIN_FORM, content_type="text/html")
+        return web.Response(text=self._page, content_type="text/html")
+
+    async def _collections(self, request: web.Request) -> web.Response:
+        if not self._authenticated(request):
+            return web.Response(text=_HTML_LOGIN_FORM, content_type="text/html")
+        rows = self._data.collections.get(request.query.get("idMatiere", ""), [])
+        return self._page_response(request, rows)
+
+    async def _depot_visits(self, request: web.Request) -> web.Response:
+        if not self._authenticated(request):
+            return web.Response(text=_HTML_LOGIN_FORM, content_type="text/html")
+        return self._page_response(request, self._data.depot_visits)
+
+    @staticmethod
+    def _page_response(request: web.Request, rows: list[dict]) -> web.Response:
+        """Filter rows on the requested date range and return one page."""
+        start = request.query.get("dateDebut", "")[:19]
+        end = request.query.get("dateFin", "")[:19]
+        selected = [row for row in rows if start <= row["DATE_DONNEE"] <= end]
+        skip = int(request.query.get("skip", "0"))
+        take = int(request.query.get("take", "1000"))
+        return web.json_response(
+            {"data": selected[skip : skip + take], "totalCount": len(selected)}
+        )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = FakeEcocitoServer(
+        FakeAccount.parse(args.account),
+        latency=args.latency,
+        session_ttl=args.session_ttl,
+        rate_limit=args.rate_limit,
+    )
+    url = await server.start(args.host, args.port)
+    print(f"Fake Ecocito server listening on {url}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the fake server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--account", default="1x2x3x52", help="AxTxYxR")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=int, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
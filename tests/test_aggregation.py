@@ -0,0 +1,120 @@
+"""Tests for the Ecocito incremental aggregations."""
+
+from __future__ import annotations
+
+import statistics
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.ecocito.aggregation import (
+    RunningStats,
+    SlidingWindow,
+    diff_events,
+    event_key,
+)
+from custom_components.ecocito.client import CollectionEvent
+
+_NOW = datetime(2025, 1, 20, tzinfo=UTC)
+
+
+def _event(days_ago: int, quantity: float = 10.0) -> CollectionEvent:
+    return CollectionEvent(
+        date=_NOW - timedelta(days=days_ago),
+        location="12 rue de la Paix",
+        type="15",
+        quantity=quantity,
+    )
+
+
+def test_diff_events() -> None:
+    """Only added and removed events are reported."""
+    first, second, third = _event(3), _event(2), _event(1)
+    keys, added, removed = diff_events(Counter(), [first, second])
+    assert (added, removed) == ([first, second], [])
+
+    keys, added, removed = diff_events(keys, [second, third])
+    assert added == [third]
+    assert removed == [event_key(first)]
+    assert keys == Counter([event_key(second), event_key(third)])
+
+
+def test_sliding_window_add_and_evict() -> None:
+    """Values are summed as they arrive, and evicted once expired."""
+    window = SlidingWindow(timedelta(days=30))
+    for event in (_event(40), _event(20, 5.0), _event(5, 7.0)):
+        window.add(event_key(event), event.date, event.quantity)
+    assert window.evict(_NOW)
+    assert (window.count, window.total) == (2, 12.0)
+
+    # Out of order and already expired values.
+    late = _event(10, 3.0)
+    window.add(event_key(late), late.date, late.quantity)
+    expired = _event(35)
+    window.add(event_key(expired), expired.date, expired.quantity)
+    assert (window.count, window.total) == (3, 15.0)
+
+    assert not window.evict(_NOW + timedelta(days=5))
+    assert window.evict(_NOW + timedelta(days=11))
+    assert (window.count, window.total) == (2, 10.0)
+    assert window.evict(_NOW + timedelta(days=31))
+    assert (window.count, window.total) == (0, 0.0)
+
+
+def test_sliding_window_references() -> None:
+    """A value fed by two sources stays until both have removed it."""
+    window = SlidingWindow(timedelta(days=30))
+    window.evict(_NOW)
+    event = _event(3)
+    key = event_key(event)
+
+    window.add(key, event.date, event.quantity)
+    window.add(key, event.date, event.quantity)
+    assert window.count == 1
+
+    window.remove(key)
+    assert window.count == 1
+    window.remove(key)
+    assert (window.count, window.total) == (0, 0.0)
+
+
+def test_sliding_window_removed_then_added() -> None:
+    """A removed value is skipped on eviction, unless its key came back."""
+    window = SlidingWindow(timedelta(days=30))
+    window.evict(_NOW)
+    events = [_event(days_ago, float(days_ago)) for days_ago in (20, 10, 5)]
+    for event in events:
+        window.add(event_key(event), event.date, event.quantity)
+
+    window.remove(event_key(events[0]))
+    window.remove(event_key(events[1]))
+    assert (window.count, window.total) == (1, 5.0)
+    window.add(event_key(events[1]), events[1].date, events[1].quantity)
+    assert (window.count, window.total) == (2, 15.0)
+
+    assert not window.evict(_NOW + timedelta(days=15))
+    assert window.evict(_NOW + timedelta(days=21))
+    assert (window.count, window.total) == (1, 5.0)
+    assert window.evict(_NOW + timedelta(days=26))
+    assert (window.count, window.total) == (0, 0.0)
+
+
+def test_running_stats() -> None:
+    """Online statistics match those computed over the whole series."""
+    values = [12.0, 15.5, 9.0, 14.0, 11.0, 13.5]
+    stats = RunningStats(alpha=0.5)
+    assert stats.z_score(10.0) is None
+
+    for value in values[2:]:
+        stats.add(value)
+    # History loaded afterwards does not move the EWMA.
+    ewma = stats.ewma
+    for value in values[:2]:
+        stats.add(value, chronological=False)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stddev == pytest.approx(statistics.stdev(values))
+    assert stats.ewma == ewma == pytest.approx(12.375)
+    assert stats.z_score(stats.mean + 2 * stats.stddev) == pytest.approx(2.0)
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import re
+from datetime import date
+from unittest.mock import AsyncMock, patch
 
 import aiohttp
 import pytest
@@ -19,13 +21,18 @@ from custom_components.ecocito.const import (
     ECOCITO_COLLECTION_ENDPOINT,
     ECOCITO_COLLECTION_PAGE_ENDPOINT,
     ECOCITO_LOGIN_ENDPOINT,
+    ECOCITO_LOGIN_URI,
     ECOCITO_WASTE_DEPOSIT_ENDPOINT,
 )
 from custom_components.ecocito.errors import (
     CannotConnectError,
+    CircuitOpenError,
     EcocitoError,
     InvalidAuthenticationError,
 )
+from custom_components.ecocito.resilience import BackoffPolicy, CircuitBreaker
+from tests.fake_ecocito import FAKE_PASSWORD, FAKE_USERNAME, FakeEcocitoServer
+from tests.test_parsers import COLLECTION_PAGE
 
 _TEST_SUBDOMAIN = "test"
 _LOGIN_URL = ECOCITO_LOGIN_ENDPOINT.format(_TEST_SUBDOMAIN)
@@ -131,6 +138,23 @@ async def test_get_collection_types_success() -> None:
     assert types[1].name == "Recyclage"
 
 
+async def test_get_collection_types_captured_page() -> None:
+    """The selector is found on a full page, among other selects and forms."""
+    client = _make_client()
+    _populate_cookies(client)
+    with aioresponses() as m:
+        m.get(
+            _COLLECTION_PAGE_RE,
+            status=200,
+            body=COLLECTION_PAGE.encode(),
+            content_type="text/html; charset=utf-8",
+        )
+        types = await client.get_collection_types()
+
+    assert [ctype.id for ctype in types] == ["15", "16", "17", "18", "19", "20", "21"]
+    assert types[-1].name == "Badge d'accès déchèterie"
+
+
 async def test_get_collection_types_session_expired() -> None:
     """First GET returns login HTML → re-auth → second GET returns page."""
     client = _make_client()
@@ -171,6 +195,98 @@ async def test_get_collection_events_success() -> None:
     assert events[0].quantity == 120.0
 
 
+async def test_get_collection_events_paged() -> None:
+    """Pages are requested until totalCount rows have been received."""
+    rows = [
+        {
+            "DATE_DONNEE": f"2024-03-{day:02d}T00:00:00",
+            "LIBELLE_ADRESSE": "12 rue de la Paix",
+            "QUANTITE_NETTE": float(day),
+        }
+        for day in range(1, 6)
+    ]
+    client = _make_client()
+    _populate_cookies(client)
+    with (
+        patch("custom_components.ecocito.client._PAGE_SIZE", 2),
+        aioresponses() as m,
+    ):
+        for skip in (0, 2, 4):
+            m.get(
+                _COLLECTION_RE,
+                payload={"data": rows[skip : skip + 2], "totalCount": len(rows)},
+            )
+        events = await client.get_collection_events("15", 2024)
+        requests = [
+            call.kwargs["params"]["skip"]
+            for (method, _), calls in m.requests.items()
+            if method == "GET"
+            for call in calls
+        ]
+
+    assert [event.quantity for event in events] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert requests == ["0", "2", "4"]
+
+
+async def test_iter_collection_events_lazy() -> None:
+    """A page is only requested once the previous one was consumed."""
+    rows = [
+        {
+            "DATE_DONNEE": f"2023-{month:02d}-01T00:00:00",
+            "LIBELLE_ADRESSE": "12 rue de la Paix",
+            "QUANTITE_NETTE": float(month),
+        }
+        for month in range(1, 7)
+    ]
+    client = _make_client()
+    _populate_cookies(client)
+    with (
+        patch("custom_components.ecocito.client._PAGE_SIZE", 2),
+        aioresponses() as m,
+    ):
+        for skip in (0, 2, 4):
+            m.get(
+                _COLLECTION_RE,
+                payload={"data": rows[skip : skip + 2], "totalCount": len(rows)},
+            )
+        pages = client.iter_collection_events(
+            "15", date(2023, 1, 1), date(2024, 12, 31)
+        )
+        first = await anext(pages)
+        sent = sum(len(calls) for calls in m.requests.values())
+        await pages.aclose()
+
+    assert [event.quantity for event in first] == [1.0, 2.0]
+    assert sent == 1
+
+
+async def test_get_collection_events_by_year() -> None:
+    """Several years are fetched in one request and split by year."""
+    client = _make_client()
+    _populate_cookies(client)
+    with aioresponses() as m:
+        m.get(
+            _COLLECTION_RE,
+            payload={
+                "data": [
+                    {**_VALID_COLLECTION_JSON["data"][0], "DATE_DONNEE": day}
+                    for day in ("2022-01-04T00:00:00", "2024-12-31T00:00:00")
+                ]
+            },
+        )
+        events = await client.get_collection_events_by_year("15", 2022, 2024)
+        ((_, url), calls) = next(iter(m.requests.items()))
+
+    assert {year: len(year_events) for year, year_events in events.items()} == {
+        2022: 1,
+        2023: 0,
+        2024: 1,
+    }
+    assert len(calls) == 1
+    assert url.query["dateDebut"].startswith("2022-01-01")
+    assert url.query["dateFin"].startswith("2024-12-31")
+
+
 async def test_get_collection_events_session_expired() -> None:
     """First GET returns login HTML → re-auth → second GET returns JSON."""
     client = _make_client()
@@ -259,3 +375,94 @@ async def test_get_addresses() -> None:
         addresses = await client.get_addresses(2024, collection_types)
 
     assert addresses == ["12 rue de la Paix", "20 avenue des Fleurs"]
+
+
+async def test_get_collection_events_throttled_then_success() -> None:
+    """429 with Retry-After → wait the requested delay → retry succeeds."""
+    client = _make_client()
+    _populate_cookies(client)
+    with (
+        aioresponses() as m,
+        patch("custom_components.ecocito.client.asyncio.sleep", AsyncMock()) as sleep,
+    ):
+        m.get(_COLLECTION_RE, status=429, headers={"Retry-After": "7"})
+        m.get(_COLLECTION_RE, payload=_VALID_COLLECTION_JSON)
+        events = await client.get_collection_events("15", 2024)
+
+    assert len(events) == 1
+    sleep.assert_awaited_once_with(7.0)
+
+
+async def test_get_collection_events_server_error_gives_up() -> None:
+    """5xx on every attempt → retries exhausted → EcocitoError."""
+    client = EcocitoClient(
+        "test.ecocito.com",
+        "user@test.com",
+        "password123",
+        backoff=BackoffPolicy(retries=2),
+    )
+    _populate_cookies(client)
+    with (
+        aioresponses() as m,
+        patch("custom_components.ecocito.client.asyncio.sleep", AsyncMock()) as sleep,
+    ):
+        for _ in range(3):
+            m.get(_COLLECTION_RE, status=503)
+        with pytest.raises(EcocitoError):
+            await client.get_collection_events("15", 2024)
+
+    assert sleep.await_count == 2
+
+
+async def test_circuit_breaker_short_circuits_requests() -> None:
+    """Repeated network errors open the circuit → no further request is sent."""
+    client = EcocitoClient(
+        "test.ecocito.com",
+        "user@test.com",
+        "password123",
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+    _populate_cookies(client)
+    with aioresponses() as m:
+        for _ in range(2):
+            m.get(
+                _COLLECTION_RE,
+                exception=aiohttp.ClientConnectionError("network failure"),
+            )
+            with pytest.raises(CannotConnectError):
+                await client.get_collection_events("15", 2024)
+
+        with pytest.raises(CircuitOpenError):
+            await client.get_collection_events("15", 2024)
+        assert len(m.requests) == 1
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_restored_cookies_skip_login() -> None:
+    """A restored session is reused, and replaced once the server rejects it."""
+    server = FakeEcocitoServer(session_ttl=2)
+    await server.start()
+    try:
+        first = EcocitoClient("test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url)
+        await first.authenticate()
+        cookies = first.export_cookies()
+        assert cookies
+
+        second = EcocitoClient(
+            "test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url
+        )
+        authenticated = []
+        second.on_authenticated = lambda: authenticated.append(True)
+        second.load_cookies(cookies)
+        assert await second.get_collection_types()
+        assert server.requests[ECOCITO_LOGIN_URI] == 1
+        assert authenticated == []
+
+        # The session expires after two requests: the client logs in again.
+        await second.get_collection_types()
+        await second.get_collection_types()
+        assert server.requests[ECOCITO_LOGIN_URI] == 2
+        assert authenticated == [True]
+        assert second.export_cookies() != cookies
+    finally:
+        await server.stop()
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.data_entry_flow import FlowResultType
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.ecocito.client import CollectionType
 from custom_components.ecocito.const import (
     CONF_HISTORY_YEARS,
+    CONF_TRACKED_TYPES,
+    CONF_TYPE_HISTORY_YEARS,
     DEFAULT_HISTORY_YEARS,
     DOMAIN,
 )
@@ -18,6 +21,7 @@ from custom_components.ecocito.errors import (
     CannotConnectError,
     InvalidAuthenticationError,
 )
+from custom_components.ecocito.session import async_pop_flow_session
 
 _USER_INPUT = {
     CONF_DOMAIN: "test.ecocito.com",
@@ -58,6 +62,54 @@ async def test_form_valid_input(hass: object, enable_custom_integrations: None)
     assert result["data"] == _USER_INPUT
 
 
+async def test_form_hands_session_to_setup(
+    hass: object, enable_custom_integrations: None
+) -> None:
+    """The session validated by the flow is kept for the entry setup."""
+    cookies = [{"name": "session", "value": "token", "path": "/"}]
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with (
+        patch(
+            "custom_components.ecocito.config_flow.validate_input",
+            return_value=cookies,
+        ),
+        patch("custom_components.ecocito.async_setup_entry", return_value=True),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], _USER_INPUT
+        )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert async_pop_flow_session(hass, "test_user@test.com") == cookies
+
+
+async def test_form_already_configured(
+    hass: object, enable_custom_integrations: None
+) -> None:
+    """The same account on the same domain cannot be added twice."""
+    MockConfigEntry(
+        domain=DOMAIN, data=_USER_INPUT, unique_id="test_user@test.com"
+    ).add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with patch(
+        "custom_components.ecocito.config_flow.validate_input",
+        return_value=None,
+    ) as mock_validate:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {**_USER_INPUT, CONF_USERNAME: "User@test.com"}
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    mock_validate.assert_not_called()
+
+
 async def test_form_invalid_auth(
     hass: object, enable_custom_integrations: None
 ) -> None:
@@ -137,3 +189,56 @@ async def test_options_flow_update(
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
     assert result["data"] == {CONF_HISTORY_YEARS: 3}
+
+
+async def test_options_flow_tracking(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """A loaded entry chooses the types per address, then the years per type."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    mock_client.get_addresses = AsyncMock(return_value=["1 rue A", "2 rue B"])
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=_USER_INPUT,
+        options={CONF_HISTORY_YEARS: 0, CONF_TRACKED_TYPES: {"1 rue A": ["16"]}},
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_HISTORY_YEARS: 2}
+    )
+    assert result["step_id"] == "tracking"
+    defaults = {key.schema: key.default() for key in result["data_schema"].schema}
+    # Known addresses keep their choice, new ones track every type.
+    assert defaults == {"1 rue A": ["16"], "2 rue B": ["15", "16"]}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"1 rue A": ["15", "16"], "2 rue B": []}
+    )
+    assert result["step_id"] == "years"
+    assert {key.schema for key in result["data_schema"].schema} == {
+        "Ordures ménagères (15)",
+        "Recyclage (16)",
+    }
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"Ordures ménagères (15)": 2, "Recyclage (16)": 0}
+        )
+        await hass.async_block_till_done()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        CONF_HISTORY_YEARS: 2,
+        CONF_TRACKED_TYPES: {"1 rue A": ["15", "16"], "2 rue B": []},
+        CONF_TYPE_HISTORY_YEARS: {"15": 2, "16": 0},
+    }
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -2,20 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
 
 from custom_components.ecocito.client import CollectionEvent, CollectionType
+from custom_components.ecocito.const import DOMAIN, EVENT_NEW_COLLECTION
 from custom_components.ecocito.coordinator import (
     CollectionEventsDataUpdateCoordinator,
     CollectionTypesDataUpdateCoordinator,
+    EcocitoYearStore,
+    collection_store_key,
 )
 from custom_components.ecocito.errors import (
     CannotConnectError,
+    CircuitOpenError,
     EcocitoError,
     InvalidAuthenticationError,
 )
@@ -103,6 +113,186 @@ async def test_coordinator_ecocito_error(hass: object, mock_client: MagicMock) -
         await coordinator._async_update_data()
 
 
+async def test_coordinator_serves_stale_data(
+    hass: object, mock_client: MagicMock
+) -> None:
+    """Ecocito unreachable after a first success → last data is kept, flagged stale."""
+    event = _make_event("12 rue de la Paix")
+    mock_client.get_collection_events = AsyncMock(return_value=[event])
+    coordinator = CollectionEventsDataUpdateCoordinator(
+        hass, mock_client, _COLLECTION_TYPE, 0
+    )
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.stale is False
+
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=CircuitOpenError("requests suspended")
+    )
+    result = await coordinator._async_update_data()
+
+    assert result == [event]
+    assert coordinator.stale is True
+    assert coordinator.last_success is not None
+
+
+async def test_year_rollover_reuses_closed_years(
+    hass: object, mock_client: MagicMock, freezer: FrozenDateTimeFactory
+) -> None:
+    """At New Year only the new year and the just-closed one are fetched."""
+    freezer.move_to("2024-06-15 12:00:00+00:00")
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=lambda _type_id, year: [
+            CollectionEvent(
+                date=datetime(year, 3, 15, tzinfo=UTC),
+                location="12 rue de la Paix",
+                type=_COLLECTION_TYPE.id,
+                quantity=100.0,
+            )
+        ]
+    )
+    store = EcocitoYearStore()
+    coordinators = [
+        CollectionEventsDataUpdateCoordinator(
+            hass, mock_client, _COLLECTION_TYPE, year_offset, store=store
+        )
+        for year_offset in (0, -1, -2)
+    ]
+
+    mock_client.get_collection_events_by_year = AsyncMock(
+        side_effect=lambda type_id, first, last: {
+            year: mock_client.get_collection_events.side_effect(type_id, year)
+            for year in range(first, last + 1)
+        }
+    )
+
+    for coordinator in coordinators:
+        await coordinator._async_update_data()
+    for coordinator in coordinators:
+        await coordinator._async_update_data()
+    assert [call.args[1] for call in mock_client.get_collection_events.mock_calls] == [
+        2024,
+        2024,
+    ]
+    # The closed years were fetched together.
+    mock_client.get_collection_events_by_year.assert_awaited_once_with(
+        _COLLECTION_TYPE.id, 2022, 2023
+    )
+
+    mock_client.get_collection_events.reset_mock()
+    freezer.move_to("2025-01-02 12:00:00+00:00")
+    results = [await c._async_update_data() for c in coordinators]
+    for coordinator in coordinators:
+        await coordinator._async_update_data()
+
+    assert [call.args[1] for call in mock_client.get_collection_events.mock_calls] == [
+        2025,
+        2024,
+        2025,
+    ]
+    assert [result[0].date.year for result in results] == [2025, 2024, 2023]
+    # 2022 left the window of the coordinators.
+    assert store.get(collection_store_key(_COLLECTION_TYPE.id), 2022) is None
+    assert store.get(collection_store_key(_COLLECTION_TYPE.id), 2023) is not None
+
+
+async def test_closed_years_fetched_once(
+    hass: object, mock_client: MagicMock, freezer: FrozenDateTimeFactory
+) -> None:
+    """Coordinators of closed years share one spanning fetch, split by year."""
+    freezer.move_to("2024-06-15 12:00:00+00:00")
+    fetched = asyncio.Event()
+
+    async def get_collection_events_by_year(
+        type_id: str, first: int, last: int
+    ) -> dict[int, list[CollectionEvent]]:
+        await fetched.wait()
+        return {
+            year: [
+                CollectionEvent(
+                    date=datetime(year, 3, 15, tzinfo=UTC),
+                    location=f"{year} rue de la Paix",
+                    type=type_id,
+                    quantity=100.0,
+                )
+            ]
+            for year in range(first, last + 1)
+        }
+
+    mock_client.get_collection_events_by_year = AsyncMock(
+        side_effect=get_collection_events_by_year
+    )
+    store = EcocitoYearStore()
+    coordinators = [
+        CollectionEventsDataUpdateCoordinator(
+            hass,
+            mock_client,
+            _COLLECTION_TYPE,
+            year_offset,
+            location=f"{2024 + year_offset} rue de la Paix",
+            store=store,
+        )
+        for year_offset in (-1, -1, -2, -3)
+    ]
+
+    refreshes = [
+        asyncio.create_task(coordinator._async_update_data())
+        for coordinator in coordinators[:2]
+    ]
+    await asyncio.sleep(0)
+    fetched.set()
+    results = [*await asyncio.gather(*refreshes)]
+    results += [
+        await coordinator._async_update_data() for coordinator in coordinators[2:]
+    ]
+
+    mock_client.get_collection_events_by_year.assert_awaited_once_with(
+        _COLLECTION_TYPE.id, 2021, 2023
+    )
+    mock_client.get_collection_events.assert_not_awaited()
+    assert [result[0].date.year for result in results] == [2023, 2023, 2022, 2021]
+
+
+async def test_new_collection_events(
+    hass: object, mock_client: MagicMock, freezer: FrozenDateTimeFactory
+) -> None:
+    """Only collections appearing between two refreshes of a year are fired."""
+    freezer.move_to("2024-06-15 12:00:00+00:00")
+    first, second = _make_event("12 rue de la Paix"), _make_event("1 rue B")
+    mock_client.get_collection_events = AsyncMock(return_value=[first])
+    coordinator = CollectionEventsDataUpdateCoordinator(
+        hass, mock_client, _COLLECTION_TYPE, 0
+    )
+    coordinator.config_entry = MagicMock(entry_id="entry")
+    fired = async_capture_events(hass, EVENT_NEW_COLLECTION)
+
+    # The history loaded by the first refresh is not new.
+    coordinator.data = await coordinator._async_update_data()
+    mock_client.get_collection_events = AsyncMock(return_value=[first, second])
+    coordinator.data = await coordinator._async_update_data()
+    coordinator.data = await coordinator._async_update_data()
+    await hass.async_block_till_done()
+
+    assert [event.data for event in fired] == [
+        {
+            "config_entry_id": "entry",
+            "collection_type_id": "15",
+            "collection_type": "Ordures ménagères",
+            "location": "1 rue B",
+            "date": "2024-03-15T00:00:00+00:00",
+            "weight": 100.0,
+        }
+    ]
+
+    # Neither is the year New Year moves to the coordinator.
+    freezer.move_to("2025-01-02 12:00:00+00:00")
+    mock_client.get_collection_events = AsyncMock(
+        return_value=[_make_event("12 rue de la Paix"), _make_event("2 rue C")]
+    )
+    coordinator.data = await coordinator._async_update_data()
+    await hass.async_block_till_done()
+    assert len(fired) == 1
+
+
 async def test_collection_types_coordinator_no_change(
     hass: object, mock_client: MagicMock
 ) -> None:
@@ -114,33 +304,98 @@ async def test_collection_types_coordinator_no_change(
     ]
     mock_client.get_collection_types = AsyncMock(return_value=types)
 
-    coordinator = CollectionTypesDataUpdateCoordinator(hass, mock_client, known)
-    with patch.object(hass, "async_create_task") as mock_create_task:
-        result = await coordinator._async_update_data()
+    on_change = AsyncMock()
+
+    coordinator = CollectionTypesDataUpdateCoordinator(
+        hass, mock_client, known, on_change=on_change
+    )
+    coordinator.config_entry = MockConfigEntry(domain=DOMAIN)
+    result = await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     assert result == types
-    mock_create_task.assert_not_called()
+    on_change.assert_not_awaited()
 
 
 async def test_collection_types_coordinator_types_changed(
     hass: object, mock_client: MagicMock
 ) -> None:
-    """Types changed → reload task is created."""
+    """Types changed → the change callback is scheduled with the new types."""
     known = frozenset(["15", "16"])
     new_types = [
         CollectionType(id="15", name="Ordures ménagères"),
         CollectionType(id="17", name="Déchets verts"),
     ]
     mock_client.get_collection_types = AsyncMock(return_value=new_types)
+    on_change = AsyncMock()
 
-    coordinator = CollectionTypesDataUpdateCoordinator(hass, mock_client, known)
-    coordinator.config_entry = MagicMock()
-    coordinator.config_entry.entry_id = "test_entry_id"
-    with (
-        patch.object(hass, "async_create_task") as mock_create_task,
-        patch.object(hass.config_entries, "async_reload", MagicMock()),
-    ):
-        result = await coordinator._async_update_data()
+    coordinator = CollectionTypesDataUpdateCoordinator(
+        hass, mock_client, known, on_change=on_change
+    )
+    coordinator.config_entry = MockConfigEntry(domain=DOMAIN)
+    result = await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     assert result == new_types
-    mock_create_task.assert_called_once()
+    on_change.assert_awaited_once_with(new_types, [])
+
+    # The same types on the next poll are not reported again.
+    await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    on_change.assert_awaited_once()
+
+
+async def test_collection_types_coordinator_addresses_from_store(
+    hass: object, mock_client: MagicMock
+) -> None:
+    """With unchanged types, addresses come from the fetched events, no request."""
+    types = [CollectionType(id="15", name="Ordures ménagères")]
+    mock_client.get_collection_types = AsyncMock(return_value=types)
+    store = EcocitoYearStore()
+    store.set(
+        collection_store_key("15"),
+        datetime.now(tz=UTC).year,
+        [_make_event("12 rue de la Paix"), _make_event("3 avenue Foch")],
+        final=False,
+    )
+    on_change = AsyncMock()
+
+    coordinator = CollectionTypesDataUpdateCoordinator(
+        hass,
+        mock_client,
+        frozenset(["15"]),
+        known_addresses=frozenset(["12 rue de la Paix"]),
+        year_store=store,
+        on_change=on_change,
+    )
+    coordinator.config_entry = MockConfigEntry(domain=DOMAIN)
+    await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_client.get_addresses.assert_not_awaited()
+    on_change.assert_awaited_once_with(types, ["12 rue de la Paix", "3 avenue Foch"])
+
+
+async def test_collection_types_coordinator_new_address(
+    hass: object, mock_client: MagicMock
+) -> None:
+    """A new address is reported even if the types are unchanged."""
+    types = [CollectionType(id="15", name="Ordures ménagères")]
+    mock_client.get_collection_types = AsyncMock(return_value=types)
+    mock_client.get_addresses = AsyncMock(
+        return_value=["12 rue de la Paix", "3 avenue Foch"]
+    )
+    on_change = AsyncMock()
+
+    coordinator = CollectionTypesDataUpdateCoordinator(
+        hass,
+        mock_client,
+        frozenset(["15"]),
+        known_addresses=frozenset(["12 rue de la Paix"]),
+        on_change=on_change,
+    )
+    coordinator.config_entry = MockConfigEntry(domain=DOMAIN)
+    await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    on_change.assert_awaited_once_with(types, ["12 rue de la Paix", "3 avenue Foch"])
@@ -0,0 +1,56 @@
+"""Tests for the Ecocito diagnostics."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ecocito.client import CollectionType
+from custom_components.ecocito.const import (
+    CONF_HISTORY_YEARS,
+    CONF_TRACKED_TYPES,
+    DOMAIN,
+)
+from custom_components.ecocito.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics_redact_account_details(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """Credentials and the tracked addresses are not published."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_DOMAIN: "test.ecocito.com",
+            CONF_USERNAME: "user@test.com",
+            CONF_PASSWORD: "password123",
+        },
+        options={
+            CONF_HISTORY_YEARS: 0,
+            CONF_TRACKED_TYPES: {"1 rue A": ["15"], "2 rue B": []},
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_USERNAME] == REDACTED
+    assert diagnostics["entry"]["data"][CONF_PASSWORD] == REDACTED
+    assert diagnostics["entry"]["options"] == {
+        CONF_HISTORY_YEARS: 0,
+        CONF_TRACKED_TYPES: {f"{REDACTED}_1": ["15"], f"{REDACTED}_2": []},
+    }
+    assert "1 rue A" not in str(diagnostics)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,80 @@
+"""
+Import regression tests of the integration.
+
+Runs ``python -X importtime`` in a fresh interpreter, with Home Assistant and
+aiohttp already imported, so that only the integration itself and the extra
+modules it pulls in are looked at. ``tests/benchmarks/test_import_benchmarks.py``
+holds the import time to a tighter budget.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import subprocess
+import sys
+
+IMPORTED_MODULE = "custom_components.ecocito.sensor"
+
+_ROOT = pathlib.Path(__file__).parents[1]
+_PRELOAD = (
+    "aiohttp",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+)
+# Modules that must only be imported on the code paths that need them.
+_LAZY = ("bs4",)
+# Generous, so that only an eagerly imported heavy dependency fails it.
+_LIMIT_MS = 2000
+_MARKER = "-- ecocito --"
+
+
+def import_times() -> dict[str, tuple[int, int, int]]:
+    """
+    Return the modules imported by the integration.
+
+    Values are the nesting level, and the self and cumulative import times in
+    microseconds.
+    """
+    code = "; ".join(
+        [
+            *(f"import {module}" for module in _PRELOAD),
+            f"import sys; sys.stderr.write('{_MARKER}\\n')",
+            f"import {IMPORTED_MODULE}",
+        ]
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    _, _, output = result.stderr.partition(f"{_MARKER}\n")
+    times: dict[str, tuple[int, int, int]] = {}
+    for line in output.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2][1:].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = (level, int(fields[0]), int(fields[1]))
+    return times
+
+
+def cumulative_ms(times: dict[str, tuple[int, int, int]]) -> float:
+    """Return the import time of the statement, in milliseconds."""
+    # Top-level entries are the modules imported directly by the statement.
+    return (
+        sum(cumulative for level, _, cumulative in times.values() if level == 0) / 1000
+    )
+
+
+def test_lazy_imports() -> None:
+    """Optional dependencies are only imported when needed."""
+    times = import_times()
+
+    assert IMPORTED_MODULE in times
+    for module in _LAZY:
+        assert module not in times, f"{module} is imported eagerly"
+    assert cumulative_ms(times) < _LIMIT_MS
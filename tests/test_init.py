@@ -0,0 +1,492 @@
+"""Tests for the Ecocito integration setup."""
+
+from __future__ import annotations
+
+import pathlib
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_DOMAIN,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STARTED,
+)
+from homeassistant.core import CoreState
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.ecocito.client import CollectionEvent, CollectionType
+from custom_components.ecocito.const import (
+    CONF_HISTORY_YEARS,
+    CONF_TRACE_REQUESTS,
+    CONF_TRACKED_TYPES,
+    CONF_TYPE_HISTORY_YEARS,
+    DATA_POOLS,
+    DOMAIN,
+    EVENT_COLLECTION_ANOMALY,
+    SESSION_SAVE_DELAY,
+)
+from custom_components.ecocito.session import async_stash_flow_session
+
+_ENTRY_DATA = {
+    CONF_DOMAIN: "test.ecocito.com",
+    CONF_USERNAME: "user@test.com",
+    CONF_PASSWORD: "password123",
+}
+
+
+def _sensor_keys(hass: object, entry: MockConfigEntry) -> set[str]:
+    """Return the description keys of the registered sensors."""
+    return {
+        entity.unique_id.split("_", maxsplit=2)[2]
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+    }
+
+
+def _collection_type_ids(hass: object, entry: MockConfigEntry) -> set[str]:
+    """Return the collection type ids that have a count sensor."""
+    return {
+        key.removeprefix("collection_count_")
+        for key in _sensor_keys(hass, entry)
+        if key.startswith("collection_count_")
+    }
+
+
+async def test_collection_types_applied_incrementally(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """New types get sensors and vanished ones lose theirs, without a reload."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 0}
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert _collection_type_ids(hass, entry) == {"15", "16"}
+        (address_data,) = entry.runtime_data.addresses
+        kept = address_data.coordinators[0].collection_types["15"]
+
+        mock_client.get_collection_types = AsyncMock(
+            return_value=[
+                sample_collection_types[0],
+                CollectionType(id="17", name="Déchets verts"),
+            ]
+        )
+        await entry.runtime_data.collection_types_coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert _collection_type_ids(hass, entry) == {"15", "17"}
+    assert address_data.coordinators[0].collection_types["15"] is kept
+    assert set(address_data.coordinators[0].collection_types) == {"15", "17"}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_history_loaded_after_start(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """Only the current year is fetched at setup, previous years after start."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 2}
+    )
+    entry.add_to_hass(hass)
+    hass.set_state(CoreState.starting)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        years = {call.args[1] for call in mock_client.get_collection_events.mock_calls}
+        assert len(years) == 1
+        assert len(mock_client.get_waste_depot_visits.mock_calls) == 1
+        assert not any(
+            key.endswith(("_n1", "_n2")) for key in _sensor_keys(hass, entry)
+        )
+
+        hass.set_state(CoreState.running)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    (year,) = {call.args[1] for call in mock_client.get_collection_events.mock_calls}
+    # The previous years are fetched in one request per type.
+    assert sorted(
+        call.args for call in mock_client.get_collection_events_by_year.await_args_list
+    ) == [("15", year - 2, year - 1), ("16", year - 2, year - 1)]
+    mock_client.get_waste_depot_visits_by_year.assert_awaited_once_with(
+        year - 2, year - 1
+    )
+    assert {"collection_count_15_n2", "waste_deposit_visit_n1"} <= _sensor_keys(
+        hass, entry
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_addresses_found_in_the_first_fetch(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """The events read to find the addresses serve the first refresh."""
+    year = dt_util.now().year
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=lambda type_id, _year: [
+            CollectionEvent(
+                date=dt_util.now(), location=location, type=type_id, quantity=1.0
+            )
+            for location in ("2 rue B", "1 rue A")
+        ]
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 0}
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert [data.location for data in entry.runtime_data.addresses] == [
+        "1 rue A",
+        "2 rue B",
+    ]
+    assert sorted(
+        call.args for call in mock_client.get_collection_events.await_args_list
+    ) == [("15", year), ("16", year)]
+    mock_client.get_addresses.assert_not_awaited()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("naive", [False, True], ids=["aware", "naive"])
+async def test_rolling_window_sensors(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+    naive: bool,
+) -> None:
+    """Rolling sensors sum the events of the window, across years."""
+    # The API returns naive local dates.
+    now = dt_util.now().replace(tzinfo=None) if naive else dt_util.now()
+    events = [
+        CollectionEvent(
+            date=now - timedelta(days=days_ago),
+            location="12 rue de la Paix",
+            type="15",
+            quantity=quantity,
+        )
+        for days_ago, quantity in ((5, 10.0), (200, 20.0), (400, 40.0))
+    ]
+    mock_client.get_collection_types = AsyncMock(
+        return_value=sample_collection_types[:1]
+    )
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=lambda _type_id, year: [e for e in events if e.date.year == year]
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 1}
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    registry = er.async_get(hass)
+
+    def _state(key: str) -> float:
+        entity_id = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{DOMAIN}_{entry.entry_id}_{key}".lower()
+        )
+        return float(hass.states.get(entity_id).state)
+
+    # Events within a year are at most in the previous year, which is tracked.
+    assert _state("rolling_count_15_30d") == 1
+    assert _state("rolling_total_15_30d") == 10.0
+    assert _state("rolling_count_15_12m") == 2
+    assert _state("rolling_total_15_12m") == 30.0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_collection_anomaly(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """A new collection far from the usual weights is reported once."""
+    now = dt_util.now()
+    events = [
+        CollectionEvent(
+            date=now - timedelta(days=7 * week),
+            location="12 rue de la Paix",
+            type="15",
+            quantity=quantity,
+        )
+        for week, quantity in enumerate((10.0, 12.0, 11.0, 9.0) * 3, start=1)
+    ]
+    mock_client.get_collection_types = AsyncMock(
+        return_value=sample_collection_types[:1]
+    )
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=lambda _type_id, year: [e for e in events if e.date.year == year]
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 1}
+    )
+    entry.add_to_hass(hass)
+    anomalies = async_capture_events(hass, EVENT_COLLECTION_ANOMALY)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        # Two collections at the same time, both new.
+        events.extend(
+            CollectionEvent(
+                date=now, location="12 rue de la Paix", type="15", quantity=quantity
+            )
+            for quantity in (11.0, 60.0)
+        )
+        (address_data,) = entry.runtime_data.addresses
+        for year_coords in address_data.coordinators:
+            await year_coords.collection_types["15"].async_refresh()
+        await hass.async_block_till_done()
+
+    assert [event.data["weight"] for event in anomalies] == [60.0]
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{DOMAIN}_{entry.entry_id}_collection_anomaly_15".lower()
+    )
+    state = hass.states.get(entity_id)
+    assert float(state.state) > 3
+    assert state.attributes["samples"] == 14
+    assert state.attributes["anomaly"] is True
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_only_tracked_collections_are_polled(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """Coordinators exist only for the tracked addresses, types and years."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=_ENTRY_DATA,
+        options={
+            CONF_HISTORY_YEARS: 2,
+            CONF_TRACKED_TYPES: {"1 rue A": ["15", "16"], "2 rue B": []},
+            CONF_TYPE_HISTORY_YEARS: {"15": 1, "16": 0},
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    mock_client.get_addresses.assert_not_awaited()
+    (address_data,) = entry.runtime_data.addresses
+    assert address_data.location == "1 rue A"
+    assert not address_data.single_address
+    assert [
+        (year_coords.year_offset, set(year_coords.collection_types))
+        for year_coords in address_data.coordinators
+    ] == [(0, {"15", "16"}), (-1, {"15"}), (-2, set())]
+    # Type 16 is only tracked for the current year.
+    assert all(
+        call.args[0] == "15" or call.args[1] == dt_util.now().year
+        for call in mock_client.get_collection_events.await_args_list
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_untracked_collection_type_vanishes(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """A vanished type is dropped from the years it was tracked for only."""
+    mock_client.get_collection_types = AsyncMock(return_value=sample_collection_types)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=_ENTRY_DATA,
+        options={
+            CONF_HISTORY_YEARS: 1,
+            CONF_TRACKED_TYPES: {"1 rue A": ["15", "16"]},
+            CONF_TYPE_HISTORY_YEARS: {"16": 0},
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert _collection_type_ids(hass, entry) == {"15", "16"}
+
+        mock_client.get_collection_types = AsyncMock(
+            return_value=sample_collection_types[:1]
+        )
+        await entry.runtime_data.collection_types_coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert _collection_type_ids(hass, entry) == {"15"}
+    (address_data,) = entry.runtime_data.addresses
+    assert [
+        set(year_coords.collection_types) for year_coords in address_data.coordinators
+    ] == [{"15"}, {"15"}]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_accounts_of_a_domain_share_a_pool(
+    hass: object, enable_custom_integrations: None, mock_client: MagicMock
+) -> None:
+    """Entries of the same domain share one pool, closed with the last one."""
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data=_ENTRY_DATA),
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={**_ENTRY_DATA, CONF_DOMAIN: "test", CONF_USERNAME: "other@test.com"},
+        ),
+    ]
+    with patch(
+        "custom_components.ecocito.EcocitoClient", return_value=mock_client
+    ) as client_class:
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert [entry.unique_id for entry in entries] == [
+        "test_user@test.com",
+        "test_other@test.com",
+    ]
+    pool = hass.data[DOMAIN][DATA_POOLS]["test"]
+    assert pool.users == 2
+    first, second = client_class.call_args_list
+    assert first.kwargs["connector"] is second.kwargs["connector"] is pool.connector
+    assert first.kwargs["circuit_breaker"] is second.kwargs["circuit_breaker"]
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    assert pool.users == 1
+    assert not pool.connector.closed
+    assert await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert "test" not in hass.data[DOMAIN][DATA_POOLS]
+    assert pool.connector.closed
+
+
+async def test_trace_requests_option(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Requests are traced to a file only when the option is enabled."""
+    hass.config.config_dir = str(tmp_path)
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data=_ENTRY_DATA),
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={**_ENTRY_DATA, CONF_USERNAME: "other@test.com"},
+            options={CONF_TRACE_REQUESTS: True},
+        ),
+    ]
+    with patch(
+        "custom_components.ecocito.EcocitoClient", return_value=mock_client
+    ) as client_class:
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    untraced, traced = client_class.call_args_list
+    assert untraced.kwargs["tracer"] is None
+    tracer = traced.kwargs["tracer"]
+    assert tracer.trace_file is not None
+    assert (tmp_path / DOMAIN / f"trace_{entries[1].entry_id}.jsonl").exists()
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_session_reused_across_setups(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    hass_storage: dict[str, Any],
+) -> None:
+    """The session of the config flow, then the saved one, replaces the login."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, unique_id="test_user@test.com"
+    )
+    entry.add_to_hass(hass)
+    flow_cookies = [{"name": "session", "value": "flow", "path": "/"}]
+    async_stash_flow_session(hass, entry.unique_id, flow_cookies)
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        mock_client.authenticate.assert_not_awaited()
+        mock_client.load_cookies.assert_called_once_with(flow_cookies)
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SESSION_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+        key = f"{DOMAIN}.{entry.entry_id}.session"
+        assert hass_storage[key]["data"] == flow_cookies
+
+        # A new login is saved, and reused on the next setup.
+        mock_client.on_authenticated()
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        mock_client.authenticate.assert_not_awaited()
+        mock_client.load_cookies.assert_called_with(
+            mock_client.export_cookies.return_value
+        )
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
@@ -0,0 +1,125 @@
+"""Tests for the Ecocito command-line client."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+
+import pytest
+
+from custom_components.ecocito.__main__ import STRATEGIES, _parser, _run, main
+from tests.fake_ecocito import (
+    FAKE_PASSWORD,
+    FAKE_USERNAME,
+    FakeAccount,
+    FakeEcocitoServer,
+)
+
+# The fake Ecocito server listens on a local socket.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _command(
+    capsys: pytest.CaptureFixture[str], server: FakeEcocitoServer, *argv: str
+) -> object:
+    args = _parser().parse_args(
+        [
+            "--base-url",
+            server.url,
+            "--username",
+            FAKE_USERNAME,
+            "--password",
+            FAKE_PASSWORD,
+            *argv,
+        ]
+    )
+    await _run(args)
+    return json.loads(capsys.readouterr().out)
+
+
+async def test_commands(
+    capsys: pytest.CaptureFixture[str], tmp_path: pathlib.Path
+) -> None:
+    """Data commands print JSON, also from a recorded cassette."""
+    server = FakeEcocitoServer(FakeAccount(addresses=2))
+    await server.start()
+    year = server.current_year
+    cassette = str(tmp_path / "cassette.json")
+    try:
+        types = await _command(capsys, server, "types")
+        addresses = await _command(capsys, server, "addresses", "--year", str(year))
+        events = await _command(
+            capsys,
+            server,
+            "--record",
+            cassette,
+            "events",
+            "--type",
+            "15",
+            "--start",
+            f"{year - 1}-01-01",
+            "--end",
+            f"{year}-12-31",
+        )
+    finally:
+        await server.stop()
+
+    assert types == [
+        {"id": "15", "name": "Ordures ménagères"},
+        {"id": "16", "name": "Recyclage"},
+    ]
+    assert addresses == server.account.address_labels
+    assert len(events) == 2 * 2 * server.account.rows
+    assert {event["type"] for event in events} == {"15"}
+
+    replayed = await _command(
+        capsys,
+        server,
+        "--replay",
+        cassette,
+        "--time-scale",
+        "0",
+        "events",
+        "--type",
+        "15",
+        "--start",
+        f"{year - 1}-01-01",
+        "--end",
+        f"{year}-12-31",
+    )
+    assert len(replayed) == len(events)
+
+
+async def test_bench(capsys: pytest.CaptureFixture[str]) -> None:
+    """Every strategy fetches the same events, bulk with one request per type."""
+    server = FakeEcocitoServer(FakeAccount(types=2, years=3))
+    await server.start()
+    try:
+        results = await _command(
+            capsys,
+            server,
+            "bench",
+            "--year",
+            str(server.current_year),
+            "--years",
+            "3",
+            "--rounds",
+            "2",
+        )
+    finally:
+        await server.stop()
+
+    assert results["types"] == 2
+    assert results["years"] == 3
+    for name in STRATEGIES:
+        assert results[name]["events"] == 2 * 3 * server.account.rows
+    assert results["sequential"]["requests"] == 6
+    assert results["concurrent"]["requests"] == 6
+    assert results["bulk"]["requests"] == 2
+
+
+def test_server_required(capsys: pytest.CaptureFixture[str]) -> None:
+    """A domain or a server URL is required."""
+    with pytest.raises(SystemExit):
+        main(["login"])
+    assert "--domain" in capsys.readouterr().err
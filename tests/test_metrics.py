@@ -0,0 +1,50 @@
+"""Tests for the Ecocito client metrics."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.ecocito.metrics import EcocitoMetrics
+
+
+def test_request_metrics_window() -> None:
+    """Requests older than one hour are dropped from the count and average."""
+    metrics = EcocitoMetrics()
+    with patch("custom_components.ecocito.metrics.time.monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        metrics.record_request(0.2)
+        monotonic.return_value = 4000.0
+        metrics.record_request(0.4)
+        assert metrics.requests_last_hour == 2
+        assert metrics.average_response_time == pytest.approx(0.3)
+
+        monotonic.return_value = 4700.0
+        assert metrics.requests_last_hour == 1
+        assert metrics.average_response_time == pytest.approx(0.4)
+
+
+def test_average_response_time_empty() -> None:
+    """No request recorded → no average."""
+    assert EcocitoMetrics().average_response_time is None
+
+
+def test_poll_metrics_and_listeners() -> None:
+    """Failures are counted until a successful poll; listeners are notified."""
+    metrics = EcocitoMetrics()
+    listener = MagicMock()
+    remove = metrics.async_add_listener(listener)
+
+    metrics.record_poll(1.5, success=False)
+    metrics.record_poll(2.5, success=False)
+    assert metrics.consecutive_failures == 2
+    assert metrics.last_poll_duration == 2.5
+
+    metrics.record_poll(0.5, success=True)
+    assert metrics.consecutive_failures == 0
+    assert listener.call_count == 3
+
+    remove()
+    metrics.record_poll(0.5, success=True)
+    assert listener.call_count == 3
@@ -0,0 +1,61 @@
+"""Tests for the incremental Ecocito HTML extractors."""
+
+from __future__ import annotations
+
+import pathlib
+
+from custom_components.ecocito.parsers import CollectionTypeSelectParser
+
+COLLECTION_PAGE = (
+    pathlib.Path(__file__).parent / "fixtures" / "collection_page.html"
+).read_text(encoding="utf-8")
+
+
+def test_collection_type_select_from_captured_page() -> None:
+    """Options are extracted with entities decoded, whatever the chunk size."""
+    for chunk_size in (1, 7, 8192):
+        parser = CollectionTypeSelectParser()
+        for start in range(0, len(COLLECTION_PAGE), chunk_size):
+            parser.feed(COLLECTION_PAGE[start : start + chunk_size])
+            if parser.done:
+                break
+
+        assert parser.found
+        assert not parser.login_form
+        assert parser.options[:3] == [
+            ("-1", "Tous les types de déchets"),
+            ("15", "Ordures ménagères"),
+            ("16", "Collecte sélective"),
+        ]
+        assert len(parser.options) == 8
+        # The address selector comes first and is ignored.
+        assert parser.selects == [
+            ("Filtres_IdAdresse", "Filtres.IdAdresse"),
+            ("Filtres_IdMatiere", "Filtres.IdMatiere"),
+        ]
+        # Parsing stopped at the end of the selector, before the results grid.
+        assert start < COLLECTION_PAGE.index("gridCollectes")
+
+
+def test_collection_type_select_unclosed_options() -> None:
+    """Options without a closing tag end at the next option."""
+    parser = CollectionTypeSelectParser()
+    parser.feed(
+        '<select name="Filtres.IdMatiere">'
+        '<option value="15">Ordures <b>ménagères</b>'
+        "<option value=16>Recyclage"
+        "</select>"
+    )
+
+    assert parser.done
+    assert parser.options == [("15", "Ordures ménagères"), ("16", "Recyclage")]
+
+
+def test_collection_type_select_login_form() -> None:
+    """A login form means the session has expired."""
+    parser = CollectionTypeSelectParser()
+    parser.feed('<html><body><form action="/Usager/Profil/Connexion" method="post">')
+
+    assert parser.done
+    assert parser.login_form
+    assert not parser.found
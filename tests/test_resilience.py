@@ -0,0 +1,100 @@
+"""Tests for the Ecocito rate limiter and retry policies."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.ecocito.errors import CircuitOpenError
+from custom_components.ecocito.resilience import (
+    BackoffPolicy,
+    CircuitBreaker,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+async def test_token_bucket_waits_when_empty() -> None:
+    """The burst is served immediately, then callers wait for a refill."""
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+    with patch(
+        "custom_components.ecocito.resilience.asyncio.sleep", AsyncMock()
+    ) as sleep:
+        await bucket.acquire()
+        await bucket.acquire()
+        sleep.assert_not_called()
+
+        with patch(
+            "custom_components.ecocito.resilience.time.monotonic",
+            side_effect=[bucket._updated, bucket._updated + 0.5],
+        ):
+            await bucket.acquire()
+    sleep.assert_awaited_once_with(pytest.approx(0.5, abs=0.01))
+
+
+def test_backoff_policy_exponential_with_jitter() -> None:
+    """Delays grow exponentially, stay within [ceiling / 2, ceiling]."""
+    policy = BackoffPolicy(retries=3, base=1.0, maximum=3.0)
+    assert 0.5 <= policy.delay(0, None) <= 1.0
+    assert 1.0 <= policy.delay(1, None) <= 2.0
+    assert 1.5 <= policy.delay(2, None) <= 3.0
+    assert policy.delay(3, None) is None
+
+
+def test_backoff_policy_honors_retry_after() -> None:
+    """Retry-After is used as is, and gives up beyond the maximum."""
+    policy = BackoffPolicy(maximum=30.0)
+    assert policy.delay(0, 12.0) == 12.0
+    assert policy.delay(0, 120.0) is None
+
+
+def test_parse_retry_after() -> None:
+    """Both delta-seconds and HTTP-date forms are supported."""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(UTC) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(retry_at, usegmt=True)) == (
+        pytest.approx(30, abs=2)
+    )
+
+
+def test_circuit_breaker_opens_and_probes() -> None:
+    """Open after N failures, fail fast, then let a single probe through."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    with patch("custom_components.ecocito.resilience.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        monotonic.return_value = 160.0
+        assert breaker.state == "half_open"
+        breaker.before_request()
+        # Concurrent requests keep failing fast while the probe is in flight.
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        breaker.before_request()
+
+
+def test_circuit_breaker_failed_probe_stays_open() -> None:
+    """A failed probe keeps the circuit open for another reset timeout."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    with patch("custom_components.ecocito.resilience.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        breaker.record_failure()
+        monotonic.return_value = 170.0
+        breaker.before_request()
+        breaker.record_failure()
+        monotonic.return_value = 200.0
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
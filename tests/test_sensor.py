@@ -0,0 +1,87 @@
+"""Tests for the Ecocito sensor descriptions."""
+
+from __future__ import annotations
+
+from custom_components.ecocito._english_names import ENGLISH_SENSOR_NAMES
+from custom_components.ecocito.client import CollectionType
+from custom_components.ecocito.const import COLLECTION_TYPE_DEFAULT_HINT
+from custom_components.ecocito.sensor import (
+    _build_collection_type_sensor_descriptions,
+    _build_rolling_sensor_descriptions,
+    _build_waste_depot_sensor_descriptions,
+    _resolve_collection_type_hint,
+)
+from script.generate_english_names import OUTPUT, english_sensor_names, render
+
+
+def test_resolve_collection_type_hint() -> None:
+    """Known names match their hint case-insensitively; others fall back."""
+    assert _resolve_collection_type_hint("ORDURES MÉNAGÈRES").translation_key == (
+        "garbage"
+    )
+    assert _resolve_collection_type_hint("Tri sélectif").translation_key == (
+        "recycling"
+    )
+    assert _resolve_collection_type_hint("Encombrants") is COLLECTION_TYPE_DEFAULT_HINT
+
+
+def test_collection_type_descriptions_are_shared() -> None:
+    """The same type and year offset yields the same description objects."""
+    first = _build_collection_type_sensor_descriptions(
+        CollectionType(id="15", name="Ordures ménagères"), 0
+    )
+    second = _build_collection_type_sensor_descriptions(
+        CollectionType(id="15", name="Ordures ménagères"), 0
+    )
+    history = _build_collection_type_sensor_descriptions(
+        CollectionType(id="15", name="Ordures ménagères"), -1
+    )
+
+    assert first is second
+    assert [description.key for description in first] == [
+        "collection_count_15",
+        "collection_total_15",
+        "latest_collection_15",
+    ]
+    assert [description.key for description in history] == [
+        "collection_count_15_n1",
+        "collection_total_15_n1",
+    ]
+
+
+def test_generic_type_descriptions_use_type_placeholder() -> None:
+    """Unknown types use the generic translation key with the raw name."""
+    (count, *_) = _build_collection_type_sensor_descriptions(
+        CollectionType(id="42", name="Encombrants"), -2
+    )
+
+    assert count.translation_key == "collection_count_n"
+    assert count.translation_placeholders == {"type": "Encombrants", "n": "2"}
+
+
+def test_rolling_sensor_descriptions() -> None:
+    """Each window has a count and a weight sensor, named in English."""
+    descriptions = _build_rolling_sensor_descriptions("15", "Ordures ménagères")
+
+    assert [description.key for description in descriptions] == [
+        "rolling_count_15_30d",
+        "rolling_total_15_30d",
+        "rolling_count_15_12m",
+        "rolling_total_15_12m",
+    ]
+    assert descriptions[0].english_name == (
+        "Number of garbage collections (last 30 days)"
+    )
+
+
+def test_waste_depot_descriptions_are_shared() -> None:
+    """Waste depot descriptions are memoized per year offset."""
+    assert _build_waste_depot_sensor_descriptions(
+        -1
+    ) is _build_waste_depot_sensor_descriptions(-1)
+
+
+def test_english_names_are_generated_from_strings() -> None:
+    """_english_names.py is up to date: run script/generate otherwise."""
+    assert english_sensor_names() == ENGLISH_SENSOR_NAMES
+    assert OUTPUT.read_text(encoding="utf-8") == render()
@@ -0,0 +1,300 @@
+"""Tests for the Ecocito services."""
+
+from __future__ import annotations
+
+import csv
+import json
+import pathlib
+import pstats
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_DOMAIN, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ecocito.client import (
+    CollectionEvent,
+    CollectionType,
+    WasteDepotVisit,
+)
+from custom_components.ecocito.const import CONF_HISTORY_YEARS, DOMAIN
+from custom_components.ecocito.services import (
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_GET_EVENTS,
+    SERVICE_PROFILE_REFRESH,
+)
+
+_ENTRY_DATA = {
+    CONF_DOMAIN: "test.ecocito.com",
+    CONF_USERNAME: "user@test.com",
+    CONF_PASSWORD: "password123",
+}
+_ADDRESS = "12 rue de la Paix"
+_OTHER_ADDRESS = "1 place du Marché"
+
+
+def _event(year: int, month: int, type_id: str, location: str = _ADDRESS) -> object:
+    return CollectionEvent(
+        date=datetime(year, month, 1, tzinfo=UTC),
+        location=location,
+        type=type_id,
+        quantity=10.0,
+    )
+
+
+async def _setup(
+    hass: object, mock_client: MagicMock, types: list[CollectionType]
+) -> MockConfigEntry:
+    """Set up an entry tracking two addresses and the current year only."""
+    year = datetime.now(tz=UTC).year
+    mock_client.get_collection_types = AsyncMock(return_value=types)
+    mock_client.get_collection_events = AsyncMock(
+        side_effect=lambda type_id, _year: [
+            _event(year, 1, type_id),
+            _event(year, 2, type_id, _OTHER_ADDRESS),
+        ]
+    )
+    mock_client.get_waste_depot_visits = AsyncMock(
+        return_value=[WasteDepotVisit(date=datetime(year, 3, 1, tzinfo=UTC))]
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=_ENTRY_DATA, options={CONF_HISTORY_YEARS: 0}
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.ecocito.EcocitoClient", return_value=mock_client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_export_history(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Cached years are reused, others are streamed page by page."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await _setup(hass, mock_client, sample_collection_types)
+    year = datetime.now(tz=UTC).year
+    pages = []
+
+    async def iter_collection_events(
+        type_id: str, start: date, end: date
+    ) -> AsyncIterator[list[CollectionEvent]]:
+        pages.append((type_id, start, end))
+        yield [_event(year - 1, 11, type_id)]
+        yield [_event(year - 1, 12, type_id), _event(year - 1, 12, type_id, "x")]
+
+    async def iter_waste_depot_visits(
+        start: date, end: date
+    ) -> AsyncIterator[list[WasteDepotVisit]]:
+        yield []
+
+    mock_client.iter_collection_events = iter_collection_events
+    mock_client.iter_waste_depot_visits = iter_waste_depot_visits
+    mock_client.get_collection_events.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {
+            "config_entry_id": entry.entry_id,
+            "start": f"{year - 1}-11-01",
+            "end": f"{year}-12-31",
+            "filename": "../export.csv",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    path = tmp_path / "ecocito" / "export.csv"
+    assert response == {"path": str(path), "rows": 9}
+    assert mock_client.get_collection_events.mock_calls == []
+    assert pages == [
+        ("15", date(year - 1, 11, 1), date(year - 1, 12, 31)),
+        ("16", date(year - 1, 11, 1), date(year - 1, 12, 31)),
+    ]
+    with path.open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["kind"], row["type_id"], row["date"][:7]) for row in rows] == [
+        ("collection", "15", f"{year - 1}-11"),
+        ("collection", "15", f"{year - 1}-12"),
+        ("collection", "16", f"{year - 1}-11"),
+        ("collection", "16", f"{year - 1}-12"),
+        ("collection", "15", f"{year}-01"),
+        ("collection", "15", f"{year}-02"),
+        ("collection", "16", f"{year}-01"),
+        ("collection", "16", f"{year}-02"),
+        ("waste_depot", "", f"{year}-03"),
+    ]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_export_history_jsonl_addresses(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Only the requested addresses and dates are exported."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await _setup(hass, mock_client, sample_collection_types[:1])
+    year = datetime.now(tz=UTC).year
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {
+            "config_entry_id": entry.entry_id,
+            "start": f"{year}-01-01",
+            "end": f"{year}-01-31",
+            "addresses": [_OTHER_ADDRESS, _ADDRESS],
+            "format": "jsonl",
+            "filename": "export.jsonl",
+        },
+        blocking=True,
+    )
+
+    lines = (tmp_path / "ecocito" / "export.jsonl").read_text("utf-8").splitlines()
+    assert [json.loads(line)["location"] for line in lines] == [_ADDRESS]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_export_history_invalid_range(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    tmp_path: pathlib.Path,
+) -> None:
+    """A start date after the end date is rejected."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await _setup(hass, mock_client, [])
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_EXPORT_HISTORY,
+            {
+                "config_entry_id": entry.entry_id,
+                "start": "2024-02-01",
+                "end": "2024-01-01",
+            },
+            blocking=True,
+        )
+    assert not (tmp_path / "ecocito").exists()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_get_events(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+) -> None:
+    """Untracked years are fetched, the current one is answered from cache."""
+    entry = await _setup(hass, mock_client, sample_collection_types)
+    year = datetime.now(tz=UTC).year
+    ranges = []
+
+    async def iter_collection_events(
+        type_id: str, start: date, end: date
+    ) -> AsyncIterator[list[CollectionEvent]]:
+        ranges.append((type_id, start, end))
+        yield [_event(start.year, 12, type_id)]
+
+    mock_client.iter_collection_events = iter_collection_events
+    mock_client.get_collection_events.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_EVENTS,
+        {
+            "config_entry_id": entry.entry_id,
+            "start": f"{year - 5}-06-01",
+            "end": f"{year}-01-31",
+            "type": "16",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert [(event["type_id"], event["date"][:7]) for event in response["events"]] == [
+        ("16", f"{y}-12") for y in range(year - 5, year)
+    ] + [("16", f"{year}-01")]
+    assert sorted(ranges) == [
+        ("16", date(y, 6, 1) if y == year - 5 else date(y, 1, 1), date(y, 12, 31))
+        for y in range(year - 5, year)
+    ]
+    assert mock_client.get_collection_events.mock_calls == []
+    assert len(entry.runtime_data.waste_depot) == 1
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_EVENTS,
+            {
+                "config_entry_id": entry.entry_id,
+                "start": f"{year}-01-01",
+                "end": f"{year}-01-31",
+                "type": "99",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_profile_refresh(
+    hass: object,
+    enable_custom_integrations: None,
+    mock_client: MagicMock,
+    sample_collection_types: list[CollectionType],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Every data coordinator is refreshed under the profiler."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await _setup(hass, mock_client, sample_collection_types)
+    mock_client.get_collection_events.reset_mock()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        {"config_entry_id": entry.entry_id, "memory": True, "top": 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["coordinators"] == 5
+    mock_client.get_collection_types.assert_awaited_once()
+    # The coordinators of both addresses share the fetch of each type.
+    assert len(mock_client.get_collection_events.mock_calls) == 2
+    assert pstats.Stats(response["pstats"]).total_calls > 0
+    lines = pathlib.Path(response["allocations"]).read_text("utf-8").splitlines()
+    assert lines[0].startswith("Top 5 of ")
+    assert 0 < len(lines[2:]) <= 5
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        {"config_entry_id": entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["allocations"] is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,69 @@
+"""Tests for the Ecocito request tracing."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+
+import pytest
+
+from custom_components.ecocito.client import EcocitoClient
+from custom_components.ecocito.const import (
+    ECOCITO_COLLECTION_URI,
+    ECOCITO_LOGIN_URI,
+)
+from custom_components.ecocito.tracing import PHASES, RequestTracer, TraceFile
+from tests.fake_ecocito import (
+    FAKE_PASSWORD,
+    FAKE_USERNAME,
+    FakeEcocitoServer,
+)
+
+# The fake Ecocito server listens on a local socket.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def test_request_timings(tmp_path: pathlib.Path) -> None:
+    """Every request is timed per phase, aggregated and written to the file."""
+    server = FakeEcocitoServer(rate_limit=1000, latency=0.01)
+    await server.start()
+    trace_file = TraceFile(tmp_path / "trace.jsonl")
+    tracer = RequestTracer(trace_file)
+    client = EcocitoClient(
+        "test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url, tracer=tracer
+    )
+    try:
+        await client.authenticate()
+        await client.get_collection_events("0", server.current_year)
+    finally:
+        await server.stop()
+        trace_file.close()
+
+    timings = tracer.as_dict()
+    assert set(timings) == {ECOCITO_LOGIN_URI, ECOCITO_COLLECTION_URI}
+    collection = timings[ECOCITO_COLLECTION_URI]
+    assert collection["count"] >= 1
+    assert collection["errors"] == 0
+    assert set(collection["average"]) == set(PHASES)
+    assert collection["average"]["server"] >= 10
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "trace.jsonl").read_text("utf-8").splitlines()
+    ]
+    assert records[0]["endpoint"] == ECOCITO_LOGIN_URI
+    assert len(records) == sum(timing["count"] for timing in timings.values())
+    assert all(record["status"] == 200 for record in records)
+
+
+async def test_client_without_tracer() -> None:
+    """Requests are not traced unless a tracer is given."""
+    server = FakeEcocitoServer()
+    await server.start()
+    client = EcocitoClient("test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url)
+    try:
+        await client.authenticate()
+    finally:
+        await server.stop()
+
+    assert client.tracer is None
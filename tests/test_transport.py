@@ -0,0 +1,98 @@
+"""Tests for the Ecocito record/replay transport."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import time
+
+import pytest
+
+from custom_components.ecocito.client import EcocitoClient
+from custom_components.ecocito.errors import CannotConnectError
+from custom_components.ecocito.transport import CassettePlayer, CassetteRecorder
+from tests.fake_ecocito import (
+    FAKE_PASSWORD,
+    FAKE_USERNAME,
+    FakeAccount,
+    FakeEcocitoServer,
+)
+
+# The fake Ecocito server listens on a local socket.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _poll(client: EcocitoClient, year: int) -> tuple[list, list, list]:
+    await client.authenticate()
+    types = await client.get_collection_types()
+    addresses = await client.get_addresses(year, types)
+    visits = await client.get_waste_depot_visits(year)
+    return types, addresses, visits
+
+
+async def test_record_and_replay(tmp_path: pathlib.Path) -> None:
+    """A recorded poll is replayed offline, sanitized, with the same results."""
+    server = FakeEcocitoServer(FakeAccount(addresses=2), latency=0.02)
+    await server.start()
+    recorder = CassetteRecorder(redact=[FAKE_USERNAME, FAKE_PASSWORD])
+    client = EcocitoClient(
+        "test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url, transport=recorder
+    )
+    try:
+        recorded = await _poll(client, server.current_year)
+    finally:
+        await server.stop()
+    path = tmp_path / "cassette.json"
+    recorder.save(path)
+
+    cassette = path.read_text("utf-8")
+    assert FAKE_USERNAME not in cassette
+    assert FAKE_PASSWORD not in cassette
+    assert "rue de la Paix" not in cassette
+    assert all(
+        interaction["elapsed"] >= 0.02
+        for interaction in json.loads(cassette)["interactions"]
+    )
+
+    # The server is gone: everything comes from the cassette.
+    player = CassettePlayer.load(path, time_scale=0)
+    client = EcocitoClient(
+        "test", FAKE_USERNAME, FAKE_PASSWORD, base_url=server.url, transport=player
+    )
+    types, addresses, visits = await _poll(client, server.current_year)
+    assert types == recorded[0]
+    assert addresses == ["Adresse 1", "Adresse 2"]
+    assert visits == recorded[2]
+
+    # Other dates are answered by the recordings of the same endpoint.
+    assert await client.get_collection_events(types[0].id, server.current_year - 50)
+
+    client = EcocitoClient("test", "user", "password", transport=CassettePlayer([]))
+    with pytest.raises(CannotConnectError):
+        await client.authenticate()
+
+
+async def test_replay_scaled_timing() -> None:
+    """Recorded durations are replayed, scaled."""
+    player = CassettePlayer(
+        [
+            {
+                "method": "POST",
+                "path": "/Usager/Profil/Connexion",
+                "params": {},
+                "status": 200,
+                "headers": {"Content-Type": "text/html"},
+                "cookies": ["session"],
+                "body": "<html></html>",
+                "elapsed": 0.2,
+            }
+        ],
+        time_scale=0.5,
+    )
+    client = EcocitoClient("test", "user", "password", transport=player)
+
+    start = time.monotonic()
+    await client.authenticate()
+    await client.authenticate()
+
+    assert 0.2 <= time.monotonic() - start < 0.4